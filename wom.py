@@ -1,74 +1,229 @@
 import sys
 import os
+from functools import partial
+
+# Betik modu (wom apply ...): Qt yüklenmeden ve pencere kurulmadan çalışır
+if __name__ == '__main__':
+    import wom_cli
+    if wom_cli.is_cli_invocation(sys.argv):
+        sys.exit(wom_cli.main(sys.argv[1:]))
+
+import wom_startup
+import wom_trace
+import wom_theme
+import wom_warmstart
 from PyQt5.QtWidgets import (QMainWindow, QApplication, QWidget, QVBoxLayout, 
                            QHBoxLayout, QLabel, QPushButton, QFileDialog,
                            QMessageBox, QLineEdit, QGroupBox, QFormLayout,
-                           QTabWidget, QComboBox, QCheckBox, QSpinBox, QDesktopWidget)
-from PyQt5.QtGui import QIcon, QPixmap, QColor
-from PyQt5.QtCore import Qt, QSettings
+                           QTabWidget, QComboBox, QCheckBox, QSpinBox, QDesktopWidget,
+                           QCompleter, QListWidget, QListWidgetItem, QProgressBar)
+from PyQt5.QtGui import QIcon, QPixmap, QStandardItemModel, QStandardItem
+from PyQt5.QtCore import (Qt, QSize, QSettings, QTimer, QStandardPaths, QModelIndex,
+                          QObject, QRunnable, QThreadPool, QFileSystemWatcher, pyqtSignal)
+from wom_core import (load_profile_source, fit_size, windows_version_name, windows_flags,
+                      pool_reference, OEM_KEY_PATH, VERSION_KEY_PATH, OEM_VALUE_NAMES)
+from wom_pipeline import ApplyJob, STAGES
+from wom_bundle import write_bundle, BUNDLE_EXTENSION, LOGO_FORMATS
+from wom_registry import WinRegBackend, RegistrySnapshot, RegistryWatcher, read_snapshot
+from wom_logo import (logo_cache, LogoAsset, LogoCache, LogoLoader, LogoError, ThumbnailLoader,
+                      image_format, sniff_images)
+from wom_i18n import Translator, TranslationRegistry, available_languages
+from wom_library import ProfileLibrary, default_library_path
+from wom_trace import span, traced
+from wom_store import logo_store
+
+wom_startup.mark('imports')
+
+SNAPSHOT_KEYS = (VERSION_KEY_PATH, OEM_KEY_PATH)
+# Dil seçicide gösterilen adlar; listede olmayan dil kodu ile gösterilir
+LANGUAGE_NAMES = {'tr': 'Türkçe', 'en': 'English'}
+
+
+class RegistryWatchSignals(QObject):
+    # İzleyici iş parçacığından ana iş parçacığına
+    changed = pyqtSignal(object, object)
+
+
+class OemInfoSignals(QObject):
+    finished = pyqtSignal(object, object, object)
+
+
+class OemInfoTask(QRunnable):
+    # Registry görüntüsü ve logo dosyası damgası ana iş parçacığı dışında okunur
+    def __init__(self):
+        super().__init__()
+        self.signals = OemInfoSignals()
+
+    def run(self):
+        # Sonuç her durumda bildirilir: registry yoksa boş görüntü, okunamadıysa None
+        try:
+            backend = WinRegBackend()
+        except ImportError:
+            backend = None
+        try:
+            with span('oem_info.snapshot'):
+                snapshot = read_snapshot(backend, SNAPSHOT_KEYS) if backend is not None else RegistrySnapshot({})
+            logo_stamp = wom_warmstart.file_stamp(snapshot.get(OEM_KEY_PATH, 'Logo'))
+        except Exception as e:
+            print(f"Sistem bilgileri yüklenirken hata: {str(e)}")
+            backend = snapshot = logo_stamp = None
+        self.signals.finished.emit(backend, snapshot, logo_stamp)
+
+
+class AnswerFilesSignals(QObject):
+    finished = pyqtSignal(int, str)
+    failed = pyqtSignal(str)
+
+
+class AnswerFilesTask(QRunnable):
+    # Cevap dosyaları CSV'den akış hâlinde arka planda yazılır
+    def __init__(self, profile, machines_path, output, arch):
+        super().__init__()
+        self.profile = profile
+        self.machines_path = machines_path
+        self.output = output
+        self.arch = arch
+        self.signals = AnswerFilesSignals()
+
+    def run(self):
+        from wom_unattend import write_answer_files
+
+        try:
+            count, _ = write_answer_files(self.profile, self.machines_path, self.output, arch=self.arch)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(count, self.output)
+
+
+class ApplySignals(QObject):
+    stage = pyqtSignal(str, int, int)
+    finished = pyqtSignal(object)
+
+
+class ApplyTask(QRunnable):
+    # Uygulama adımları iş parçacığında; pencere yalnızca sinyalleri işler
+    def __init__(self, job):
+        super().__init__()
+        self.job = job
+        self.signals = ApplySignals()
+
+    def run(self):
+        report = self.job.run(progress=self.signals.stage.emit)
+        self.signals.finished.emit(report)
+
+
+class LibraryRefreshSignals(QObject):
+    finished = pyqtSignal(int, int)
+
+
+class LibraryRefreshTask(QRunnable):
+    def __init__(self, directories):
+        super().__init__()
+        self.directories = list(directories)
+        self.signals = LibraryRefreshSignals()
+
+    def run(self):
+        updated = removed = 0
+        try:
+            library = ProfileLibrary(default_library_path())
+            try:
+                updated, removed = library.refresh(self.directories)
+            finally:
+                library.close()
+        except Exception as e:
+            print(f"Profil kütüphanesi güncellenirken hata: {str(e)}")
+        self.signals.finished.emit(updated, removed)
+
 
 class WindowsOEMEditor(QMainWindow):
     def __init__(self):
         super().__init__()
         self.current_logo = None
         self.username = os.getenv('USERNAME', 'Unknown User')
-        self.settings = QSettings('WOM', 'WindowsOEMEditor')
+        # Varsayılan biçim NativeFormat'tır (Windows'ta registry); ölçüm takımı INI'ye çevirir
+        self.settings = QSettings(QSettings.defaultFormat(), QSettings.UserScope, 'WOM', 'WindowsOEMEditor')
         self.current_language = self.settings.value('language', 'tr')
+        if self.settings.value('trace', False, type=bool):
+            wom_trace.enable()
+        self.logo_loader = LogoLoader(self)
+        self.logo_loader.preview_ready.connect(self.on_logo_preview)
+        self.logo_loader.loaded.connect(self.on_logo_loaded)
+        self.logo_loader.failed.connect(self.on_logo_failed)
+        self.about_label = None
+        self.about_html_cache = {}
+        self.translation_registry = TranslationRegistry()
+        self.detected_windows_version = None
+        self.registry_snapshot = None
+        self.registry_watcher = None
+        self.apply_task = None
+        self.registry_signals = RegistryWatchSignals(self)
+        self.registry_signals.changed.connect(self.apply_registry_snapshot)
         self.init_translations()
-        self.check_windows_compatibility()
+        wom_startup.mark('translations')
         self.init_ui()
-        self.load_current_oem_info()
+        wom_startup.mark('ui')
+        # Son oturumun görüntüsü hemen gösterilir; registry okuması onu doğrular
+        self.warm_state = wom_warmstart.load(self.settings)
+        if self.warm_state is not None:
+            self.show_warm_state(self.warm_state)
+            wom_startup.mark('warm_start')
+        QTimer.singleShot(0, self.finish_startup)
 
     def init_translations(self):
-        self.translations = {
-          
-        
-        # Update form labels
-        self.oem_form.labelForField(self.logo_widget).setText("OEM Logo:")
-        self.logo_settings_layout.labelForField(self.logo_size).setText(self.tr('logo_size'))
-        self.logo_settings_layout.labelForField(self.logo_position).setText(self.tr('logo_position'))
-        
-        # Update logo position combo
-        current_pos = self.logo_position.currentIndex()
-        self.logo_position.blockSignals(True)
-        self.logo_position.clear()
-        self.logo_position.addItems([self.tr('top_left'), self.tr('top_right'), 
-                                   self.tr('bottom_left'), self.tr('bottom_right'), 
-                                   self.tr('center')])
-        self.logo_position.setCurrentIndex(current_pos)
-        self.logo_position.blockSignals(False)
-        
-        # Update OEM form labels
-        self.oem_form.labelForField(self.manufacturer).setText(self.tr('manufacturer'))
-        self.oem_form.labelForField(self.model).setText(self.tr('model'))
-        self.oem_form.labelForField(self.support_hours).setText(self.tr('support_hours'))
-        self.oem_form.labelForField(self.support_url).setText(self.tr('support_url'))
-        self.oem_form.labelForField(self.support_phone).setText(self.tr('support_phone'))
-        
-        # Update Windows tab
-        self.windows_group.setTitle(self.tr('windows_settings'))
-        self.windows_form.labelForField(self.windows_version).setText(self.tr('windows_version'))
-        self.windows_form.labelForField(self.product_key).setText(self.tr('product_key'))
-        self.windows_form.labelForField(self.organization).setText(self.tr('organization'))
-        self.windows_form.labelForField(self.owner).setText(self.tr('owner'))
-        
-        # Update checkboxes
-        self.auto_activate.setText(self.tr('auto_activate'))
-        self.skip_eula.setText(self.tr('skip_eula'))
-        self.auto_updates.setText(self.tr('auto_updates'))
-        
-        # Update drag drop label
+        # Yalnızca etkin dilin derlenmiş kataloğu açılır; eksikler temel dilden gelir
+        self.translator = Translator(self.current_language)
+
+    def tr(self, key):
+        if self.translator.language != self.current_language:
+            self.init_translations()
+        return self.translator.tr(key)
+
+    def bind_tr(self, key, setter):
+        # Widget, oluşturulurken çeviri anahtarına bağlanır
+        self.translation_registry.bind(key, setter)
+        setter(self.tr(key))
+
+    def add_form_row(self, form, key, field):
+        label = QLabel()
+        form.addRow(label, field)
+        self.bind_tr(key, label.setText)
+
+    def set_language(self, language):
+        if language == self.current_language:
+            return
+        self.current_language = language
+        self.settings.setValue('language', language)
+        self.init_translations()
+        self.retranslate_ui()
+
+    def retranslate_ui(self):
+        # Yalnızca kayıtlı widget'lar güncellenir; tüm değişiklikler tek yeniden çizimde
+        self.setUpdatesEnabled(False)
+        try:
+            self.translation_registry.retranslate(self.tr)
+            self.update_about_text()
+        finally:
+            self.setUpdatesEnabled(True)
+
+    def set_logo_placeholder(self, text):
         if not self.logo_preview.pixmap():
-            self.logo_preview.setText(self.tr('logo_drag_text'))
-        
-        # Update about tab
-        self.update_about_text()
+            self.logo_preview.setText(text)
 
     def update_about_text(self):
+        if self.about_label is None:
+            return
         username = self.username if self.current_language == 'tr' else self.username
         if self.current_language == 'tr' and self.username == 'Unknown User':
             username = self.tr('unknown_user')
         
+        about_text = self.about_html_cache.get(self.current_language)
+        if about_text is None:
+            about_text = self.render_about_text(username)
+            self.about_html_cache[self.current_language] = about_text
+        self.about_label.setText(about_text)
+
+    def render_about_text(self, username):
         about_text = f"""
         <div style='text-align: center; font-family: "Segoe UI", sans-serif;'>
             <img src='WOM.png' width='64' height='64' style='margin: 10px;'>
@@ -97,22 +252,17 @@ class WindowsOEMEditor(QMainWindow):
             </div>
         </div>
         """
-        
-        self.about_label.setText(about_text)
+        return about_text
 
+    @traced('check_windows_compatibility')
     def check_windows_compatibility(self):
+        # Windows sürüm kontrolü: XP ve öncesi eski kip, Vista yalnızca BMP
+        self.legacy_mode, self.use_bmp_only = windows_flags()
+        if sys.platform != 'win32':
+            # Windows dışında (önizleme, imaja uygulama) yetki denetimi yapılmaz
+            return
         try:
             import ctypes
-            import winreg
-
-            # Windows sürüm kontrolü
-            win_ver = sys.getwindowsversion()
-            if win_ver.major < 6:  # XP ve öncesi
-                self.legacy_mode = True
-                self.use_bmp_only = True
-            else:
-                self.legacy_mode = False
-                self.use_bmp_only = win_ver.major == 6 and win_ver.minor == 0  # Vista
 
             # Yönetici hakları kontrolü
             if not ctypes.windll.shell32.IsUserAnAdmin():
@@ -121,9 +271,6 @@ class WindowsOEMEditor(QMainWindow):
                     self.tr('admin_required'),
                     self.tr('admin_warning')
                 )
-
-
-                    )
         except Exception as e:
             QMessageBox.critical(
                 self,
@@ -131,9 +278,235 @@ class WindowsOEMEditor(QMainWindow):
                 self.tr('system_check_message').format(str(e))
             )
 
+    def ensure_tab(self, index):
+        tab = self.tabs.widget(index)
+        builder = self.tab_builders.pop(tab, None)
+        if builder:
+            builder(tab)
+
+    def ensure_windows_tab(self):
+        self.ensure_tab(self.tabs.indexOf(self.windows_tab))
+
+    def build_windows_tab(self, windows_tab):
+        windows_layout = QVBoxLayout()
+        
+        # Windows Ayarları Grubu
+        self.windows_group = QGroupBox()
+        self.bind_tr('windows_settings', self.windows_group.setTitle)
+        self.windows_form = QFormLayout()
+        
+        self.windows_version = QComboBox()
+        self.windows_version.addItems(["Windows 11", "Windows 10", "Windows 8.1", "Windows 8"])
+        if self.detected_windows_version:
+            self.windows_version.setCurrentText(self.detected_windows_version)
+
+        # Kurulum imajı: install.wim/.esd içindeki görüntüler; seçilen görüntü sürümü de belirler
+        self.install_images = {}
+        self.install_image = QComboBox()
+        self.install_image.addItem('', 0)
+        self.bind_tr('install_image_any', lambda text: self.install_image.setItemText(0, text))
+        self.install_image.currentIndexChanged.connect(self.on_install_image_selected)
+        self.install_image_btn = QPushButton()
+        self.bind_tr('install_image_browse', self.install_image_btn.setText)
+        self.install_image_btn.clicked.connect(self.choose_install_image)
+        install_image_widget = QWidget()
+        install_image_layout = QHBoxLayout(install_image_widget)
+        install_image_layout.setContentsMargins(0, 0, 0, 0)
+        install_image_layout.addWidget(self.install_image, 1)
+        install_image_layout.addWidget(self.install_image_btn)
+        
+        self.product_key = QLineEdit()
+        self.product_key.textChanged.connect(self.check_product_key)
+        self.product_key.editingFinished.connect(self.check_product_key)
+        self.organization = QLineEdit()
+        self.owner = QLineEdit()
+        
+        self.auto_activate = QCheckBox()
+        self.skip_eula = QCheckBox()
+        self.auto_updates = QCheckBox()
+        self.bind_tr('auto_activate', self.auto_activate.setText)
+        self.bind_tr('skip_eula', self.skip_eula.setText)
+        self.bind_tr('auto_updates', self.auto_updates.setText)
+        
+        self.add_form_row(self.windows_form, 'windows_version', self.windows_version)
+        self.add_form_row(self.windows_form, 'install_image', install_image_widget)
+        self.add_form_row(self.windows_form, 'product_key', self.product_key)
+        self.add_form_row(self.windows_form, 'organization', self.organization)
+        self.add_form_row(self.windows_form, 'owner', self.owner)
+        self.windows_form.addRow(self.auto_activate)
+        self.windows_form.addRow(self.skip_eula)
+        self.windows_form.addRow(self.auto_updates)
+        
+        self.windows_group.setLayout(self.windows_form)
+        windows_layout.addWidget(self.windows_group)
+
+        # Makine listesinden (CSV) makine başına autounattend.xml
+        self.answer_files_btn = QPushButton()
+        self.bind_tr('answer_files', self.answer_files_btn.setText)
+        self.answer_files_btn.clicked.connect(self.export_answer_files)
+        windows_layout.addWidget(self.answer_files_btn)
+        windows_layout.addStretch()
+        windows_tab.setLayout(windows_layout)
+
+        install_image_path = self.settings.value('install_image_path', '')
+        if install_image_path and os.path.exists(install_image_path):
+            self.load_install_image(install_image_path, quiet=True)
+
+    def choose_install_image(self):
+        fname, _ = QFileDialog.getOpenFileName(
+            self,
+            self.tr('install_image_title'),
+            "",
+            "Windows Image (*.wim *.esd *.swm)"
+        )
+        if fname:
+            self.load_install_image(fname)
+
+    def load_install_image(self, path, quiet=False):
+        # Yalnızca başlık ve XML meta verisi okunur; çok GB'lık imajlar da anında listelenir
+        from wom_wim import read_images, WimError
+
+        try:
+            with span('install_image.read'):
+                images = read_images(path)
+        except (OSError, WimError) as e:
+            if not quiet:
+                QMessageBox.critical(self, self.tr('install_image_error'),
+                                     self.tr('install_image_message').format(str(e)))
+            return
+        self.settings.setValue('install_image_path', path)
+        self.install_image.setToolTip(path)
+        self.set_install_images(images)
+
+    def set_install_images(self, images):
+        selected = self.install_image.currentData()
+        self.install_images = {image.index: image for image in images}
+        self.install_image.blockSignals(True)
+        while self.install_image.count() > 1:
+            self.install_image.removeItem(1)
+        for image in images:
+            self.install_image.addItem(image.label(), image.index)
+            # İmajdaki sürüm seçicide yoksa eklenir
+            version = image.windows_version
+            if version and self.windows_version.findText(version) < 0:
+                self.windows_version.addItem(version)
+        self.install_image.setCurrentIndex(max(self.install_image.findData(selected), 0))
+        self.install_image.blockSignals(False)
+
+    def select_install_image(self, index):
+        position = self.install_image.findData(index)
+        if position < 0:
+            # Profil, yüklü imajda olmayan bir görüntü numarası taşıyabilir
+            self.install_image.addItem(str(index), index)
+            position = self.install_image.count() - 1
+        self.install_image.setCurrentIndex(position)
+
+    def export_answer_files(self):
+        from wom_unattend import WIM_ARCHITECTURES
+
+        machines_path, _ = QFileDialog.getOpenFileName(
+            self,
+            self.tr('answer_files_machines'),
+            "",
+            "CSV (*.csv)"
+        )
+        if not machines_path:
+            return
+        fname, _ = QFileDialog.getSaveFileName(
+            self,
+            self.tr('answer_files'),
+            "",
+            "ZIP (*.zip)"
+        )
+        if not fname:
+            return
+        if not fname.lower().endswith('.zip'):
+            fname += '.zip'
+        image = self.install_images.get(self.install_image.currentData())
+        arch = WIM_ARCHITECTURES.get(image.arch, 'amd64') if image is not None else 'amd64'
+        self.answer_files_btn.setEnabled(False)
+        task = AnswerFilesTask(self.collect_profile(), machines_path, fname, arch)
+        task.signals.finished.connect(self.on_answer_files_written)
+        task.signals.failed.connect(self.on_answer_files_failed)
+        QThreadPool.globalInstance().start(task)
+
+    def on_answer_files_written(self, count, path):
+        self.answer_files_btn.setEnabled(True)
+        QMessageBox.information(self, self.tr('success'), self.tr('answer_files_done').format(count, path))
+
+    def on_answer_files_failed(self, message):
+        self.answer_files_btn.setEnabled(True)
+        QMessageBox.critical(self, self.tr('error'), self.tr('answer_files_error').format(message))
+
+    def on_install_image_selected(self, position):
+        image = self.install_images.get(self.install_image.itemData(position))
+        if image is not None and image.windows_version:
+            self.windows_version.setCurrentText(image.windows_version)
+
+    def check_product_key(self, text=None):
+        # Yazarken (text verilir) yalnızca tam uzunluktaki anahtar denetlenir; eksik anahtar
+        # ve havuzun boş anahtar sayısı alandan çıkılınca. Anahtar modülü ilk denetimde yüklenir.
+        key = self.product_key.text().strip()
+        typing = text is not None
+        invalid = False
+        tooltip = ''
+        pool = pool_reference(key)
+        if pool is not None:
+            if not typing:
+                tooltip = self.product_key_pool_text(pool)
+        elif key and (not typing or len(''.join(key.split()).replace('-', '')) >= 25):
+            from wom_keys import is_valid_key
+            invalid = not is_valid_key(key)
+            if invalid:
+                tooltip = self.tr('product_key_invalid')
+        wom_theme.set_invalid(self.product_key, invalid)
+        self.product_key.setToolTip(tooltip)
+
+    def product_key_pool_text(self, pool):
+        import sqlite3
+        from wom_keys import KeyPool, default_key_pool_path
+
+        try:
+            keys = KeyPool(default_key_pool_path(), timeout=1)
+            try:
+                free = keys.free_count(pool)
+            finally:
+                keys.close()
+        except (sqlite3.Error, OSError):
+            return ''
+        return self.tr('product_key_pool').format(pool, free)
+
+    def build_about_tab(self, about_tab):
+        about_layout = QVBoxLayout()
+        
+        self.about_label = QLabel()
+        self.about_label.setTextFormat(Qt.RichText)
+        self.about_label.setOpenExternalLinks(True)
+        self.about_label.setObjectName('aboutLabel')
+        self.about_label.setWordWrap(True)
+        self.update_about_text()
+        
+        about_layout.addWidget(self.about_label)
+        about_layout.addStretch()
+        about_tab.setLayout(about_layout)
+
+    def set_windows_version(self, version):
+        # Sekme henüz kurulmadıysa algılanan sürüm kurulumda seçilir
+        self.detected_windows_version = version
+        if self.windows_tab not in self.tab_builders:
+            self.windows_version.setCurrentText(version)
+
+    def finish_startup(self):
+        # İlk kare çizildikten sonra sistem kontrolü ve registry okuması
+        wom_startup.mark('first_paint')
+        self.check_windows_compatibility()
+        wom_startup.mark('compatibility_check')
+        self.load_current_oem_info()
+        wom_startup.finish()
+
     def init_ui(self):
         # Ana pencere ayarları
-        self.setWindowTitle(self.tr('window_title'))
+        self.bind_tr('window_title', self.setWindowTitle)
         self.resize(500, 650)  # Pencere boyutu
         
         # Ekranın merkezinde konumlandırma
@@ -146,52 +519,44 @@ class WindowsOEMEditor(QMainWindow):
         # Pencere ikonu ayarla
         app_icon = QIcon("WOM.png")
         self.setWindowIcon(app_icon)
-        self.setStyleSheet("""
-            QMainWindow, QWidget {
-                background-color: #2b2b2b;
-                color: #ffffff;
-            }
-            QGroupBox {
-                border: 1px solid #3b3b3b;
-                margin-top: 1em;
-                padding-top: 0.5em;
-            }
-            QGroupBox::title {
-                color: #ffffff;
-            }
-            QPushButton {
-                background-color: #404040;
-                border: 1px solid #505050;
-                padding: 5px 15px;
-                color: white;
-            }
-            QPushButton:hover {
-                background-color: #505050;
-            }
-            QLineEdit, QComboBox, QSpinBox {
-                background-color: #333333;
-                border: 1px solid #505050;
-                color: white;
-                padding: 3px;
-            }
-            QTabWidget::pane {
-                border: 1px solid #505050;
-            }
-            QTabBar::tab {
-                background-color: #333333;
-                color: white;
-                padding: 8px 20px;
-            }
-            QTabBar::tab:selected {
-                background-color: #404040;
-            }
-        """)
-        
+        # Tema uygulama düzeyinde bir kez kurulur (main() zaten kurduysa tekrar edilmez)
+        wom_theme.apply(QApplication.instance())
+
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        layout = QVBoxLayout(central_widget)
 
+        # Dil seçimi: locales klasöründeki kataloglar
+        header_container = QHBoxLayout()
+        header_container.addStretch()
+        language_widget = QComboBox()
+        for language in available_languages():
+            language_widget.addItem(LANGUAGE_NAMES.get(language, language), language)
+        language_widget.setCurrentIndex(max(language_widget.findData(self.current_language), 0))
+        language_widget.currentIndexChanged.connect(
+            lambda index: self.set_language(language_widget.itemData(index)))
         header_container.addWidget(language_widget)
         
         layout.addLayout(header_container)
 
+        # Profil kütüphanesi araması: sonuçlar SQLite dizininden gelir
+        library_layout = QHBoxLayout()
+        self.library_search = QLineEdit()
+        self.bind_tr('library_search', self.library_search.setPlaceholderText)
+        self.library_search.textEdited.connect(self.update_library_results)
+        self.library_model = QStandardItemModel(self)
+        self.library_completer = QCompleter(self.library_model, self)
+        self.library_completer.setWidget(self.library_search)
+        self.library_completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.library_completer.activated[QModelIndex].connect(self.on_library_selected)
+        self.library_folder_btn = QPushButton()
+        self.bind_tr('library_folder', self.library_folder_btn.setText)
+        self.library_folder_btn.clicked.connect(self.choose_library_folder)
+        library_layout.addWidget(self.library_search)
+        library_layout.addWidget(self.library_folder_btn)
+        layout.addLayout(library_layout)
+        self.init_library()
+
         # Tab widget oluşturma
         self.tabs = QTabWidget()
         layout.addWidget(self.tabs)
@@ -201,7 +566,8 @@ class WindowsOEMEditor(QMainWindow):
         oem_layout = QFormLayout()
         
         # OEM Bilgileri Grubu
-        self.oem_group = QGroupBox(self.tr('oem_info'))
+        self.oem_group = QGroupBox()
+        self.bind_tr('oem_info', self.oem_group.setTitle)
         self.oem_form = QFormLayout()
         
         # Logo seçimi
@@ -213,9 +579,8 @@ class WindowsOEMEditor(QMainWindow):
             def __init__(self, parent=None):
                 super().__init__(parent)
                 self.setAcceptDrops(True)
-                self.default_style = "border: 1px solid #505050; background-color: #1b1b1b; color: #666666; font-style: italic;"
-                self.hover_style = "border: 2px dashed #0078D4; background-color: #1b1b1b; color: #0078D4;"
-                self.setStyleSheet(self.default_style)
+                # Görünüm temadan gelir; sürükleme vurgusu dragHover özelliğiyle açılıp kapanır
+                self.setObjectName('logoPreview')
                 # Ana pencereyi bul ve çeviri metnini ayarla
                 main_window = parent
                 while main_window and not isinstance(main_window, WindowsOEMEditor):
@@ -237,43 +602,49 @@ class WindowsOEMEditor(QMainWindow):
                     if parent:
                         parent.browse_logo()
 
+            def dropped_paths(self, event):
+                paths = [url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile()]
+                return [path for path in paths if os.path.isfile(path)]
+
             def dragEnterEvent(self, event):
+                # Sürükleme sırasında yalnızca imza baytları okunur
                 if event.mimeData().hasUrls():
-                    url = event.mimeData().urls()[0]
-                    if url.isLocalFile():
-                        file_path = url.toLocalFile().lower()
-                        if file_path.endswith(('.png', '.jpg', '.jpeg', '.bmp')):
-                            event.acceptProposedAction()
-                            self.setStyleSheet(self.hover_style)
-                            return
+                    if any(image_format(path) for path in self.dropped_paths(event)):
+                        event.acceptProposedAction()
+                        wom_theme.set_drag_hover(self, True)
+                        return
                 event.ignore()
 
             def dragLeaveEvent(self, event):
-                self.setStyleSheet(self.default_style)
+                wom_theme.set_drag_hover(self, False)
 
             def dropEvent(self, event):
-                self.setStyleSheet(self.default_style)
+                wom_theme.set_drag_hover(self, False)
                 if event.mimeData().hasUrls():
-                    file_path = event.mimeData().urls()[0].toLocalFile()
+                    # Uzantıya değil dosya başlığına bakılır; yanlış adlı dosyalar çözülmeden elenir.
+                    # Yarım kalmış dosyalar (dosya sonu) yükleme işinde elenir.
+                    headers, rejected = sniff_images(self.dropped_paths(event), trailer=False)
                     # Ana pencereye referansı bul
                     parent = self.parent()
                     while parent and not isinstance(parent, WindowsOEMEditor):
                         parent = parent.parent()
                     if parent:
-                        parent.browse_logo(file_path)
+                        parent.drop_logos(headers, rejected)
                     event.acceptProposedAction()
                 else:
                     event.ignore()
 
         self.logo_preview = DragDropLabel()
         self.logo_preview.setFixedSize(120, 60)  # Daha küçük logo önizleme
-        self.logo_preview.setStyleSheet("border: 1px solid #505050; background-color: #1b1b1b;")
         self.logo_preview.setAlignment(Qt.AlignCenter)
+        self.bind_tr('logo_drag_text', self.set_logo_placeholder)
         
         logo_buttons = QVBoxLayout()
-        self.browse_logo_btn = QPushButton(self.tr('select_logo'))
+        self.browse_logo_btn = QPushButton()
+        self.bind_tr('select_logo', self.browse_logo_btn.setText)
         self.browse_logo_btn.clicked.connect(self.browse_logo)
-        self.remove_logo_btn = QPushButton(self.tr('remove_logo'))
+        self.remove_logo_btn = QPushButton()
+        self.bind_tr('remove_logo', self.remove_logo_btn.setText)
         self.remove_logo_btn.clicked.connect(self.remove_logo)
         
         logo_buttons.addWidget(self.browse_logo_btn)
@@ -285,23 +656,42 @@ class WindowsOEMEditor(QMainWindow):
         
         self.logo_widget = logo_widget
         self.oem_form.addRow("OEM Logo:", logo_widget)
+
+        # Birden çok logo bırakıldığında adaylar küçük resim şeridinde seçilir
+        self.logo_strip = QListWidget()
+        self.logo_strip.setViewMode(QListWidget.IconMode)
+        self.logo_strip.setFlow(QListWidget.LeftToRight)
+        self.logo_strip.setWrapping(False)
+        self.logo_strip.setMovement(QListWidget.Static)
+        self.logo_strip.setIconSize(QSize(96, 54))
+        self.logo_strip.setFixedHeight(96)
+        self.logo_strip.setUniformItemSizes(True)
+        self.logo_strip.setVisible(False)
+        self.logo_strip.currentItemChanged.connect(self.on_logo_candidate_selected)
+        self.oem_form.addRow(self.logo_strip)
+        self.logo_strip_items = {}
+        self.thumbnail_loader = ThumbnailLoader(self, self.logo_strip.iconSize())
+        self.thumbnail_loader.ready.connect(self.on_thumbnail_ready)
+        self.thumbnail_loader.failed.connect(self.on_thumbnail_failed)
         
         # Logo ayarları
-        self.logo_settings = QGroupBox(self.tr('logo_settings'))
+        self.logo_settings = QGroupBox()
+        self.bind_tr('logo_settings', self.logo_settings.setTitle)
         self.logo_settings_layout = QFormLayout(self.logo_settings)
         
         self.logo_size = QSpinBox()
         self.logo_size.setRange(16, 512)
         self.logo_size.setValue(96)
         self.logo_size.setSuffix(" px")
+        self.logo_size.valueChanged.connect(self.update_logo_output)
         
         self.logo_position = QComboBox()
-        self.logo_position.addItems([self.tr('top_left'), self.tr('top_right'), 
-                                   self.tr('bottom_left'), self.tr('bottom_right'), 
-                                   self.tr('center')])
+        for index, key in enumerate(['top_left', 'top_right', 'bottom_left', 'bottom_right', 'center']):
+            self.logo_position.addItem("")
+            self.bind_tr(key, partial(self.logo_position.setItemText, index))
         
-        self.logo_settings_layout.addRow(self.tr('logo_size'), self.logo_size)
-        self.logo_settings_layout.addRow(self.tr('logo_position'), self.logo_position)
+        self.add_form_row(self.logo_settings_layout, 'logo_size', self.logo_size)
+        self.add_form_row(self.logo_settings_layout, 'logo_position', self.logo_position)
         
         self.oem_form.addRow(self.logo_settings)
         
@@ -312,122 +702,84 @@ class WindowsOEMEditor(QMainWindow):
         self.support_url = QLineEdit()
         self.support_phone = QLineEdit()
         
-        self.oem_form.addRow(self.tr('manufacturer'), self.manufacturer)
-        self.oem_form.addRow(self.tr('model'), self.model)
-        self.oem_form.addRow(self.tr('support_hours'), self.support_hours)
-        self.oem_form.addRow(self.tr('support_url'), self.support_url)
-        self.oem_form.addRow(self.tr('support_phone'), self.support_phone)
+        self.add_form_row(self.oem_form, 'manufacturer', self.manufacturer)
+        self.add_form_row(self.oem_form, 'model', self.model)
+        self.add_form_row(self.oem_form, 'support_hours', self.support_hours)
+        self.add_form_row(self.oem_form, 'support_url', self.support_url)
+        self.add_form_row(self.oem_form, 'support_phone', self.support_phone)
         
         self.oem_group.setLayout(self.oem_form)
         oem_layout.addWidget(self.oem_group)
         oem_tab.setLayout(oem_layout)
         
-        # Windows Özelleştirme Sekmesi
-        windows_tab = QWidget()
-        windows_layout = QVBoxLayout()
-        
-        # Windows Ayarları Grubu
-        self.windows_group = QGroupBox(self.tr('windows_settings'))
-        self.windows_form = QFormLayout()
-        
-        self.windows_version = QComboBox()
-        self.windows_version.addItems(["Windows 11", "Windows 10", "Windows 8.1", "Windows 8"])
-        
-        self.product_key = QLineEdit()
-        self.organization = QLineEdit()
-        self.owner = QLineEdit()
-        
-        self.auto_activate = QCheckBox(self.tr('auto_activate'))
-        self.skip_eula = QCheckBox(self.tr('skip_eula'))
-        self.auto_updates = QCheckBox(self.tr('auto_updates'))
-        
-        self.windows_form.addRow(self.tr('windows_version'), self.windows_version)
-        self.windows_form.addRow(self.tr('product_key'), self.product_key)
-        self.windows_form.addRow(self.tr('organization'), self.organization)
-        self.windows_form.addRow(self.tr('owner'), self.owner)
-        self.windows_form.addRow(self.auto_activate)
-        self.windows_form.addRow(self.skip_eula)
-        self.windows_form.addRow(self.auto_updates)
-        
-        self.windows_group.setLayout(self.windows_form)
-        windows_layout.addWidget(self.windows_group)
-        windows_tab.setLayout(windows_layout)
-        
-
-
-        # Hakkında Sekmesi
-        about_tab = QWidget()
-        about_layout = QVBoxLayout()
-        
-        self.about_label = QLabel()
-        self.about_label.setTextFormat(Qt.RichText)
-        self.about_label.setOpenExternalLinks(True)
-        self.about_label.setStyleSheet("background-color: #1e1e1e; padding: 20px; border-radius: 10px;")
-        self.about_label.setWordWrap(True)
-        self.update_about_text()
-        
-        about_layout.addWidget(self.about_label)
-        about_layout.addStretch()
-        about_tab.setLayout(about_layout)
+        # Windows ve Hakkında sekmeleri ilk açıldıklarında kurulur
+        self.windows_tab = QWidget()
+        self.about_tab = QWidget()
+        self.tab_builders = {
+            self.windows_tab: self.build_windows_tab,
+            self.about_tab: self.build_about_tab,
+        }
 
         # Sekmeleri ekleme
-        self.tabs.addTab(oem_tab, self.tr('oem_info'))
-        self.tabs.addTab(windows_tab, self.tr('windows_settings'))
-        self.tabs.addTab(about_tab, self.tr('about'))
+        for tab, key in ((oem_tab, 'oem_info'), (self.windows_tab, 'windows_settings'), (self.about_tab, 'about')):
+            index = self.tabs.addTab(tab, "")
+            self.bind_tr(key, partial(self.tabs.setTabText, index))
+        self.tabs.currentChanged.connect(self.ensure_tab)
 
         # Alt butonlar
         button_layout = QHBoxLayout()
         
-        self.save_button = QPushButton(self.tr('export'))
+        self.import_button = QPushButton()
+        self.bind_tr('import', self.import_button.setText)
+        self.import_button.clicked.connect(self.import_config)
+
+        self.save_button = QPushButton()
+        self.bind_tr('export', self.save_button.setText)
         self.save_button.clicked.connect(self.save_config)
+
+        self.bundle_button = QPushButton()
+        self.bind_tr('export_bundle', self.bundle_button.setText)
+        self.bundle_button.clicked.connect(self.export_bundle)
         
-        self.build_button = QPushButton(self.tr('apply_oem'))
+        self.build_button = QPushButton()
+        self.bind_tr('apply_oem', self.build_button.setText)
         self.build_button.clicked.connect(self.build_image)
+
+        # Uygulama sürerken adım ilerlemesi ve iptal
+        self.apply_progress = QProgressBar()
+        self.apply_progress.setRange(0, len(STAGES))
+        self.apply_progress.setTextVisible(True)
+        self.apply_progress.hide()
+        self.cancel_apply_button = QPushButton()
+        self.bind_tr('cancel', self.cancel_apply_button.setText)
+        self.cancel_apply_button.clicked.connect(self.cancel_apply)
+        self.cancel_apply_button.hide()
         
+        button_layout.addWidget(self.apply_progress, 1)
+        button_layout.addWidget(self.cancel_apply_button)
         button_layout.addStretch()
+        button_layout.addWidget(self.import_button)
         button_layout.addWidget(self.save_button)
+        button_layout.addWidget(self.bundle_button)
         button_layout.addWidget(self.build_button)
         
         layout.addLayout(button_layout)
 
-
+    def browse_logo(self, fname=None):
+        # Düğmeden çağrıldığında (fname yok ya da clicked'in False değeri) dosya sorulur
+        if not fname:
+            fname, _ = QFileDialog.getOpenFileName(
+                self,
+                self.tr('select_logo'),
+                "",
+                "Images (*.png *.jpg *.jpeg *.bmp)"
             )
         
         if fname:
             try:
-                # Logo boyut kontrolü
-                image_size = os.path.getsize(fname)
-                if image_size > 1024 * 1024:  # 1MB üzeri
-                    result = QMessageBox.question(
-                        self,
-                        self.tr('large_file_warning'),
-                        self.tr('large_file_message'),
-                        QMessageBox.Yes | QMessageBox.No
-                    )
-                    if result == QMessageBox.No:
-                        return
-
-                # Logo yükle ve önizleme göster
-                pixmap = QPixmap(fname)
-                
-                # Görüntü formatı kontrolü
-                if hasattr(self, 'use_bmp_only') and self.use_bmp_only and not fname.lower().endswith('.bmp'):
-                    # BMP'ye dönüştür
-                    temp_bmp = os.path.join(os.path.dirname(fname), "temp_logo.bmp")
-                    pixmap.save(temp_bmp, "BMP")
-                    fname = temp_bmp
-                
-                # Boyut kontrolü ve ölçekleme
-                if pixmap.width() > 512 or pixmap.height() > 512:
-                    pixmap = pixmap.scaled(512, 512, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                
-                scaled_preview = pixmap.scaled(
-                    self.logo_preview.size(),
-                    Qt.KeepAspectRatio,
-                    Qt.SmoothTransformation
-                )
-                self.logo_preview.setPixmap(scaled_preview)
-                self.current_logo = fname
+                # Çözme arka planda yapılır; önce düşük çözünürlüklü önizleme gelir,
+                # büyük dosyalar arayüzü kilitlemez. BMP dönüşümü build_image sırasında yapılır.
+                self.logo_loader.load(fname, self.logo_preview.size())
             except Exception as e:
                 QMessageBox.critical(
                     self,
@@ -435,14 +787,271 @@ class WindowsOEMEditor(QMainWindow):
                     self.tr('logo_load_message').format(str(e))
                 )
 
+    def drop_logos(self, headers, rejected):
+        if len(headers) == 1:
+            self.browse_logo(headers[0].path)
+        elif headers:
+            self.queue_logo_candidates(headers)
+        if rejected:
+            QMessageBox.warning(
+                self,
+                self.tr('logo_load_error'),
+                self.tr('logo_files_skipped').format(
+                    "\n".join(f"{os.path.basename(path)}: {error}" for path, error in rejected))
+            )
+
+    def queue_logo_candidates(self, headers):
+        # Önceki şerit temizlenir; küçük resimler arka planda sırayla üretilir
+        self.thumbnail_loader.cancel()
+        self.logo_strip.clear()
+        self.logo_strip_items = {}
+        for header in headers:
+            item = QListWidgetItem(os.path.basename(header.path))
+            item.setData(Qt.UserRole, header.path)
+            item.setToolTip(f"{header.path}\n{header}")
+            item.setSizeHint(QSize(104, 80))
+            self.logo_strip.addItem(item)
+            self.logo_strip_items[header.path] = item
+        self.logo_strip.setVisible(True)
+        self.thumbnail_loader.queue([header.path for header in headers])
+
+    def on_thumbnail_ready(self, path, image):
+        item = self.logo_strip_items.get(path)
+        if item is not None:
+            item.setIcon(QIcon(QPixmap.fromImage(image)))
+
+    def on_thumbnail_failed(self, path, message):
+        item = self.logo_strip_items.get(path)
+        if item is not None:
+            item.setToolTip(f"{path}\n{message}")
+            item.setFlags(item.flags() & ~Qt.ItemIsEnabled)
+
+    def on_logo_candidate_selected(self, current, previous):
+        if current is not None:
+            self.browse_logo(current.data(Qt.UserRole))
+
     def remove_logo(self):
         self.logo_preview.clear()
         self.logo_preview.setText(self.tr('no_logo'))
+        self.logo_loader.cancel()
         self.current_logo = None
+        self.logo_preview.setToolTip("")
+
+    def on_logo_preview(self, path, image):
+        self.logo_preview.setPixmap(QPixmap.fromImage(image).scaled(
+            self.logo_preview.size(),
+            Qt.KeepAspectRatio,
+            Qt.FastTransformation
+        ))
+
+    def on_logo_loaded(self, path, asset):
+        self.logo_preview.setPixmap(asset.pixmap(self.logo_preview.size()))
+        self.current_logo = path
+        self.update_logo_output()
+
+    def on_logo_failed(self, path, message):
+        QMessageBox.critical(
+            self,
+            self.tr('logo_load_error'),
+            self.tr('logo_load_message').format(message)
+        )
+
+    def update_logo_output(self):
+        # Çıktı boyutu önbellekteki piramitten hesaplanır; dosya yeniden okunmaz
+        if not self.current_logo:
+            return
+        try:
+            left, top, right, bottom = logo_cache.get(self.current_logo).trim_box()
+            width, height = fit_size(right - left, bottom - top, self.logo_size.value())
+            self.logo_preview.setToolTip(f"{width} x {height} px")
+        except (OSError, LogoError):
+            self.logo_preview.setToolTip("")
+
+    def encoded_logo(self, logo_format):
+        return self.logo_encoder()(logo_format)
+
+    def logo_encoder(self):
+        # Aynı logo bu boyut ve formatta daha önce kodlandıysa depodan gelir;
+        # değilse önbellekteki görüntüden kırpılıp kodlanır. Widget değerleri ve
+        # önbellek burada okunur; dönen işlev iş parçacığında da çağrılabilir.
+        # Önbellekte olmayan görüntü o iş parçacığında çözülür, önbelleğe girmez.
+        path = self.current_logo
+        target_size = self.logo_size.value()
+        asset = logo_cache.entries.get(LogoCache.key_for(path))
+
+        def encode(logo_format):
+            from wom_optimize import optimize_logo
+
+            def optimize():
+                source = asset if asset is not None else LogoAsset(path)
+                return optimize_logo(source.rgba(), target_size, logo_format)
+            return logo_store().get(path, target_size, logo_format, optimize)
+        return encode
+
+    def collect_profile(self):
+        # save_config ve wom apply ile aynı profil şeması
+        self.ensure_windows_tab()
+        return {
+            'manufacturer': self.manufacturer.text(),
+            'model': self.model.text(),
+            'support_hours': self.support_hours.text(),
+            'support_url': self.support_url.text(),
+            'support_phone': self.support_phone.text(),
+            'logo': self.current_logo,
+            'logo_size': self.logo_size.value(),
+            'logo_position': self.logo_position.currentIndex(),
+            'windows_version': self.windows_version.currentText(),
+            'image_index': self.install_image.currentData() or 0,
+            'product_key': self.product_key.text(),
+            'organization': self.organization.text(),
+            'owner': self.owner.text(),
+            'auto_activate': self.auto_activate.isChecked(),
+            'skip_eula': self.skip_eula.isChecked(),
+            'auto_updates': self.auto_updates.isChecked(),
+        }
+
+    def set_profile(self, profile):
+        self.ensure_windows_tab()
+        self.manufacturer.setText(profile['manufacturer'])
+        self.model.setText(profile['model'])
+        self.support_hours.setText(profile['support_hours'])
+        self.support_url.setText(profile['support_url'])
+        self.support_phone.setText(profile['support_phone'])
+        self.logo_size.setValue(profile['logo_size'])
+        self.logo_position.setCurrentIndex(profile['logo_position'])
+        self.select_install_image(profile['image_index'])
+        self.windows_version.setCurrentText(profile['windows_version'])
+        self.product_key.setText(profile['product_key'])
+        self.organization.setText(profile['organization'])
+        self.owner.setText(profile['owner'])
+        self.auto_activate.setChecked(profile['auto_activate'])
+        self.skip_eula.setChecked(profile['skip_eula'])
+        self.auto_updates.setChecked(profile['auto_updates'])
+        if profile['logo'] and os.path.exists(profile['logo']):
+            self.logo_loader.load(profile['logo'], self.logo_preview.size())
+        else:
+            self.remove_logo()
+
+    def extract_bundle_logo(self, data):
+        # Paketteki logo, içeriğine göre adlandırılmış bir dosyaya bir kez çıkarılır
+        import hashlib
 
+        directory = os.path.join(QStandardPaths.writableLocation(QStandardPaths.GenericDataLocation), 'WOM', 'bundles')
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, hashlib.sha1(data).hexdigest()[:16] + '.png')
+        if not os.path.exists(path):
+            with open(path, 'wb') as f:
+                f.write(data)
+        return path
 
+    def init_library(self):
+        self.library = ProfileLibrary(default_library_path())
+        self.library_watcher = QFileSystemWatcher(self)
+        self.library_watcher.directoryChanged.connect(self.schedule_library_refresh)
+        self.library_refresh_timer = QTimer(self)
+        self.library_refresh_timer.setSingleShot(True)
+        self.library_refresh_timer.setInterval(300)
+        self.library_refresh_timer.timeout.connect(self.refresh_library)
+        self.library_refresh_running = False
+        self.set_library_dirs(self.settings.value('library_dirs', [], type=list))
 
+    def set_library_dirs(self, directories):
+        self.library_dirs = [d for d in directories if os.path.isdir(d)]
+        if self.library_watcher.directories():
+            self.library_watcher.removePaths(self.library_watcher.directories())
+        if self.library_dirs:
+            self.library_watcher.addPaths(self.library_dirs)
+            self.schedule_library_refresh()
 
+    def choose_library_folder(self):
+        directory = QFileDialog.getExistingDirectory(self, self.tr('library_folder_title'))
+        if directory:
+            self.settings.setValue('library_dirs', [directory])
+            self.set_library_dirs([directory])
+
+    def schedule_library_refresh(self, *args):
+        self.library_refresh_timer.start()
+
+    def refresh_library(self):
+        # Dizin artımlı olarak arka planda güncellenir (kendi SQLite bağlantısıyla)
+        if self.library_refresh_running or not self.library_dirs:
+            return
+        self.library_refresh_running = True
+        task = LibraryRefreshTask(self.library_dirs)
+        task.signals.finished.connect(self.on_library_refreshed)
+        QThreadPool.globalInstance().start(task)
+
+    def on_library_refreshed(self, updated, removed):
+        self.library_refresh_running = False
+        if updated or removed:
+            self.update_library_results(self.library_search.text())
+
+    def update_library_results(self, text):
+        self.library_model.clear()
+        for entry in self.library.search(text):
+            item = QStandardItem(entry.title)
+            item.setToolTip(entry.subtitle)
+            item.setData(entry.path, Qt.UserRole)
+            self.library_model.appendRow(item)
+        if self.library_model.rowCount():
+            self.library_completer.complete()
+        else:
+            self.library_completer.popup().hide()
+
+    def on_library_selected(self, index):
+        path = index.data(Qt.UserRole)
+        self.library_search.clear()
+        try:
+            self.load_profile_file(path)
+        except Exception as e:
+            QMessageBox.critical(self, self.tr('error'), self.tr('config_load_error').format(str(e)))
+
+    def load_profile_file(self, fname):
+        profile, logos = load_profile_source(fname)
+        if logos and 'PNG' in logos:
+            profile['logo'] = self.extract_bundle_logo(logos['PNG'])
+        self.set_profile(profile)
+
+    def import_config(self):
+        fname, _ = QFileDialog.getOpenFileName(
+            self,
+            self.tr('load_config'),
+            "",
+            self.tr('profile_files') + f" (*.json *{BUNDLE_EXTENSION})"
+        )
+        if not fname:
+            return
+        try:
+            self.load_profile_file(fname)
+            QMessageBox.information(self, self.tr('success'), self.tr('config_loaded'))
+        except Exception as e:
+            QMessageBox.critical(self, self.tr('error'), self.tr('config_load_error').format(str(e)))
+
+    def export_bundle(self):
+        try:
+            profile = self.collect_profile()
+            fname, _ = QFileDialog.getSaveFileName(
+                self,
+                self.tr('export_bundle'),
+                "",
+                self.tr('profile_files') + f" (*{BUNDLE_EXTENSION})"
+            )
+            if not fname:
+                return
+            # Logo hedef boyutta bir kez kodlanır; paketten uygulamada görüntü işlenmez
+            logos = {}
+            if self.current_logo:
+                logos = {fmt: self.encoded_logo(fmt) for fmt in LOGO_FORMATS}
+            write_bundle(fname, profile, logos)
+            QMessageBox.information(self, self.tr('success'), self.tr('config_saved'))
+        except Exception as e:
+            QMessageBox.critical(self, self.tr('error'), self.tr('config_save_error').format(str(e)))
+
+    def save_config(self):
+        try:
+            config = self.collect_profile()
+            file_filter = self.tr('profile_files') + " (*.json)"
+            fname, _ = QFileDialog.getSaveFileName(
                 self,
                 self.tr('save_config'),
                 "",
@@ -457,185 +1066,196 @@ class WindowsOEMEditor(QMainWindow):
             QMessageBox.critical(self, self.tr('error'), self.tr('config_save_error').format(str(e)))
 
     def load_current_oem_info(self):
-        try:
-            import winreg
-            
-            # Windows sürümünü algıla
-            try:
-                key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Windows NT\CurrentVersion", 0, winreg.KEY_READ)
-                try:
-                    product_name = winreg.QueryValueEx(key, "ProductName")[0]
-                    current_build = int(winreg.QueryValueEx(key, "CurrentBuildNumber")[0])
-                    
-                    # Windows 11 build numarası 22000 ve üzeridir
-                    if current_build >= 22000:
-                        self.windows_version.setCurrentText("Windows 11")
-                    elif "Windows 10" in product_name:
-                        self.windows_version.setCurrentText("Windows 10")
-                    elif "Windows 8.1" in product_name:
-                        self.windows_version.setCurrentText("Windows 8.1")
-                    elif "Windows 8" in product_name:
-                        self.windows_version.setCurrentText("Windows 8")
-                    elif "Windows 7" in product_name:
-                        self.windows_version.setCurrentText("Windows 7")
-                    elif "Windows Vista" in product_name:
-                        self.windows_version.setCurrentText("Windows Vista")
-                    elif "Windows XP" in product_name:
-                        self.windows_version.setCurrentText("Windows XP")
-                except:
-                    pass
-                
-               
-                except:
-                    pass
-
-                winreg.CloseKey(key)
-            except:
-                pass
-
-            # OEM bilgilerini al
-            key_path = r"SOFTWARE\Microsoft\Windows\CurrentVersion\OEMInformation"
-            try:
-                oem_key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, key_path, 0, winreg.KEY_READ)
-                
-                # OEM bilgilerini oku
-                try: self.manufacturer.setText(winreg.QueryValueEx(oem_key, "Manufacturer")[0])
-                except: pass
-                
-                try: self.model.setText(winreg.QueryValueEx(oem_key, "Model")[0])
-                except: pass
-                
-                try: self.support_hours.setText(winreg.QueryValueEx(oem_key, "SupportHours")[0])
-                except: pass
-                
-                try: self.support_url.setText(winreg.QueryValueEx(oem_key, "SupportURL")[0])
-                except: pass
-                
-                try: self.support_phone.setText(winreg.QueryValueEx(oem_key, "SupportPhone")[0])
-                except: pass
-                
-                try:
-                    logo_path = winreg.QueryValueEx(oem_key, "Logo")[0]
-                    if logo_path and os.path.exists(logo_path):
-                        pixmap = QPixmap(logo_path)
-                        scaled_pixmap = pixmap.scaled(
-                            self.logo_preview.size(),
-                            Qt.KeepAspectRatio,
-                            Qt.SmoothTransformation
-                        )
-                        self.logo_preview.setPixmap(scaled_pixmap)
-                        self.current_logo = logo_path
-                except:
-                    pass
-
-                winreg.CloseKey(oem_key)
-            except WindowsError:
-                pass
-
-            # Organizasyon bilgilerini al
-           
+        # Sürüm ve OEM anahtarları arka planda tek numaralandırmada okunur
+        task = OemInfoTask()
+        task.signals.finished.connect(self.on_oem_info_read)
+        QThreadPool.globalInstance().start(task)
 
+    @traced('load_current_oem_info')
+    def on_oem_info_read(self, backend, snapshot, logo_stamp):
+        try:
+            warm_state, self.warm_state = self.warm_state, None
+            if snapshot is None:
+                # Okunamadı: gösterilen değerler kalır
+                return
+            if warm_state is None:
+                self.apply_registry_snapshot(snapshot)
+            else:
+                self.confirm_warm_state(warm_state, snapshot, logo_stamp)
+            if backend is not None:
+                self.start_registry_watcher(backend, snapshot)
         except Exception as e:
             print(f"Sistem bilgileri yüklenirken hata: {str(e)}")
 
-    def build_image(self):
-        try:
-            import winreg
-            import shutil
-            import ctypes
+    def show_warm_state(self, state):
+        # Dosya okunmaz, görüntü çözülmez: önizleme kayıtlı ham piksellerden kurulur
+        with span('warm_start.show'):
+            self.apply_registry_snapshot(state.snapshot, load_logo=False)
+            if state.thumbnail is not None:
+                self.logo_preview.setPixmap(state.thumbnail_pixmap())
+                self.logo_preview.setToolTip(state.tooltip)
 
-            # Yönetici hakları kontrolü
-            if not ctypes.windll.shell32.IsUserAnAdmin():
-                QMessageBox.critical(
-                    self,
-                    self.tr('permission_error'),
-                    self.tr('admin_required_message')
-                )
-                return
+    def confirm_warm_state(self, state, snapshot, logo_stamp):
+        # Yalnızca son oturumdan bu yana değişen değerlere bağlı alanlar yenilenir
+        changed = state.snapshot.changes(snapshot)
+        self.apply_registry_snapshot(snapshot, changed, load_logo=False)
+        logo_path = snapshot.get(OEM_KEY_PATH, 'Logo')
+        if state.logo_current(logo_path, logo_stamp):
+            self.current_logo = logo_path
+        elif logo_stamp is not None:
+            self.logo_loader.load(logo_path, self.logo_preview.size())
+        elif state.thumbnail is not None:
+            self.remove_logo()
 
-            # Windows sürümünü ve yolları belirle
-            windows_version = self.windows_version.currentText()
-            system_root = os.environ.get("SystemRoot")
-            
-            if not system_root:
-                QMessageBox.critical(
-                    self,
-                    self.tr('system_error'),
-                    self.tr('system_dir_not_found')
-                )
-                return
-            
+    def save_warm_state(self):
+        # Registry okuması bitmediyse önceki kayıt korunur
+        if self.registry_snapshot is None or self.warm_state is not None:
+            return
+        logo_path = self.registry_snapshot.get(OEM_KEY_PATH, 'Logo')
+        pixmap = self.logo_preview.pixmap() if logo_path and logo_path == self.current_logo else None
+        state = wom_warmstart.WarmState.capture(self.registry_snapshot, pixmap, self.logo_preview.toolTip())
+        wom_warmstart.save(self.settings, state)
 
-            # OEM dizinini oluştur
-            os.makedirs(oem_path, exist_ok=True)
+    def apply_registry_snapshot(self, snapshot, changed=None, load_logo=True):
+        # changed verilirse yalnızca değişen değerlere bağlı alanlar güncellenir
+        self.registry_snapshot = snapshot
 
-            # Logo işleme
-            if self.current_logo:
-                target_size = self.logo_size.value()
-                logo = QPixmap(self.current_logo)
-                scaled_logo = logo.scaled(
-                    target_size, target_size,
-                    Qt.KeepAspectRatio,
-                    Qt.SmoothTransformation
-                )
-                
-                # Logo kaydet
-                logo_path = os.path.join(oem_path, logo_name)
-                scaled_logo.save(logo_path, logo_format)
-                winreg.SetValueEx(oem_key, "Logo", 0, winreg.REG_SZ, logo_path)
-            else:
-                winreg.SetValueEx(oem_key, "Logo", 0, winreg.REG_SZ, "")
+        def affected(key_path, *names):
+            return changed is None or any((key_path.upper(), name.upper()) in changed for name in names)
 
-   
+        if affected(VERSION_KEY_PATH, 'ProductName', 'CurrentBuildNumber'):
+            version = windows_version_name(snapshot.get(VERSION_KEY_PATH, 'ProductName'),
+                                           snapshot.get(VERSION_KEY_PATH, 'CurrentBuildNumber'))
+            if version:
+                self.set_windows_version(version)
 
-            # Registry anahtarını kapat
-            winreg.CloseKey(oem_key)
+        for field, name in OEM_VALUE_NAMES.items():
+            if affected(OEM_KEY_PATH, name):
+                value = snapshot.get(OEM_KEY_PATH, name)
+                if value is None and changed is None:
+                    continue
+                widget = getattr(self, field)
+                text = '' if value is None else str(value)
+                if widget.text() != text:
+                    widget.setText(text)
 
-            # Başarı mesajı
-            logo_location = oem_path if self.current_logo else self.tr('no_logo_text')
-            QMessageBox.information(
-                self, 
-                self.tr('success'),
-                self.tr('oem_success').format(self.manufacturer.text(), self.model.text(), logo_location)
-            )
+        if load_logo and affected(OEM_KEY_PATH, 'Logo'):
+            logo_path = snapshot.get(OEM_KEY_PATH, 'Logo')
+            if logo_path and os.path.exists(logo_path) and logo_path != self.current_logo:
+                self.logo_loader.load(logo_path, self.logo_preview.size())
 
-        except Exception as e:
-            if "access is denied" in str(e).lower():
-                QMessageBox.critical(
-                    self, 
-                    self.tr('error'),
-                    self.tr('admin_permission_required')
-                )
+    def start_registry_watcher(self, backend, snapshot):
+        # Dışarıdan yapılan değişiklikler yeniden başlatmadan forma yansır
+        self.stop_registry_watcher()
+        self.registry_watcher = RegistryWatcher(backend, SNAPSHOT_KEYS, self.registry_signals.changed.emit,
+                                                snapshot=snapshot).start()
+
+    def stop_registry_watcher(self):
+        if self.registry_watcher is not None:
+            self.registry_watcher.stop(timeout=1)
+            self.registry_watcher = None
+
+    def closeEvent(self, event):
+        # Süren uygulama bir sonraki adımdan önce durur
+        self.cancel_apply()
+        self.stop_registry_watcher()
+        self.save_warm_state()
+        super().closeEvent(event)
+
+    @traced('build_image')
+    def build_image(self):
+        if self.apply_task is not None:
+            return
+        # Profil ve logo bu iş parçacığında alınır; adımlar arka planda çalışır
+        encode_logo = None
+        if self.current_logo:
+            try:
+                encode_logo = self.logo_encoder()
+            except OSError as e:
+                with span('dialog'):
+                    QMessageBox.critical(self, self.tr('error'), self.tr('oem_update_error').format(str(e)))
+                return
+        job = ApplyJob(self.collect_profile(), use_bmp_only=getattr(self, 'use_bmp_only', False),
+                       encode_logo=encode_logo)
+        self.apply_task = ApplyTask(job)
+        self.apply_task.signals.stage.connect(self.on_apply_stage)
+        self.apply_task.signals.finished.connect(self.on_apply_finished)
+        self.build_button.setEnabled(False)
+        self.apply_progress.setValue(0)
+        self.apply_progress.show()
+        self.cancel_apply_button.setEnabled(True)
+        self.cancel_apply_button.show()
+        QThreadPool.globalInstance().start(self.apply_task)
+
+    def cancel_apply(self):
+        if self.apply_task is not None:
+            self.apply_task.job.cancel()
+            self.cancel_apply_button.setEnabled(False)
+
+    def on_apply_stage(self, stage, number, total):
+        self.apply_progress.setValue(number)
+        self.apply_progress.setFormat(self.tr('apply_stage_' + stage))
+
+    def on_apply_finished(self, report):
+        self.apply_task = None
+        self.apply_progress.hide()
+        self.cancel_apply_button.hide()
+        self.build_button.setEnabled(True)
+        with span('dialog'):
+            if report.cancelled:
+                done = ", ".join(self.tr('apply_stage_' + stage) for stage in report.completed)
+                QMessageBox.information(self, self.tr('apply_cancelled_title'),
+                                        self.tr('apply_cancelled').format(done or '-'))
+            elif report.errors:
+                # Tüm hatalar tek raporda
+                QMessageBox.critical(self, *self.apply_error_text(report))
             else:
-                QMessageBox.critical(self, self.tr('error'), self.tr('oem_update_error').format(str(e)))
+                self.show_apply_result(report.result)
+
+    def apply_error_text(self, report):
+        # (başlık, metin)
+        if all(code == 'admin_required_message' for _, _, code in report.errors):
+            return self.tr('permission_error'), self.tr('admin_required_message')
+        lines = []
+        for stage, message, code in report.errors:
+            if code is None and "access is denied" in message.lower():
+                code = 'admin_permission_required'
+            lines.append(f"{self.tr('apply_stage_' + stage)}: {self.tr(code) if code else message}")
+        return self.tr('error'), self.tr('oem_update_error').format("\n".join(lines))
+
+    def show_apply_result(self, result):
+        oem_path = os.path.dirname(result.logo_file) if result.logo_file else None
+        # Havuzdan atanan anahtar, registry değişmese de gösterilir
+        key_text = ''
+        if result.product_key:
+            key_text = "\n\n" + self.tr('product_key_assigned').format(result.product_key)
+
+        if result.up_to_date:
+            QMessageBox.information(self, self.tr('success'), self.tr('oem_up_to_date') + key_text)
+            return
 
+        # Başarı mesajı
+        logo_location = oem_path if self.current_logo else self.tr('no_logo_text')
+        QMessageBox.information(
+            self,
+            self.tr('success'),
+            self.tr('oem_success').format(self.manufacturer.text(), self.model.text(), logo_location)
+            + key_text
+        )
 
 
 def main():
     app = QApplication(sys.argv)
-    app.setStyle("Fusion")
     
     # Uygulama ikonu ayarla
     app_icon = QIcon("WOM.png")
     app.setWindowIcon(app_icon)
     
-    palette = app.palette()
-    palette.setColor(palette.Window, QColor(53, 53, 53))
-    palette.setColor(palette.WindowText, Qt.white)
-    palette.setColor(palette.Base, QColor(25, 25, 25))
-    palette.setColor(palette.AlternateBase, QColor(53, 53, 53))
-    palette.setColor(palette.ToolTipBase, Qt.white)
-    palette.setColor(palette.ToolTipText, Qt.white)
-    palette.setColor(palette.Text, Qt.white)
-    palette.setColor(palette.Button, QColor(53, 53, 53))
-    palette.setColor(palette.ButtonText, Qt.white)
-    palette.setColor(palette.BrightText, Qt.red)
-    palette.setColor(palette.Link, QColor(42, 130, 218))
-    palette.setColor(palette.Highlight, QColor(42, 130, 218))
-    palette.setColor(palette.HighlightedText, Qt.black)
-    app.setPalette(palette)
+    # Palet ve stil sayfası pencere kurulmadan önce bir kez uygulanır
+    wom_theme.apply(app)
     editor = WindowsOEMEditor()
     editor.show()
+    wom_startup.mark('show')
     sys.exit(app.exec_())
 
 if __name__ == '__main__':
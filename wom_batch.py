@@ -0,0 +1,115 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from wom_core import apply_to_image, cached_logo
+
+# Birden çok bağlanmış imaja aynı profilin uygulanması. Logo bir kez kodlanır ve
+# her işçi sürece başlangıçta bir kez aktarılır; her hedef kendi sürecinde
+# yazılır, bir hedefin hatası diğerlerini durdurmaz.
+
+MAX_WORKERS = 8
+
+_shared_logo = None
+
+
+class TargetResult:
+    def __init__(self, image_root, result=None, error=None, elapsed=0.0):
+        self.image_root = image_root
+        self.result = result
+        self.error = error
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def shared_logo(profile, use_bmp_only=False, logo_data=None):
+    # Paketten gelen logolar ({format: bayt}) yeniden kodlanmaz
+    if not profile.get('logo'):
+        return None
+    logo_format = 'BMP' if use_bmp_only else 'PNG'
+    if isinstance(logo_data, dict):
+        logo_data = logo_data.get(logo_format)
+    if logo_data is None:
+        logo_data = cached_logo(profile['logo'], profile['logo_size'], logo_format)
+    return logo_data
+
+
+def unique_targets(image_roots):
+    # Aynı imaja iki süreç aynı anda yazmasın
+    seen = set()
+    targets = []
+    for root in image_roots:
+        key = os.path.normcase(os.path.realpath(root))
+        if key not in seen:
+            seen.add(key)
+            targets.append(root)
+    return targets
+
+
+def default_workers(count):
+    return max(1, min(count, os.cpu_count() or 1, MAX_WORKERS))
+
+
+def _init_worker(logo_data):
+    global _shared_logo
+    _shared_logo = logo_data
+
+
+def _apply_target(profile, image_root, use_bmp_only, dry_run, logo_data=None):
+    started = time.perf_counter()
+    if logo_data is None:
+        logo_data = _shared_logo
+    try:
+        result = apply_to_image(profile, image_root, use_bmp_only=use_bmp_only,
+                                dry_run=dry_run, logo_data=logo_data)
+        return TargetResult(image_root, result, elapsed=time.perf_counter() - started)
+    except Exception as e:
+        return TargetResult(image_root, error=str(e) or type(e).__name__,
+                            elapsed=time.perf_counter() - started)
+
+
+def apply_to_images(profile, image_roots, use_bmp_only=False, dry_run=False, logo_data=None,
+                    workers=None, progress=None):
+    # progress(tamamlanan, toplam, TargetResult) her hedef bittiğinde çağrılır.
+    # Sonuçlar image_roots sırasıyla döner.
+    targets = unique_targets(image_roots)
+    logo_data = shared_logo(profile, use_bmp_only, logo_data)
+    workers = default_workers(len(targets)) if workers is None else max(1, min(workers, len(targets) or 1))
+
+    results = {}
+
+    def finished(target_result):
+        results[target_result.image_root] = target_result
+        if progress is not None:
+            progress(len(results), len(targets), target_result)
+
+    if workers == 1:
+        # Tek hedefte süreç havuzunun açılış maliyetine gerek yok
+        for root in targets:
+            finished(_apply_target(profile, root, use_bmp_only, dry_run, logo_data))
+        return [results[root] for root in targets]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(logo_data,)) as pool:
+        futures = {pool.submit(_apply_target, profile, root, use_bmp_only, dry_run): root
+                   for root in targets}
+        for future in as_completed(futures):
+            root = futures[future]
+            try:
+                target_result = future.result()
+            except BrokenProcessPool:
+                target_result = TargetResult(root, error="worker process exited unexpectedly")
+            except Exception as e:
+                target_result = TargetResult(root, error=str(e) or type(e).__name__)
+            finished(target_result)
+    return [results[root] for root in targets]
+
+
+def summarize(results):
+    failed = [r for r in results if not r.ok]
+    changed = sum(1 for r in results if r.ok and not r.result.up_to_date)
+    return len(results), changed, len(failed)
@@ -0,0 +1,611 @@
+import os
+import sys
+import json
+import time
+import types
+import platform
+import tempfile
+import statistics
+import subprocess
+
+# Performans ölçümleri: açılış, logo yükleme/ölçekleme, dil değişimi ve deneme
+# çalıştırması. Linux'ta QT_QPA_PLATFORM=offscreen altında, registry yerine
+# bellek içi sahte bir winreg ile çalışır. Sonuçlar JSON olarak yazılır ve
+# kayıtlı taban çizgisiyle karşılaştırılır; yavaşlama çıkış kodunu 1 yapar.
+# Ayarlar, ılık başlangıç kaydı ve önbellekler ölçüm süresince geçici klasöre yazılır.
+#
+#   python wom_bench.py                     # ölç ve benchmarks/baseline.json ile karşılaştır
+#   python wom_bench.py --update-baseline   # taban çizgisini yeniden yaz
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'benchmarks', 'baseline.json')
+RESULTS_VERSION = 1
+
+# Taban çizgisinin bu katından yavaş ve en az MIN_DELTA_MS farklı ortanca gerilemedir.
+# Aynı makinede bile süreçten sürece ortancalar oynar; taban çizgisi bu yüzden
+# BASELINE_PASSES ayrı geçişte ölçülür ve her ölçümün en yavaş ortancası saklanır.
+DEFAULT_TOLERANCE = 1.5
+MIN_DELTA_MS = 2.0
+# Olay döngüsü ve süreç başlatma ölçümleri iş parçacığı zamanlamasına bağlıdır:
+# önek -> (kat, en az fark ms). Milisaniye altındaki düğme yuvası arka plandaki
+# işçiden GIL beklerken onlarca ms sürebilir; aranan gerileme, uygulamanın yeniden
+# ana iş parçacığında çalışması, yüzlerce ms'dir.
+NOISY = {'apply.ui_': (3.0, 50.0), 'startup.': (2.0, MIN_DELTA_MS)}
+DEFAULT_REPEAT = 20
+BASELINE_PASSES = 3
+# Ayarlar, ılık başlangıç kaydı, profil kütüphanesi ve logo deposu bu değişkenlerden
+# bulunur; ölçüm sırasında hepsi geçici klasörü gösterir
+STATE_VARIABLES = ('HOME', 'XDG_CONFIG_HOME', 'XDG_DATA_HOME', 'LOCALAPPDATA')
+STATE_DIR_VARIABLE = 'WOM_BENCH_STATE'
+
+LOGO_SIZES = (512, 2048, 4096)
+GROUPS = ('startup', 'logo', 'i18n', 'apply', 'profile')
+LOGO_FORMATS = ('PNG', 'JPG', 'BMP')
+
+FAKE_REGISTRY = {
+    r"SOFTWARE\Microsoft\Windows NT\CurrentVersion": {
+        'ProductName': (1, 'Windows 11 Pro'),
+        'CurrentBuildNumber': (1, '22631'),
+    },
+    r"SOFTWARE\Microsoft\Windows\CurrentVersion\OEMInformation": {
+        'Manufacturer': (1, 'Contoso'),
+        'Model': (1, 'Contoso Book 14'),
+        'SupportHours': (1, '09:00-18:00'),
+        'SupportURL': (1, 'https://support.contoso.example'),
+        'SupportPhone': (1, '+90 212 000 00 00'),
+    },
+}
+
+
+class FakeKey:
+    def __init__(self, path):
+        self.path = path
+
+
+class FakeWinreg(types.ModuleType):
+    # winreg'in WOM'un kullandığı kısmı; değerler MemoryBackend'de tutulur
+    HKEY_LOCAL_MACHINE = 0x80000002
+    KEY_READ = 0x20019
+    KEY_WRITE = 0x20006
+    KEY_SET_VALUE = 0x0002
+    KEY_ALL_ACCESS = 0xF003F
+    REG_SZ = 1
+    REG_EXPAND_SZ = 2
+    REG_BINARY = 3
+    REG_DWORD = 4
+    REG_MULTI_SZ = 7
+    REG_QWORD = 11
+
+    def __init__(self, keys=None):
+        from wom_registry import MemoryBackend
+
+        super().__init__('winreg')
+        self.backend = MemoryBackend(FAKE_REGISTRY if keys is None else keys)
+
+    def _values(self, key):
+        return self.backend.keys[key.path.upper()]
+
+    def OpenKey(self, root, path, reserved=0, access=KEY_READ):
+        if path.upper() not in self.backend.keys:
+            raise FileNotFoundError(2, 'The system cannot find the file specified')
+        return FakeKey(path)
+
+    def CreateKeyEx(self, root, path, reserved=0, access=KEY_WRITE):
+        self.backend.keys.setdefault(path.upper(), {})
+        return FakeKey(path)
+
+    def CloseKey(self, key):
+        pass
+
+    def QueryValueEx(self, key, name):
+        for value_name, (value_type, value) in self._values(key).items():
+            if value_name.upper() == name.upper():
+                return value, value_type
+        raise FileNotFoundError(2, 'The system cannot find the file specified')
+
+    def EnumValue(self, key, index):
+        items = list(self._values(key).items())
+        if index >= len(items):
+            raise OSError(259, 'No more data is available')
+        name, (value_type, value) = items[index]
+        return name, value, value_type
+
+    def SetValueEx(self, key, name, reserved, value_type, value):
+        self.backend.write_values(key.path, {name: (value_type, value)})
+
+    def DeleteValue(self, key, name):
+        if self.QueryValueEx(key, name):
+            self.backend.delete_values(key.path, [name])
+
+
+class BenchError(Exception):
+    pass
+
+
+_app = None
+
+
+def qt_app():
+    # Uygulama nesnesi ölçümler boyunca yaşamalı; modülde tutulur
+    global _app
+    from PyQt5.QtWidgets import QApplication
+
+    _app = QApplication.instance() or QApplication(sys.argv[:1])
+    return _app
+
+
+def isolate_state(directory):
+    # Geliştiricinin gerçek ayarlarına ve önbelleklerine yazılmaz; önceki değerler döner
+    from PyQt5.QtCore import QSettings
+
+    previous = {name: os.environ.get(name) for name in STATE_VARIABLES}
+    os.environ.update(dict.fromkeys(STATE_VARIABLES, directory))
+    QSettings.setDefaultFormat(QSettings.IniFormat)
+    for settings_format in (QSettings.NativeFormat, QSettings.IniFormat):
+        QSettings.setPath(settings_format, QSettings.UserScope, directory)
+    return previous
+
+
+def restore_state(previous):
+    for name, value in previous.items():
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
+
+
+def install_fake_platform():
+    # Windows'a özgü kontroller Linux'ta hata verir; iletişim kutuları
+    # olay döngüsünü bekletmesin diye kaydedilip hemen kapatılır
+    from PyQt5.QtWidgets import QMessageBox
+
+    sys.modules['winreg'] = FakeWinreg()
+    dialogs = []
+
+    def dismiss(kind):
+        def show(parent, title, text, *args, **kwargs):
+            dialogs.append((kind, title, text))
+            return QMessageBox.Ok
+        return staticmethod(show)
+
+    for kind in ('information', 'warning', 'critical', 'question'):
+        setattr(QMessageBox, kind, dismiss(kind))
+    return dialogs
+
+
+def measure(function, repeat, warmup=1):
+    for _ in range(warmup):
+        function()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return summarize_timings(timings)
+
+
+def summarize_timings(timings):
+    return {
+        'median_ms': round(statistics.median(timings), 3),
+        'min_ms': round(min(timings), 3),
+        'max_ms': round(max(timings), 3),
+        'runs': len(timings),
+    }
+
+
+def startup_child():
+    # Ayrı süreçte: soğuk içe aktarma, pencere, ilk kare ve sistem kontrolleri
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import QTimer
+
+    if os.environ.get(STATE_DIR_VARIABLE):
+        isolate_state(os.environ[STATE_DIR_VARIABLE])
+    app = QApplication(sys.argv[:1])
+    install_fake_platform()
+    import wom
+    import wom_startup
+
+    editor = wom.WindowsOEMEditor()
+    editor.show()
+    wom_startup.mark('show')
+
+    def wait():
+        if any(name == 'interactive' for name, _ in wom_startup.marks()):
+            app.quit()
+        else:
+            QTimer.singleShot(1, wait)
+
+    QTimer.singleShot(0, wait)
+    app.exec_()
+    print(json.dumps({name: elapsed * 1000 for name, elapsed in wom_startup.marks()}))
+    return 0
+
+
+def bench_startup(state_dir, repeat):
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen', **{STATE_DIR_VARIABLE: state_dir})
+    env.update(dict.fromkeys(STATE_VARIABLES, state_dir))
+    env.pop('WOM_STARTUP_REPORT', None)
+    stages = {}
+    wall = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), '--startup-child'],
+                                env=env, cwd=BENCH_DIR, capture_output=True, text=True, check=True).stdout
+        wall.append((time.perf_counter() - started) * 1000)
+        marks = json.loads(output.strip().splitlines()[-1])
+        for name in ('imports', 'ui', 'show', 'first_paint', 'interactive'):
+            if name in marks:
+                stages.setdefault(name, []).append(marks[name])
+    results = {'startup.process': summarize_timings(wall)}
+    for name, timings in stages.items():
+        results['startup.' + name] = summarize_timings(timings)
+    return results
+
+
+def make_logo(directory, size, fmt):
+    # Kenarları saydam/düz, ortasında degrade bir logo
+    from PyQt5.QtGui import QImage, QPainter, QColor, QLinearGradient
+    from PyQt5.QtCore import Qt
+
+    width, height = size, size * 9 // 16
+    image = QImage(width, height, QImage.Format_ARGB32)
+    image.fill(Qt.transparent if fmt == 'PNG' else Qt.white)
+    gradient = QLinearGradient(0, 0, width, height)
+    gradient.setColorAt(0, QColor(200, 30, 30))
+    gradient.setColorAt(1, QColor(30, 60, 200))
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setBrush(gradient)
+    painter.setPen(Qt.NoPen)
+    painter.drawEllipse(width // 8, height // 8, width * 3 // 4, height * 3 // 4)
+    painter.end()
+    path = os.path.join(directory, f"logo_{size}.{fmt.lower()}")
+    image.save(path, fmt)
+    return path
+
+
+def bench_logos(directory, repeat):
+    from wom_logo import LogoAsset
+    from wom_optimize import optimize_logo
+
+    results = {}
+    for size in LOGO_SIZES:
+        for fmt in LOGO_FORMATS:
+            path = make_logo(directory, size, fmt)
+
+            # browse_logo yolu: çözme ve önizleme boyutuna ölçekleme
+            def load():
+                LogoAsset(path).scaled(120, 60)
+            results[f"logo.load.{fmt.lower()}.{size}"] = measure(load, repeat)
+
+            # build_image yolu: önbellekteki görüntüden kırpma, ölçekleme ve kodlama
+            asset = LogoAsset(path)
+            rgba = asset.rgba()
+            for target in ('PNG', 'BMP'):
+                results[f"logo.encode.{fmt.lower()}.{size}.{target.lower()}"] = measure(
+                    lambda: optimize_logo(rgba, 96, target), repeat)
+    return results
+
+
+def bench_language_switch(repeat):
+    import wom
+
+    app = qt_app()
+    editor = wom.WindowsOEMEditor()
+    editor.show()
+    app.processEvents()
+    # Tam değişim: tüm sekmeler kurulmuş olsun
+    for index in range(editor.tabs.count()):
+        editor.ensure_tab(index)
+    languages = ['tr', 'en']
+    state = {'index': 0}
+
+    def switch():
+        state['index'] ^= 1
+        editor.set_language(languages[state['index']])
+        app.processEvents()
+
+    result = measure(switch, repeat)
+    editor.close()
+    editor.deleteLater()
+    app.processEvents()
+    return {'i18n.switch': result}
+
+
+def bench_apply(directory, repeat):
+    from wom_core import apply_profile, apply_to_image, DEFAULT_PROFILE
+    from wom_registry import MemoryBackend
+    from wom_hive import create_hive
+    import wom_bundle
+
+    logo = make_logo(directory, 1024, 'PNG')
+    profile = dict(DEFAULT_PROFILE, manufacturer='Contoso', model='Contoso Book 14',
+                   support_url='https://support.contoso.example', logo=logo)
+    system_root = os.path.join(directory, 'Windows')
+
+    results = {}
+    results['apply.dry_run'] = measure(lambda: apply_profile(
+        profile, system_root=system_root, use_bmp_only=False, dry_run=True,
+        backend=MemoryBackend(FAKE_REGISTRY)), repeat)
+
+    image_root = os.path.join(directory, 'image')
+    config_dir = os.path.join(image_root, 'Windows', 'System32', 'config')
+    os.makedirs(config_dir, exist_ok=True)
+    create_hive(os.path.join(config_dir, 'SOFTWARE'))
+    results['apply.image_dry_run'] = measure(lambda: apply_to_image(profile, image_root, dry_run=True), repeat)
+
+    # Paketten uygulama: logo hazır kodlanmış olduğundan görüntü işlenmez
+    bundle_path = os.path.join(directory, 'profile' + wom_bundle.BUNDLE_EXTENSION)
+    wom_bundle.write_bundle(bundle_path, profile)
+    bundle = wom_bundle.read_bundle(bundle_path)
+    results['apply.bundle_dry_run'] = measure(lambda: apply_profile(
+        bundle.profile, system_root=system_root, use_bmp_only=False, dry_run=True,
+        backend=MemoryBackend(FAKE_REGISTRY), logo_data=bundle.logos), repeat)
+    return results
+
+
+def bench_apply_ui(directory, repeat):
+    # Pencereden uygulama: düğme yuvasının süresi ve uygulama sürerken olay
+    # döngüsündeki en uzun duraklama (adımlar iş parçacığında çalışır)
+    from PyQt5.QtCore import QTimer
+    import wom
+    import wom_pipeline
+
+    app = qt_app()
+    editor = wom.WindowsOEMEditor()
+    editor.show()
+    app.processEvents()
+    editor.current_logo = make_logo(directory, 4096, 'PNG')
+    system_root = os.environ.get('SystemRoot')
+    os.environ['SystemRoot'] = os.path.join(directory, 'Windows')
+    is_admin = wom_pipeline.is_admin
+    wom_pipeline.is_admin = lambda: True
+    slots = []
+    stalls = []
+    try:
+        for index in range(repeat + 1):
+            # Her turda başka boyut: logo depodan gelmez, gerçekten kodlanır
+            editor.logo_size.setValue(64 + index)
+            gaps = [0.0]
+            last = [time.perf_counter()]
+
+            def tick():
+                now = time.perf_counter()
+                gaps.append(now - last[0])
+                last[0] = now
+
+            timer = QTimer()
+            timer.timeout.connect(tick)
+            timer.start(1)
+            started = time.perf_counter()
+            editor.build_image()
+            slot = (time.perf_counter() - started) * 1000
+            last[0] = time.perf_counter()
+            while editor.apply_task is not None:
+                app.processEvents()
+                time.sleep(0.001)
+            timer.stop()
+            if index:
+                slots.append(slot)
+                stalls.append(max(gaps) * 1000)
+    finally:
+        wom_pipeline.is_admin = is_admin
+        if system_root is None:
+            os.environ.pop('SystemRoot', None)
+        else:
+            os.environ['SystemRoot'] = system_root
+        editor.close()
+        editor.deleteLater()
+        app.processEvents()
+    return {'apply.ui_slot': summarize_timings(slots), 'apply.ui_stall': summarize_timings(stalls)}
+
+
+def make_layers(directory, regions=4, models=5, machines=50):
+    # Taban -> bölge -> model -> makine; yollar makine katmanlarıdır
+    root = os.path.join(directory, 'layers')
+    os.makedirs(root, exist_ok=True)
+
+    def write(name, data):
+        path = os.path.join(root, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        return path
+
+    write('base.json', {'manufacturer': 'Contoso', 'support_url': 'https://support.contoso.example',
+                        'support_hours': '09:00-18:00', 'logo_size': 120})
+    paths = []
+    for region in range(regions):
+        write(f'region{region}.json', {'extends': 'base.json', 'support_phone': f'+90 212 555 {region:04}'})
+        for model in range(models):
+            model_name = f'model{region}-{model}.json'
+            write(model_name, {'extends': f'region{region}.json', 'model': f'Contoso Book {model}'})
+            for machine in range(machines):
+                paths.append(write(f'machine{region}-{model}-{machine}.json',
+                                   {'extends': model_name, 'organization': f'Branch {machine}'}))
+    return root, paths
+
+
+def bench_layers(directory, repeat):
+    # Katmanlı profiller: soğuk çözümleme, değişiklik yokken yeniden çözümleme ve
+    # tek bir model katmanı değiştiğinde yalnızca onun makinelerinin yeniden birleşmesi
+    from wom_layers import ProfileResolver
+
+    root, paths = make_layers(directory)
+    results = {'profile.resolve_cold': measure(lambda: ProfileResolver().resolve_many(paths), repeat)}
+    resolver = ProfileResolver()
+    resolver.resolve_many(paths)
+    results['profile.resolve_warm'] = measure(lambda: resolver.resolve_many(paths), repeat)
+
+    model_path = os.path.join(root, 'model0-0.json')
+    counter = [0]
+
+    def change_model():
+        counter[0] += 1
+        with open(model_path, 'w', encoding='utf-8') as f:
+            json.dump({'extends': 'region0.json', 'model': f'Contoso Book rev {counter[0]}'}, f)
+        resolver.resolve_many(paths)
+
+    results['profile.resolve_model_change'] = measure(change_model, repeat)
+    return results
+
+
+def run(repeat=DEFAULT_REPEAT, startup_repeat=5, only=None):
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtCore import PYQT_VERSION_STR, qVersion
+
+    groups = {
+        'startup': lambda directory: bench_startup(state_dir, startup_repeat),
+        'logo': lambda directory: bench_logos(directory, repeat),
+        'i18n': lambda directory: bench_language_switch(repeat),
+        'apply': lambda directory: dict(bench_apply(directory, repeat), **bench_apply_ui(directory, repeat)),
+        'profile': lambda directory: bench_layers(directory, repeat),
+    }
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='wom-bench-') as directory:
+        # Örnek dosyalar ve kalıcı durum ayrı klasörlerde
+        state_dir = os.path.join(directory, 'state')
+        os.makedirs(state_dir)
+        previous = isolate_state(state_dir)
+        try:
+            qt_app()
+            install_fake_platform()
+            for name, group in groups.items():
+                if only and name not in only:
+                    continue
+                try:
+                    results.update(group(directory))
+                except (ImportError, SyntaxError) as e:
+                    # Eksik ölçümle karşılaştırma yapılmaz; grup çalışamıyorsa ölçüm durur
+                    raise BenchError(f"benchmark group {name!r} cannot run: {type(e).__name__}: {e}") from e
+        finally:
+            restore_state(previous)
+    return {
+        'version': RESULTS_VERSION,
+        'python': platform.python_version(),
+        # Çalışan Qt kitaplığı; QT_VERSION_STR, PyQt'nin derlendiği sürümdür
+        'qt': qVersion(),
+        'pyqt': PYQT_VERSION_STR,
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+
+def merge_passes(passes):
+    # Her ölçüm için ortancası en yavaş geçişin özeti: makinenin olağan oynamasının üst ucu
+    merged = dict(passes[0], passes=len(passes))
+    merged['results'] = {
+        name: max((p['results'][name] for p in passes if name in p['results']), key=lambda r: r['median_ms'])
+        for name in passes[0]['results']}
+    return merged
+
+
+def thresholds(name, tolerance=DEFAULT_TOLERANCE, min_delta_ms=MIN_DELTA_MS):
+    # (kat, en az fark ms); gürültülü ölçümlerde eşikler genişler, hiçbir zaman daralmaz
+    for prefix, (wider, delta) in NOISY.items():
+        if name.startswith(prefix):
+            return max(tolerance, wider), max(min_delta_ms, delta)
+    return tolerance, min_delta_ms
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE, min_delta_ms=MIN_DELTA_MS, groups=GROUPS):
+    # Dönüş: [(ad, taban ms, şimdiki ms, oran, gerileme mi)]; çalışan gruplarda
+    # taban çizgisinde olup ölçülmeyenler şimdiki ms'i None olarak döner
+    rows = []
+    for name, base in sorted(baseline.get('results', {}).items()):
+        if name not in results['results'] and name.split('.')[0] in groups:
+            rows.append((name, base['median_ms'], None, None, False))
+    for name, current in sorted(results['results'].items()):
+        base = baseline.get('results', {}).get(name)
+        if base is None:
+            rows.append((name, None, current['median_ms'], None, False))
+            continue
+        base_ms, current_ms = base['median_ms'], current['median_ms']
+        ratio = current_ms / base_ms if base_ms else None
+        limit, delta = thresholds(name, tolerance, min_delta_ms)
+        regressed = current_ms > base_ms * limit and current_ms - base_ms > delta
+        rows.append((name, base_ms, current_ms, ratio, regressed))
+    return rows
+
+
+def format_report(rows):
+    lines = [f"{'benchmark':<34} {'baseline':>10} {'current':>10} {'ratio':>7}"]
+    for name, base_ms, current_ms, ratio, regressed in rows:
+        base = f"{base_ms:.2f}" if base_ms is not None else '-'
+        if current_ms is None:
+            lines.append(f"{name:<34} {base:>10} {'-':>10} {'missing':>7}")
+            continue
+        change = f"{ratio:.2f}x" if ratio is not None else 'new'
+        flag = '  SLOWER' if regressed else ''
+        lines.append(f"{name:<34} {base:>10} {current_ms:>10.2f} {change:>7}{flag}")
+    return "\n".join(lines)
+
+
+def write_json(path, data):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='wom_bench', description='WOM performance benchmarks')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='baseline results to compare against')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--update-baseline', action='store_true', help='store the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='slowdown factor that fails the run (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='timed runs per benchmark')
+    parser.add_argument('--passes', type=int, default=BASELINE_PASSES,
+                        help='separate passes measured for --update-baseline (default: %(default)s)')
+    parser.add_argument('--startup-repeat', type=int, default=5, help='cold starts to measure')
+    parser.add_argument('--only', nargs='+', choices=GROUPS,
+                        help='run only these groups')
+    parser.add_argument('--startup-child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.startup_child:
+        return startup_child()
+
+    try:
+        if args.update_baseline:
+            results = merge_passes([run(args.repeat, args.startup_repeat, args.only)
+                                    for _ in range(max(1, args.passes))])
+        else:
+            results = run(args.repeat, args.startup_repeat, args.only)
+    except BenchError as e:
+        print(e, file=sys.stderr)
+        return 2
+    if args.output:
+        write_json(args.output, results)
+    if args.update_baseline:
+        write_json(args.baseline, results)
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(format_report(compare(results, {})))
+        print(f"no baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    rows = compare(results, baseline, args.tolerance, groups=args.only or GROUPS)
+    print(format_report(rows))
+    status = 0
+    missing = [row[0] for row in rows if row[2] is None]
+    if missing:
+        print(f"{len(missing)} baseline benchmark(s) did not run: {', '.join(missing)}", file=sys.stderr)
+        status = 1
+    slower = [row[0] for row in rows if row[4]]
+    if slower:
+        print(f"{len(slower)} benchmark(s) slower than {args.tolerance}x baseline: {', '.join(slower)}",
+              file=sys.stderr)
+        status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
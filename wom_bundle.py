@@ -0,0 +1,89 @@
+import io
+import json
+import zipfile
+
+from wom_core import ProfileError, normalize_profile, cached_logo
+
+# Tek dosyalık profil paketi (.wombundle): sürümlü profil ve hedef logo_size'a
+# önceden kodlanmış logolar. Paketten uygulama yaparken görüntü işlenmez.
+# Dosya sıkıştırmasız bir ZIP'tir; logolar zaten sıkıştırılmış formatlardadır.
+
+BUNDLE_EXTENSION = '.wombundle'
+BUNDLE_FORMAT = 'wom-bundle'
+BUNDLE_VERSION = 1
+MANIFEST_NAME = 'profile.json'
+LOGO_FORMATS = ('PNG', 'BMP')
+
+
+class Bundle:
+    def __init__(self, profile, logos=None, logo_size=None):
+        self.profile = profile
+        self.logos = logos or {}
+        self.logo_size = logo_size
+
+
+def is_bundle(path):
+    with open(path, 'rb') as f:
+        return f.read(4) == b'PK\x03\x04'
+
+
+def encode_bundle_logos(source, logo_size):
+    return {fmt: cached_logo(source, logo_size, fmt) for fmt in LOGO_FORMATS}
+
+
+def write_bundle(path, profile, logos=None):
+    # logos: {format: bayt}; verilmezse profildeki logo Pillow ile kodlanır
+    profile = dict(profile)
+    if logos is None and profile.get('logo'):
+        logos = encode_bundle_logos(profile['logo'], profile['logo_size'])
+    logos = logos or {}
+
+    files = {fmt: 'logo.' + fmt.lower() for fmt in logos}
+    profile['logo'] = files.get('PNG') or next(iter(files.values()), None)
+    manifest = {
+        'format': BUNDLE_FORMAT,
+        'version': BUNDLE_VERSION,
+        'profile': profile,
+        'logo': {'size': profile['logo_size'], 'files': files} if files else None,
+    }
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED) as bundle:
+        bundle.writestr(MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, separators=(',', ':')))
+        for fmt, name in files.items():
+            bundle.writestr(name, logos[fmt])
+
+
+def read_bundle(path, load_logos=True):
+    try:
+        archive = zipfile.ZipFile(path)
+    except zipfile.BadZipFile:
+        raise ProfileError(f"{path}: not a profile bundle")
+    with archive:
+        try:
+            with archive.open(MANIFEST_NAME) as f:
+                manifest = json.load(io.TextIOWrapper(f, encoding='utf-8'))
+        except KeyError:
+            raise ProfileError(f"{path}: {MANIFEST_NAME} is missing")
+
+        # Kontroller ucuzdan pahalıya sıralıdır; ilk hatada durulur
+        if not isinstance(manifest, dict) or manifest.get('format') != BUNDLE_FORMAT:
+            raise ProfileError(f"{path}: not a profile bundle")
+        version = manifest.get('version')
+        if not isinstance(version, int) or version > BUNDLE_VERSION:
+            raise ProfileError(f"{path}: unsupported bundle version {version!r}")
+
+        profile = normalize_profile(manifest.get('profile'))
+        logo = manifest.get('logo') or {}
+        files = logo.get('files') or {}
+        if logo and logo.get('size') != profile['logo_size']:
+            raise ProfileError(f"{path}: logo was encoded at {logo.get('size')} px, "
+                               f"profile asks for {profile['logo_size']} px")
+
+        logos = {}
+        if load_logos:
+            for fmt, name in files.items():
+                try:
+                    logos[fmt] = archive.read(name)
+                except KeyError:
+                    raise ProfileError(f"{path}: {name} is missing")
+        profile['logo'] = f"{path}!{profile['logo']}" if files else None
+    return Bundle(profile, logos, logo.get('size'))
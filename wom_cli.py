@@ -0,0 +1,261 @@
+import sys
+
+# Bu modül Qt'yi asla içe aktarmaz; wom.py betik komutlarını buraya yönlendirir
+COMMANDS = ('apply', 'bundle', 'library', 'images', 'unattend', 'keys', 'daemon', 'resolve')
+
+
+def is_cli_invocation(argv):
+    return len(argv) > 1 and argv[1] in COMMANDS
+
+
+def build_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='wom', description='Windows OEM Master')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    apply_parser = subparsers.add_parser('apply', help='apply an exported OEM profile')
+    apply_parser.add_argument('--config', required=True,
+                              help='profile JSON written by "Export" or a .wombundle file')
+    target = apply_parser.add_mutually_exclusive_group()
+    target.add_argument('--system-root', help='Windows directory (default: %%SystemRoot%%)')
+    target.add_argument('--image', nargs='+', metavar='DIR',
+                        help='root(s) of mounted Windows images; their offline SOFTWARE hives are patched')
+    apply_parser.add_argument('--bmp', action='store_true', default=None,
+                              help='write the logo as BMP for legacy targets')
+    apply_parser.add_argument('--dry-run', action='store_true',
+                              help='show what would be written without changing anything')
+    apply_parser.add_argument('--jobs', type=int, metavar='N',
+                              help='images branded in parallel (default: CPU count, at most 8)')
+
+    bundle_parser = subparsers.add_parser('bundle', help='pack a profile and its encoded logo into one file')
+    bundle_parser.add_argument('--config', required=True, help='profile JSON written by "Export"')
+    bundle_parser.add_argument('--output', required=True, help='target .wombundle file')
+
+    library_parser = subparsers.add_parser('library', help='index and search the profile library')
+    library_parser.add_argument('--db', help='library database (default: per-user WOM data folder)')
+    library_parser.add_argument('--index', nargs='+', metavar='DIR', default=[],
+                                help='folders to (re)index; only changed files are read')
+    library_parser.add_argument('--search', metavar='TEXT', help='search manufacturer, model, support and version')
+    library_parser.add_argument('--limit', type=int, default=20)
+
+    images_parser = subparsers.add_parser('images', help='list the images in install.wim/.esd files')
+    images_parser.add_argument('files', nargs='+', metavar='FILE', help='install.wim, install.esd or .swm file')
+
+    unattend_parser = subparsers.add_parser('unattend', help='write autounattend.xml answer files')
+    unattend_parser.add_argument('--config', required=True, help='profile JSON or .wombundle file')
+    unattend_parser.add_argument('--machines', metavar='CSV',
+                                 help='one row per machine (serial, computer_name, owner, organization, '
+                                      'product_key); empty cells use the profile')
+    unattend_parser.add_argument('--output', required=True,
+                                 help='answer file, or with --machines a folder or .zip archive')
+    unattend_parser.add_argument('--template', help='answer file template with {{field}} placeholders')
+    unattend_parser.add_argument('--arch', default='amd64', help='processor architecture (default: amd64)')
+    unattend_parser.add_argument('--bmp', action='store_true',
+                                 help='point the OEM logo at oemlogo.bmp for legacy targets')
+
+    keys_parser = subparsers.add_parser('keys', help='manage the product-key pool')
+    keys_parser.add_argument('--db', help='key pool database (default: per-user WOM data folder)')
+    keys_parser.add_argument('--import', dest='import_files', nargs='+', metavar='FILE', default=[],
+                             help='text files with one product key per line; invalid keys are skipped')
+    keys_parser.add_argument('--pool', default='', help='pool the imported keys go to (profiles use "pool:NAME")')
+    keys_parser.add_argument('--lookup', metavar='MACHINE', help='show the key assigned to a machine')
+    keys_parser.add_argument('--check', nargs='+', metavar='KEY', default=[],
+                             help='validate keys without storing them')
+
+    daemon_parser = subparsers.add_parser('daemon', help='serve apply, dry-run and read-current over local JSON-RPC')
+    daemon_parser.add_argument('--port', type=int, default=47715,
+                               help='TCP port on 127.0.0.1 (default: %(default)s; 0 picks a free port)')
+    daemon_parser.add_argument('--socket', metavar='PATH', help='listen on a Unix socket instead (not on Windows)')
+    daemon_parser.add_argument('--state', metavar='FILE',
+                               help='where the address and access token are written (default: per-user WOM data folder)')
+    daemon_parser.add_argument('--system-root', help='Windows directory for the local target (default: %%SystemRoot%%)')
+    daemon_parser.add_argument('--memory-registry', action='store_true',
+                               help='use an in-memory registry for the local target (testing, non-Windows hosts)')
+    daemon_parser.add_argument('--jobs', type=int, metavar='N',
+                               help='targets worked on at the same time (default: CPU count, at most 8)')
+
+    resolve_parser = subparsers.add_parser('resolve', help='show the profile a layered profile resolves to')
+    resolve_parser.add_argument('files', nargs='+', metavar='FILE', help='profile JSON, may "extends" another one')
+    resolve_parser.add_argument('--sources', action='store_true', help='show which layer set each value')
+    return parser
+
+
+def cmd_apply(args):
+    from wom_core import load_profile_source, apply_profile, apply_to_image
+
+    # Paketlerde logo hazır kodlanmıştır; görüntü işlenmez
+    profile, logos = load_profile_source(args.config)
+    if args.image and len(args.image) > 1:
+        return apply_images(args, profile, logos)
+    if args.image:
+        result = apply_to_image(profile, args.image[0], use_bmp_only=bool(args.bmp),
+                                dry_run=args.dry_run, logo_data=logos)
+    else:
+        result = apply_profile(profile, system_root=args.system_root, use_bmp_only=args.bmp,
+                               dry_run=args.dry_run, logo_data=logos)
+    for name, value in result.values.items():
+        marker = '*' if name in result.changed else ' '
+        print(f"{marker} {name} = {value}")
+    if result.logo_file:
+        marker = '*' if result.logo_changed else ' '
+        print(f"{marker} logo file {result.logo_file}")
+    if result.product_key:
+        print(f"  product key {result.product_key}")
+    if result.up_to_date:
+        print("registry and logo are already up to date; nothing written")
+    elif result.dry_run:
+        print(f"dry run: {len(result.changed)} value(s) would change"
+              f"{' and the logo file' if result.logo_changed else ''}, nothing was written")
+    return 0
+
+
+def apply_images(args, profile, logos):
+    from wom_batch import apply_to_images, summarize
+
+    def progress(done, total, target):
+        if target.ok:
+            result = target.result
+            if result.up_to_date:
+                state = "up to date"
+            else:
+                state = f"{len(result.changed)} value(s){' and logo' if result.logo_changed else ''} changed"
+        else:
+            state = f"FAILED: {target.error}"
+        print(f"[{done}/{total}] {target.image_root}: {state} ({target.elapsed:.2f}s)", flush=True)
+
+    results = apply_to_images(profile, args.image, use_bmp_only=bool(args.bmp), dry_run=args.dry_run,
+                              logo_data=logos, workers=args.jobs, progress=progress)
+    total, changed, failed = summarize(results)
+    verb = "would change" if args.dry_run else "changed"
+    print(f"{total} image(s): {changed} {verb}, {total - changed - failed} up to date, {failed} failed")
+    for target in results:
+        if not target.ok:
+            print(f"failed {target.image_root}: {target.error}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def cmd_bundle(args):
+    from wom_core import load_profile
+    from wom_bundle import write_bundle
+
+    write_bundle(args.output, load_profile(args.config))
+    print(f"bundle written to {args.output}")
+    return 0
+
+
+def cmd_library(args):
+    from wom_library import ProfileLibrary, default_library_path
+
+    library = ProfileLibrary(args.db or default_library_path())
+    try:
+        if args.index:
+            updated, removed = library.refresh(args.index)
+            print(f"indexed {updated} changed profile(s), removed {removed}; {len(library)} in library")
+            for path, error in library.errors():
+                print(f"skipped {path}: {error}", file=sys.stderr)
+        if args.search is not None:
+            for entry in library.search(args.search, args.limit):
+                print(f"{entry.title}\t{entry.subtitle}\t{entry.path}")
+    finally:
+        library.close()
+    return 0
+
+
+def cmd_images(args):
+    from wom_wim import read_images
+
+    # Yalnızca başlık ve XML meta verisi okunur
+    for path in args.files:
+        print(path)
+        for image in read_images(path):
+            print(f"  {image.index}\t{image.display_name or image.name}\t{image.edition}\t{image.version}"
+                  f"\t{','.join(image.languages)}\t{image.arch}\t{image.windows_version or ''}")
+    return 0
+
+
+def cmd_unattend(args):
+    from wom_core import load_profile_source
+    from wom_unattend import write_answer_files, write_answer_file
+
+    profile, _ = load_profile_source(args.config)
+    if not args.machines:
+        write_answer_file(profile, args.output, args.template, args.arch, args.bmp)
+        print(f"answer file written to {args.output}")
+        return 0
+
+    def progress(count):
+        print(f"{count} answer file(s)...", flush=True)
+
+    count, elapsed = write_answer_files(profile, args.machines, args.output, args.template, args.arch,
+                                        args.bmp, progress=progress)
+    print(f"{count} answer file(s) written to {args.output} in {elapsed:.2f}s")
+    return 0
+
+
+def cmd_keys(args):
+    from wom_keys import KeyPool, default_key_pool_path, normalize_key, validate_keys
+
+    if args.check:
+        for key, valid in zip(args.check, validate_keys(args.check)):
+            print(f"{normalize_key(key)}\t{'valid' if valid else 'INVALID'}")
+    if not args.import_files and args.lookup is None and args.check:
+        return 0
+
+    keys = KeyPool(args.db or default_key_pool_path())
+    try:
+        for path in args.import_files:
+            with open(path, encoding='utf-8-sig') as f:
+                result = keys.import_keys(f, args.pool)
+            print(f"{path}: {result.added} added, {result.duplicates} duplicate(s), {result.invalid} invalid")
+            for key in result.rejected:
+                print(f"invalid key {key}", file=sys.stderr)
+        if args.lookup is not None:
+            print(keys.lookup(args.lookup) or f"no key assigned to {args.lookup}")
+        for pool, total, free in keys.stats():
+            print(f"pool {pool or '(default)'}: {total} key(s), {free} free")
+    finally:
+        keys.close()
+    return 0
+
+
+def cmd_daemon(args):
+    from wom_daemon import run_daemon
+
+    return run_daemon(port=args.port, socket_path=args.socket, state_path=args.state,
+                      memory_registry=args.memory_registry, system_root=args.system_root, workers=args.jobs)
+
+
+def cmd_resolve(args):
+    import json
+    from wom_layers import profile_resolver
+
+    resolver = profile_resolver()
+    profiles = resolver.resolve_many(args.files)
+    for path, profile in zip(args.files, profiles):
+        if len(args.files) > 1:
+            print(path)
+        if not args.sources:
+            print(json.dumps(profile, indent=4, ensure_ascii=False))
+            continue
+        print(" <- ".join(resolver.chain(path)))
+        sources = resolver.sources(path)
+        for field, value in profile.items():
+            print(f"  {field}\t{json.dumps(value, ensure_ascii=False)}\t{sources.get(field, '(default)')}")
+    return 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    handler = {'apply': cmd_apply, 'bundle': cmd_bundle, 'library': cmd_library,
+               'images': cmd_images, 'unattend': cmd_unattend, 'keys': cmd_keys,
+               'daemon': cmd_daemon, 'resolve': cmd_resolve}[args.command]
+    try:
+        return handler(args)
+    except Exception as e:
+        print(f"wom {args.command}: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
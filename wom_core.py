@@ -0,0 +1,274 @@
+import sys
+import os
+
+from wom_trace import traced
+
+# Qt'ye bağımlı olmayan çekirdek: betik modu (wom apply) ve arayüz aynı işi yapar
+
+OEM_KEY_PATH = r"SOFTWARE\Microsoft\Windows\CurrentVersion\OEMInformation"
+VERSION_KEY_PATH = r"SOFTWARE\Microsoft\Windows NT\CurrentVersion"
+# Bağlanmış imajdaki Windows, açıldığında bu dizinde çalışır
+IMAGE_SYSTEM_ROOT = "C:\\Windows"
+# Profildeki "pool:<ad>" ürün anahtarı, uygulamada anahtar havuzundan atanır
+POOL_PREFIX = 'pool:'
+
+# Profil alanı -> OEMInformation değer adı
+OEM_VALUE_NAMES = {
+    'manufacturer': 'Manufacturer',
+    'model': 'Model',
+    'support_hours': 'SupportHours',
+    'support_url': 'SupportURL',
+    'support_phone': 'SupportPhone',
+}
+
+DEFAULT_PROFILE = {
+    'manufacturer': '',
+    'model': '',
+    'support_hours': '',
+    'support_url': '',
+    'support_phone': '',
+    'logo': None,
+    'logo_size': 96,
+    'logo_position': 0,
+    'windows_version': 'Windows 11',
+    # install.wim/.esd içindeki görüntü numarası; 0: belirtilmemiş
+    'image_index': 0,
+    'product_key': '',
+    'organization': '',
+    'owner': '',
+    'auto_activate': False,
+    'skip_eula': False,
+    'auto_updates': False,
+}
+
+# Eski dışa aktarımlarda kullanılan alternatif anahtar adları
+PROFILE_ALIASES = {
+    'logo_path': 'logo',
+    'current_logo': 'logo',
+}
+
+
+class ProfileError(Exception):
+    pass
+
+
+class ApplyError(Exception):
+    pass
+
+
+class ApplyResult:
+    def __init__(self, values, logo_path=None, changed=None, dry_run=False, logo_changed=False,
+                 product_key=None, logo_file=None):
+        self.values = values
+        # logo_path registry'ye yazılan yol; logo_file diskteki dosya (imajda bağlama kökünün altında)
+        self.logo_path = logo_path
+        self.logo_file = logo_file or logo_path
+        # Yalnızca registry'de gerçekten değişen (ya da değişecek) değerler
+        self.changed = values if changed is None else changed
+        self.dry_run = dry_run
+        # Hedefteki logo dosyası farklıydı (ya da yoktu)
+        self.logo_changed = logo_changed
+        # Havuzdan atanan (deneme çalışmasında önceden atanmış) ürün anahtarı
+        self.product_key = product_key
+
+    @property
+    def up_to_date(self):
+        return not self.changed and not self.logo_changed
+
+
+def _check_field(key, value):
+    default = DEFAULT_PROFILE[key]
+    if key == 'logo':
+        if value is not None and not isinstance(value, str):
+            raise ProfileError("logo: expected a file path")
+    elif isinstance(default, bool):
+        if not isinstance(value, bool):
+            raise ProfileError(f"{key}: expected true or false")
+    elif isinstance(default, int):
+        # Eski dışa aktarımlar sayıları metin olarak yazmış olabilir
+        if isinstance(value, bool) or not isinstance(value, (int, str)):
+            raise ProfileError(f"{key}: expected an integer")
+        try:
+            value = int(value)
+        except ValueError:
+            raise ProfileError(f"{key}: expected an integer")
+    elif not isinstance(value, str):
+        raise ProfileError(f"{key}: expected text")
+    return value
+
+
+def profile_overrides(data, base_dir=None):
+    # Verideki profil alanları (eksik alanlar eklenmez); katmanlı profillerde katmanın kendi değerleri
+    if not isinstance(data, dict):
+        raise ProfileError("profile must be a JSON object")
+
+    overrides = {}
+    # save_config çıktısı düz ya da bölümlere ayrılmış olabilir.
+    # Alanlar sırayla doğrulanır; ilk hatada durulur.
+    for key, value in data.items():
+        if isinstance(value, dict):
+            items = value.items()
+        else:
+            items = ((key, value),)
+        for field, field_value in items:
+            field = PROFILE_ALIASES.get(field, field)
+            if field in DEFAULT_PROFILE:
+                overrides[field] = _check_field(field, field_value)
+
+    logo = overrides.get('logo')
+    if logo and base_dir and not os.path.isabs(logo):
+        overrides['logo'] = os.path.normpath(os.path.join(base_dir, logo))
+    return overrides
+
+
+def check_profile(profile):
+    # Tam profilin alanlar arası kuralları
+    if not 16 <= profile['logo_size'] <= 512:
+        raise ProfileError("logo_size must be between 16 and 512")
+    return profile
+
+
+def normalize_profile(data, base_dir=None):
+    profile = dict(DEFAULT_PROFILE)
+    profile.update(profile_overrides(data, base_dir))
+    return check_profile(profile)
+
+
+def load_profile(path):
+    # "extends" ile katmanlı profiller de çözülür; okunan katmanlar bellekte tutulur
+    from wom_layers import resolve_profile
+    return resolve_profile(path)
+
+
+def load_profile_source(path):
+    # JSON profil ya da paket; paketler hazır kodlanmış logoları da döndürür
+    import wom_bundle
+
+    if wom_bundle.is_bundle(path):
+        bundle = wom_bundle.read_bundle(path)
+        return bundle.profile, bundle.logos
+    return load_profile(path), None
+
+
+def windows_flags():
+    # check_windows_compatibility ile aynı kurallar
+    if not hasattr(sys, 'getwindowsversion'):
+        return False, False
+    win_ver = sys.getwindowsversion()
+    if win_ver.major < 6:  # XP ve öncesi
+        return True, True
+    return False, win_ver.major == 6 and win_ver.minor == 0  # Vista
+
+
+def windows_version_name(product_name, build):
+    # load_current_oem_info'nun sürüm tespiti; Windows 11 build numarası 22000 ve üzeridir
+    try:
+        if int(build) >= 22000:
+            return "Windows 11"
+    except (TypeError, ValueError):
+        pass
+    product_name = product_name or ''
+    for name in ("Windows 10", "Windows 8.1", "Windows 8", "Windows 7", "Windows Vista", "Windows XP"):
+        if name in product_name:
+            return name
+    return None
+
+
+def is_admin():
+    try:
+        import ctypes
+        return bool(ctypes.windll.shell32.IsUserAnAdmin())
+    except (ImportError, AttributeError):
+        return False
+
+
+def oem_logo_location(system_root, use_bmp_only=False):
+    oem_path = os.path.join(system_root, "System32", "oobe", "info")
+    if use_bmp_only:
+        return oem_path, "oemlogo.bmp", "BMP"
+    return oem_path, "oemlogo.png", "PNG"
+
+
+def fit_size(width, height, target_size):
+    # Qt.KeepAspectRatio ile aynı sonuç
+    scale = min(target_size / width, target_size / height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def encode_logo(source, target_size, logo_format):
+    from PIL import Image
+    from wom_optimize import optimize_logo
+
+    with Image.open(source) as img:
+        img.load()
+        return optimize_logo(img, target_size, logo_format)
+
+
+def cached_logo(source, target_size, logo_format):
+    # Aynı kaynak/boyut/format için önceki kodlama depodan okunur
+    from wom_store import logo_store
+    return logo_store().get(source, target_size, logo_format)
+
+
+def pool_reference(value):
+    # Havuz adı; değer bir havuz başvurusu değilse None
+    if isinstance(value, str) and value.startswith(POOL_PREFIX):
+        return value[len(POOL_PREFIX):].strip()
+    return None
+
+
+def pooled_product_key(profile, machine, dry_run=False):
+    # (anahtar, havuzdan yeni mi alındı); havuz başvurusu yoksa anahtar modülü (NumPy) hiç yüklenmez
+    if pool_reference(profile.get('product_key')) is None:
+        return None, False
+    from wom_keys import claim_product_key
+    return claim_product_key(profile, machine, dry_run)
+
+
+def oem_values(profile, logo_path):
+    values = {name: str(profile.get(field) or '') for field, name in OEM_VALUE_NAMES.items()}
+    values['Logo'] = logo_path or ''
+    return values
+
+
+def default_backend(dry_run=False):
+    from wom_registry import WinRegBackend, MemoryBackend
+    try:
+        return WinRegBackend()
+    except ImportError:
+        if dry_run:
+            # Windows dışında deneme çalıştırması: boş bir registry'ye karşı planla
+            return MemoryBackend()
+        raise ApplyError("the Windows registry is not available on this system")
+
+
+@traced('apply')
+def apply_profile(profile, system_root=None, use_bmp_only=None, dry_run=False,
+                  backend=None, logo_data=None, machine=None):
+    # Arayüzün iş parçacığında çalıştırdığı adımlar; burada tek seferde
+    from wom_pipeline import ApplyJob
+
+    report = ApplyJob(profile, system_root, use_bmp_only, dry_run, backend, logo_data, machine=machine).run()
+    if not report.ok:
+        raise ApplyError(report.message())
+    return report.result
+
+
+def image_paths(image_root):
+    windows_dir = os.path.join(image_root, "Windows")
+    hive_path = os.path.join(windows_dir, "System32", "config", "SOFTWARE")
+    if not os.path.isfile(hive_path):
+        raise ApplyError(f"{image_root}: no Windows\\System32\\config\\SOFTWARE hive found")
+    return windows_dir, hive_path
+
+
+@traced('apply.image')
+def apply_to_image(profile, image_root, use_bmp_only=False, dry_run=False, logo_data=None, machine=None):
+    # Yerel uygulamayla aynı adımlar; registry imajın SOFTWARE hive'ıdır
+    from wom_pipeline import ApplyJob
+
+    report = ApplyJob(profile, use_bmp_only=use_bmp_only, dry_run=dry_run, logo_data=logo_data,
+                      machine=machine, image_root=image_root).run()
+    if not report.ok:
+        raise ApplyError(report.message())
+    return report.result
@@ -0,0 +1,487 @@
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import secrets
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from wom_core import (ApplyError, ProfileError, OEM_KEY_PATH, VERSION_KEY_PATH, normalize_profile, cached_logo,
+                      load_profile, apply_profile, apply_to_image, image_paths, windows_flags, windows_version_name)
+from wom_layers import profile_resolver
+from wom_registry import HiveBackend, MemoryBackend, RegistryWatcher, SnapshotBackend, read_snapshot
+
+# Yerel sağlama servisi. Satır başına bir JSON-RPC 2.0 isteği alır (apply, dry_run,
+# read_current); profil şeması save_config ile aynıdır. Kodlanmış logolar ve
+# registry görüntüleri istekler arasında bellekte tutulur. Aynı hedefe (yerel
+# registry ya da bir imaj klasörü) yapılan işlemler sırayla, farklı hedefler iş
+# parçacıklarında aynı anda çalışır. Yalnızca 127.0.0.1'i (ya da Unix soketini)
+# dinler; her bağlantı önce durum dosyasındaki belirteçle kimliğini doğrular.
+
+HOST = '127.0.0.1'
+DEFAULT_PORT = 47715
+LOCAL_TARGET = 'local'
+MAX_REQUEST = 1024 * 1024
+SNAPSHOT_KEYS = (VERSION_KEY_PATH, OEM_KEY_PATH)
+
+# JSON-RPC hata kodları
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+APPLY_FAILED = -32000
+UNAUTHORIZED = -32001
+
+
+class DaemonError(Exception):
+    def __init__(self, message, code=APPLY_FAILED):
+        super().__init__(message)
+        self.code = code
+
+
+def default_state_path():
+    base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+    return os.path.join(base, 'WOM', 'daemon.json')
+
+
+def write_state(path, state):
+    # Belirteç içerir: yalnızca kullanıcı okuyabilir
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def read_state(path=None):
+    try:
+        with open(path or default_state_path(), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        raise DaemonError("the WOM daemon is not running (no state file)")
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _json_value(value):
+    return value.hex() if isinstance(value, bytes) else value
+
+
+class EncodedLogos:
+    # (yol, mtime, boyut, logo boyutu, biçim) -> kodlanmış bayt; en son kullanılanlar
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, path, target_size, logo_format):
+        st = os.stat(path)
+        key = (os.path.abspath(path), st.st_mtime_ns, st.st_size, target_size, logo_format)
+        with self._lock:
+            data = self.entries.get(key)
+            if data is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return data
+            self.misses += 1
+        # Kalıcı logo deposundan ya da kodlanarak
+        data = cached_logo(path, target_size, logo_format)
+        with self._lock:
+            self.entries[key] = data
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return data
+
+
+class Target:
+    # Yerel registry ya da bağlanmış bir imaj; kilit aynı hedefe işlemleri sıraya koyar
+    def __init__(self, name, image_root=None, backend=None, system_root=None):
+        self.name = name
+        self.image_root = image_root
+        self.backend = backend
+        self.system_root = system_root
+        self.lock = asyncio.Lock()
+        self.snapshot = None
+        self.stamp = None
+        self.watcher = None
+        if image_root is not None:
+            self.hive_path = image_paths(image_root)[1]
+
+    @property
+    def default_bmp(self):
+        return windows_flags()[1] if self.image_root is None else False
+
+    def current_stamp(self):
+        # Yerel görüntü yazımlarda ve izleyiciyle geçersizlenir; imajda hive dosyasının damgası
+        return None if self.image_root is None else _stamp(self.hive_path)
+
+    def cached_snapshot(self):
+        if self.snapshot is not None and self.stamp == self.current_stamp():
+            return self.snapshot
+        return None
+
+    def read_snapshot(self):
+        stamp = self.current_stamp()
+        if self.image_root is None:
+            snapshot = read_snapshot(self._local_backend(), SNAPSHOT_KEYS)
+        else:
+            with HiveBackend(self.hive_path) as backend:
+                snapshot = read_snapshot(backend, SNAPSHOT_KEYS)
+        self.snapshot, self.stamp = snapshot, stamp
+        return snapshot
+
+    def apply(self, profile, use_bmp_only, dry_run, logo_data, machine):
+        if self.image_root is None:
+            return self._apply_local(profile, use_bmp_only, dry_run, logo_data, machine)
+        result = apply_to_image(profile, self.image_root, use_bmp_only=use_bmp_only, dry_run=dry_run,
+                                logo_data=logo_data, machine=machine)
+        if not dry_run and not result.up_to_date:
+            self.snapshot = None
+        return result
+
+    def _apply_local(self, profile, use_bmp_only, dry_run, logo_data, machine):
+        if self.backend is None and dry_run:
+            # Registry yoksa deneme çalıştırması boş bir registry'ye karşı planlanır
+            return apply_profile(profile, system_root=self.system_root, use_bmp_only=use_bmp_only,
+                                 dry_run=True, backend=MemoryBackend(), logo_data=logo_data, machine=machine)
+        # Fark registry yeniden okunmadan önbellekteki görüntüye karşı alınır; yazılanlar
+        # görüntüye işlenir, dışarıdan yapılan değişiklikleri izleyici bildirir
+        snapshot = self.cached_snapshot() or self.read_snapshot()
+        backend = SnapshotBackend(self._local_backend(), snapshot)
+        try:
+            return apply_profile(profile, system_root=self.system_root, use_bmp_only=use_bmp_only,
+                                 dry_run=dry_run, backend=backend, logo_data=logo_data, machine=machine)
+        finally:
+            # İzleyici bu arada daha yeni bir görüntü verdiyse o kalır
+            if self.snapshot is snapshot:
+                self.snapshot = backend.snapshot
+            self.watch()
+
+    def _local_backend(self):
+        if self.backend is None:
+            raise ApplyError("the Windows registry is not available; start the daemon with --memory-registry")
+        return self.backend
+
+    def watch(self):
+        # Windows'ta dışarıdan yapılan değişiklikler yerel görüntüyü yeniler
+        from wom_registry import WinRegBackend
+
+        if self.image_root is None and self.watcher is None and isinstance(self.backend, WinRegBackend):
+            self.watcher = RegistryWatcher(self.backend, SNAPSHOT_KEYS, self._on_changed,
+                                           snapshot=self.snapshot).start()
+
+    def _on_changed(self, snapshot, changed):
+        self.snapshot = snapshot
+
+    def close(self):
+        if self.watcher is not None:
+            self.watcher.stop(timeout=1)
+            self.watcher = None
+
+
+class ProvisioningDaemon:
+    def __init__(self, registry_backend=None, system_root=None, workers=None):
+        if registry_backend is None:
+            from wom_registry import WinRegBackend
+            try:
+                registry_backend = WinRegBackend()
+            except ImportError:
+                pass
+        self.registry_backend = registry_backend
+        self.system_root = system_root
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='wom-daemon')
+        self.token = secrets.token_hex(16)
+        self.targets = {}
+        self.logos = EncodedLogos()
+        self.started = time.monotonic()
+        self.counts = {'requests': 0, 'snapshot_hits': 0, 'snapshot_misses': 0}
+        self.methods = {
+            'authenticate': self.rpc_authenticate,
+            'apply': partial(self.rpc_apply, dry_run=False),
+            'dry_run': partial(self.rpc_apply, dry_run=True),
+            'read_current': self.rpc_read_current,
+            'stats': self.rpc_stats,
+            'shutdown': self.rpc_shutdown,
+        }
+        self._stopped = None
+
+    def target(self, name):
+        if name in (None, '', LOCAL_TARGET):
+            key = LOCAL_TARGET
+        else:
+            if not isinstance(name, str):
+                raise DaemonError("target must be an image folder or \"local\"", INVALID_PARAMS)
+            key = os.path.normcase(os.path.realpath(name))
+        target = self.targets.get(key)
+        if target is None:
+            if key == LOCAL_TARGET:
+                target = Target(LOCAL_TARGET, backend=self.registry_backend, system_root=self.system_root)
+            else:
+                # Hive yoksa image_paths hata verir
+                target = Target(name, image_root=name)
+            self.targets[key] = target
+        return target
+
+    async def run(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, partial(function, *args))
+
+    def rpc_authenticate(self, params, session):
+        token = params.get('token')
+        if not isinstance(token, str) or not secrets.compare_digest(token, self.token):
+            raise DaemonError("invalid token", UNAUTHORIZED)
+        session['authenticated'] = True
+        return True
+
+    async def rpc_apply(self, params, session, dry_run=False):
+        try:
+            if params.get('profile_path') is not None:
+                # Katmanlı profil: ortak katmanlar servisin önbelleğinden gelir
+                profile = await self.run(load_profile, params['profile_path'])
+            else:
+                profile = normalize_profile(params.get('profile'), base_dir=params.get('base_dir'))
+        except (ProfileError, OSError, ValueError) as e:
+            raise DaemonError(f"profile: {e}", INVALID_PARAMS)
+        target = self.target(params.get('target'))
+        use_bmp_only = params.get('bmp')
+        if use_bmp_only is None:
+            use_bmp_only = target.default_bmp
+        started = time.perf_counter()
+        logo_data = None
+        if profile['logo']:
+            logo_format = 'BMP' if use_bmp_only else 'PNG'
+            logo_data = {logo_format: await self.run(self.logos.get, profile['logo'], profile['logo_size'],
+                                                     logo_format)}
+        async with target.lock:
+            result = await self.run(target.apply, profile, use_bmp_only, dry_run, logo_data, params.get('machine'))
+        return {
+            'target': target.name,
+            'dry_run': result.dry_run,
+            'values': result.values,
+            'changed': sorted(result.changed),
+            'logo_path': result.logo_path,
+            'logo_changed': result.logo_changed,
+            'product_key': result.product_key,
+            'up_to_date': result.up_to_date,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 3),
+        }
+
+    async def rpc_read_current(self, params, session):
+        target = self.target(params.get('target'))
+        snapshot = target.cached_snapshot()
+        cached = snapshot is not None
+        if cached:
+            self.counts['snapshot_hits'] += 1
+        else:
+            self.counts['snapshot_misses'] += 1
+            async with target.lock:
+                snapshot = await self.run(target.read_snapshot)
+            target.watch()
+        product_name = snapshot.get(VERSION_KEY_PATH, 'ProductName')
+        build = snapshot.get(VERSION_KEY_PATH, 'CurrentBuildNumber')
+        return {
+            'target': target.name,
+            'cached': cached,
+            'oem': {name: _json_value(value) for name, (_, value) in snapshot.values(OEM_KEY_PATH).items()},
+            'product_name': product_name,
+            'build': build,
+            'windows_version': windows_version_name(product_name, build),
+        }
+
+    def rpc_stats(self, params, session):
+        return dict(self.counts, uptime_s=round(time.monotonic() - self.started, 3), targets=len(self.targets),
+                    logo_hits=self.logos.hits, logo_misses=self.logos.misses,
+                    profile_reads=profile_resolver().reads, profile_merges=profile_resolver().merges,
+                    workers=self.workers)
+
+    def rpc_shutdown(self, params, session):
+        self._stopped.set()
+        return True
+
+    async def dispatch(self, line, session):
+        # Yanıt sözlüğü; bildirimlerde (id yok) None
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return _error(None, PARSE_ERROR, "invalid JSON")
+        if not isinstance(request, dict) or request.get('jsonrpc') != '2.0' \
+                or not isinstance(request.get('method'), str):
+            return _error(request.get('id') if isinstance(request, dict) else None, INVALID_REQUEST,
+                          "invalid JSON-RPC 2.0 request")
+        request_id = request.get('id')
+        params = request.get('params', {})
+        method = self.methods.get(request['method'])
+        if method is None:
+            response = _error(request_id, METHOD_NOT_FOUND, f"unknown method {request['method']!r}")
+        elif not isinstance(params, dict):
+            response = _error(request_id, INVALID_PARAMS, "params must be an object")
+        elif request['method'] != 'authenticate' and not session['authenticated']:
+            response = _error(request_id, UNAUTHORIZED, "authenticate first")
+        else:
+            self.counts['requests'] += 1
+            try:
+                result = method(params, session)
+                if asyncio.iscoroutine(result):
+                    result = await result
+                response = {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+            except DaemonError as e:
+                response = _error(request_id, e.code, str(e))
+            except Exception as e:
+                response = _error(request_id, APPLY_FAILED, str(e))
+        return response if 'id' in request else None
+
+    async def handle_connection(self, reader, writer):
+        # Bir bağlantıdaki istekler ayrı görevlerde; yanıtlar bitiş sırasıyla (id ile eşlenir)
+        session = {'authenticated': False}
+        write_lock = asyncio.Lock()
+        tasks = set()
+
+        async def send(response):
+            data = (json.dumps(response, ensure_ascii=False) + '\n').encode('utf-8')
+            async with write_lock:
+                writer.write(data)
+                await writer.drain()
+
+        async def respond(line):
+            response = await self.dispatch(line, session)
+            if response is not None:
+                await send(response)
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # MAX_REQUEST'i aşan satır: bağlantı kapatılır
+                    await send(_error(None, INVALID_REQUEST, "request too large"))
+                    break
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.ensure_future(respond(line))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            pass
+        except asyncio.CancelledError:
+            # Servis kapanırken açık bağlantılar sessizce kapatılır
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host=HOST, port=DEFAULT_PORT, socket_path=None, state_path=None, ready=None):
+        self._stopped = asyncio.Event()
+        if socket_path:
+            server = await asyncio.start_unix_server(self.handle_connection, path=socket_path, limit=MAX_REQUEST)
+            os.chmod(socket_path, 0o600)
+            state = {'socket': socket_path}
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_REQUEST)
+            state = {'host': host, 'port': server.sockets[0].getsockname()[1]}
+        state.update(pid=os.getpid(), token=self.token)
+        state_path = state_path or default_state_path()
+        write_state(state_path, state)
+        if ready is not None:
+            ready(state)
+        try:
+            async with server:
+                await self._stopped.wait()
+        finally:
+            for target in self.targets.values():
+                target.close()
+            self.executor.shutdown(wait=False)
+            try:
+                os.remove(state_path)
+            except OSError:
+                pass
+            if socket_path:
+                try:
+                    os.remove(socket_path)
+                except OSError:
+                    pass
+
+
+def _error(request_id, code, message):
+    return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}}
+
+
+class DaemonClient:
+    # Eş zamanlı olmayan basit istemci; bağlantı bilgisi ve belirteç durum dosyasından
+    def __init__(self, state_path=None, timeout=60.0):
+        state = read_state(state_path)
+        if state.get('socket'):
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(timeout)
+            self.sock.connect(state['socket'])
+        else:
+            self.sock = socket.create_connection((state['host'], state['port']), timeout=timeout)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.file = self.sock.makefile('rwb')
+        self.next_id = 0
+        self.call('authenticate', token=state['token'])
+
+    def call(self, method, **params):
+        self.next_id += 1
+        request = {'jsonrpc': '2.0', 'id': self.next_id, 'method': method, 'params': params}
+        self.file.write(json.dumps(request, ensure_ascii=False).encode('utf-8') + b'\n')
+        self.file.flush()
+        line = self.file.readline()
+        if not line:
+            raise DaemonError("the WOM daemon closed the connection")
+        response = json.loads(line)
+        if 'error' in response:
+            raise DaemonError(response['error']['message'], response['error']['code'])
+        return response['result']
+
+    def apply(self, profile, target=None, **options):
+        return self.call('apply', profile=profile, target=target, **options)
+
+    def dry_run(self, profile, target=None, **options):
+        return self.call('dry_run', profile=profile, target=target, **options)
+
+    def read_current(self, target=None):
+        return self.call('read_current', target=target)
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+
+def run_daemon(port=DEFAULT_PORT, socket_path=None, state_path=None, memory_registry=False, system_root=None,
+               workers=None):
+    registry_backend = None
+    if memory_registry:
+        # Windows dışında ya da denemelerde gerçek registry yerine bellek içi registry
+        from wom_registry import MemoryBackend
+        registry_backend = MemoryBackend()
+    daemon = ProvisioningDaemon(registry_backend, system_root or os.environ.get('SystemRoot'), workers)
+
+    def ready(state):
+        where = state.get('socket') or f"{state['host']}:{state['port']}"
+        print(f"WOM daemon listening on {where}", flush=True)
+
+    try:
+        asyncio.run(daemon.serve(port=port, socket_path=socket_path, state_path=state_path, ready=ready))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    import wom_cli
+    sys.exit(wom_cli.main(['daemon'] + sys.argv[1:]))
@@ -0,0 +1,616 @@
+import mmap
+import struct
+import time
+
+# Çevrimdışı registry hive (regf) okuyucu/yazıcı.
+# Dosya bellek eşlemeli açılır; yalnızca okunan ve değiştirilen hücrelere dokunulur.
+# Yeni hücreler önce bu oturumda boşalan hücrelerden ve son hbin'in boş alanından,
+# yer yoksa hive'ın tamamını taramak yerine sona eklenen yeni bir hbin'den ayrılır.
+
+REG_NONE = 0
+REG_SZ = 1
+REG_EXPAND_SZ = 2
+REG_BINARY = 3
+REG_DWORD = 4
+REG_MULTI_SZ = 7
+REG_QWORD = 11
+
+BASE_BLOCK_SIZE = 0x1000
+HBIN_HEADER_SIZE = 0x20
+HBIN_ALIGN = 0x1000
+NO_CELL = 0xFFFFFFFF
+
+KEY_HIVE_ENTRY = 0x0004
+KEY_NO_DELETE = 0x0008
+KEY_COMP_NAME = 0x0020
+VALUE_COMP_NAME = 0x0001
+DATA_INLINE = 0x80000000
+BIG_DATA_LIMIT = 16344
+
+NK_FIXED_SIZE = 76
+VK_FIXED_SIZE = 20
+
+
+class HiveError(Exception):
+    pass
+
+
+def filetime_now():
+    return int(time.time() * 10000000) + 116444736000000000
+
+
+def _align8(size):
+    return (size + 7) & ~7
+
+
+def _name_hash(name):
+    h = 0
+    for c in name.upper():
+        h = (h * 37 + ord(c)) & 0xFFFFFFFF
+    return h
+
+
+def _encode_name(name):
+    # Sıkıştırılmış adlar Latin-1'dir; sığmayan adlar UTF-16 yazılır
+    try:
+        return name.encode('latin-1'), True
+    except UnicodeEncodeError:
+        return name.encode('utf-16-le'), False
+
+
+def _checksum(data):
+    # Temel bloğun ilk 508 baytının XOR'u; 0 ve 0xFFFFFFFF ayrılmış değerlerdir
+    checksum = 0
+    for dword in struct.unpack_from('<127I', data, 0):
+        checksum ^= dword
+    if checksum == 0xFFFFFFFF:
+        return 0xFFFFFFFE
+    return checksum or 1
+
+
+def encode_value(value_type, value):
+    if value_type in (REG_SZ, REG_EXPAND_SZ):
+        return (str(value) + '\0').encode('utf-16-le')
+    if value_type == REG_MULTI_SZ:
+        return ''.join(str(v) + '\0' for v in value).encode('utf-16-le') + b'\0\0'
+    if value_type == REG_DWORD:
+        return struct.pack('<I', value)
+    if value_type == REG_QWORD:
+        return struct.pack('<Q', value)
+    return bytes(value)
+
+
+def decode_value(value_type, data):
+    if value_type in (REG_SZ, REG_EXPAND_SZ):
+        text = data.decode('utf-16-le', errors='replace')
+        return text.split('\0', 1)[0]
+    if value_type == REG_MULTI_SZ:
+        text = data.decode('utf-16-le', errors='replace').rstrip('\0')
+        return text.split('\0') if text else []
+    if value_type == REG_DWORD and len(data) >= 4:
+        return struct.unpack_from('<I', data)[0]
+    if value_type == REG_QWORD and len(data) >= 8:
+        return struct.unpack_from('<Q', data)[0]
+    return bytes(data)
+
+
+class HiveKey:
+    def __init__(self, hive, offset):
+        self.hive = hive
+        self.offset = offset
+
+    def _field(self, fmt, pos):
+        return struct.unpack_from(fmt, self.hive.map, self.hive._data_pos(self.offset) + pos)[0]
+
+    @property
+    def name(self):
+        pos = self.hive._data_pos(self.offset)
+        flags, = struct.unpack_from('<H', self.hive.map, pos + 2)
+        length, = struct.unpack_from('<H', self.hive.map, pos + 72)
+        raw = self.hive.map[pos + NK_FIXED_SIZE:pos + NK_FIXED_SIZE + length]
+        return raw.decode('latin-1' if flags & KEY_COMP_NAME else 'utf-16-le')
+
+    @property
+    def subkey_count(self):
+        return self._field('<I', 20)
+
+    @property
+    def value_count(self):
+        return self._field('<I', 36)
+
+    def subkeys(self):
+        return [HiveKey(self.hive, off) for off in self.hive._subkey_offsets(self)]
+
+    def subkey(self, name):
+        wanted = name.upper()
+        for off in self.hive._subkey_offsets(self):
+            key = HiveKey(self.hive, off)
+            if key.name.upper() == wanted:
+                return key
+        return None
+
+    def values(self):
+        return {name: (value_type, decode_value(value_type, data))
+                for name, value_type, data, _ in self.hive._iter_values(self)}
+
+    def value(self, name):
+        wanted = name.upper()
+        for value_name, value_type, data, _ in self.hive._iter_values(self):
+            if value_name.upper() == wanted:
+                return value_type, decode_value(value_type, data)
+        return None
+
+
+class Hive:
+    def __init__(self, path, writable=False):
+        self.path = path
+        self.writable = writable
+        self.file = open(path, 'r+b' if writable else 'rb')
+        self.map = None
+        self._dirty = False
+        self._free_cells = None  # [[hücre ofseti, boyut]] - ilk ayırmada son hbin'den doldurulur
+        self._map()
+        if bytes(self.map[0:4]) != b'regf':
+            self.close()
+            raise HiveError(f"{path}: not a registry hive")
+        primary, secondary = struct.unpack_from('<II', self.map, 4)
+        if writable and primary != secondary:
+            self.close()
+            raise HiveError(f"{path}: hive was not unloaded cleanly (pending transaction logs)")
+
+    def _map(self):
+        access = mmap.ACCESS_WRITE if self.writable else mmap.ACCESS_READ
+        self.map = mmap.mmap(self.file.fileno(), 0, access=access)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Hata olursa sıra numaraları eşitlenmez; hive kirli olarak kalır
+        self.close(commit=exc_type is None)
+
+    def close(self, commit=True):
+        if self.map is not None:
+            if self._dirty and commit:
+                self._finish_write()
+            self.map.close()
+            self.map = None
+        self.file.close()
+
+    # --- Temel okuma ---
+
+    @property
+    def minor_version(self):
+        return struct.unpack_from('<I', self.map, 24)[0]
+
+    @property
+    def root(self):
+        return HiveKey(self, struct.unpack_from('<I', self.map, 36)[0])
+
+    def _data_pos(self, offset):
+        return BASE_BLOCK_SIZE + offset + 4
+
+    def _cell_size(self, offset):
+        size, = struct.unpack_from('<i', self.map, BASE_BLOCK_SIZE + offset)
+        if size >= 0:
+            raise HiveError(f"cell {offset:#x} is not allocated")
+        return -size - 4
+
+    def _cell_bytes(self, offset, length=None):
+        pos = self._data_pos(offset)
+        if length is None:
+            length = self._cell_size(offset)
+        return self.map[pos:pos + length]
+
+    def _subkey_offsets(self, key):
+        if key.subkey_count == 0:
+            return []
+        return self._list_offsets(key._field('<I', 28))
+
+    def _list_offsets(self, list_offset):
+        pos = self._data_pos(list_offset)
+        sig = bytes(self.map[pos:pos + 2])
+        count, = struct.unpack_from('<H', self.map, pos + 2)
+        if sig in (b'lf', b'lh'):
+            return [struct.unpack_from('<I', self.map, pos + 4 + i * 8)[0] for i in range(count)]
+        if sig == b'li':
+            return list(struct.unpack_from(f'<{count}I', self.map, pos + 4))
+        if sig == b'ri':
+            offsets = []
+            for sub in struct.unpack_from(f'<{count}I', self.map, pos + 4):
+                offsets.extend(self._list_offsets(sub))
+            return offsets
+        raise HiveError(f"unknown subkey list {sig!r} at {list_offset:#x}")
+
+    def _value_offsets(self, key):
+        count = key.value_count
+        if count == 0:
+            return []
+        return list(struct.unpack_from(f'<{count}I', self.map, self._data_pos(key._field('<I', 40))))
+
+    def _read_value(self, vk_offset):
+        pos = self._data_pos(vk_offset)
+        if bytes(self.map[pos:pos + 2]) != b'vk':
+            raise HiveError(f"value cell {vk_offset:#x} is corrupt")
+        name_length, size, data_offset, value_type, flags = struct.unpack_from('<HIIIH', self.map, pos + 2)
+        raw_name = self.map[pos + VK_FIXED_SIZE:pos + VK_FIXED_SIZE + name_length]
+        name = raw_name.decode('latin-1' if flags & VALUE_COMP_NAME else 'utf-16-le')
+        if size & DATA_INLINE:
+            length = size & ~DATA_INLINE
+            data = struct.pack('<I', data_offset)[:length]
+        elif size > BIG_DATA_LIMIT and self.minor_version >= 4:
+            data = self._read_big_data(data_offset, size)
+        else:
+            data = self._cell_bytes(data_offset, size)
+        return name, value_type, data
+
+    def _read_big_data(self, offset, size):
+        pos = self._data_pos(offset)
+        if bytes(self.map[pos:pos + 2]) != b'db':
+            return self._cell_bytes(offset, size)
+        count, segments = struct.unpack_from('<HI', self.map, pos + 2)
+        chunks = []
+        for seg in struct.unpack_from(f'<{count}I', self.map, self._data_pos(segments)):
+            chunks.append(self._cell_bytes(seg, min(BIG_DATA_LIMIT, size - sum(map(len, chunks)))))
+        return b''.join(chunks)
+
+    def _iter_values(self, key):
+        for off in self._value_offsets(key):
+            name, value_type, data = self._read_value(off)
+            yield name, value_type, data, off
+
+    def key(self, path):
+        key = self.root
+        for part in filter(None, path.split('\\')):
+            key = key.subkey(part)
+            if key is None:
+                return None
+        return key
+
+    # --- Yazma ---
+
+    def _begin_write(self):
+        if not self.writable:
+            raise HiveError("hive was opened read-only")
+        if not self._dirty:
+            # Windows ile aynı sıra: önce birincil sıra numarası, iş bitince ikincil
+            primary, = struct.unpack_from('<I', self.map, 4)
+            struct.pack_into('<I', self.map, 4, (primary + 1) & 0xFFFFFFFF)
+            self._dirty = True
+
+    def _finish_write(self):
+        primary, = struct.unpack_from('<I', self.map, 4)
+        struct.pack_into('<I', self.map, 8, primary)
+        struct.pack_into('<Q', self.map, 12, filetime_now())
+        struct.pack_into('<I', self.map, 508, _checksum(self.map))
+        self.map.flush()
+        self._dirty = False
+
+    def flush(self):
+        if self._dirty:
+            self._finish_write()
+
+    def _grow(self, needed):
+        bins_size, = struct.unpack_from('<I', self.map, 40)
+        bin_size = (needed + HBIN_HEADER_SIZE + HBIN_ALIGN - 1) // HBIN_ALIGN * HBIN_ALIGN
+        bin_offset = bins_size
+        self.map.flush()
+        self.map.close()
+        self.file.truncate(BASE_BLOCK_SIZE + bins_size + bin_size)
+        self._map()
+        pos = BASE_BLOCK_SIZE + bin_offset
+        header = struct.pack('<4sII8sQI', b'hbin', bin_offset, bin_size, b'\0' * 8, filetime_now(), 0)
+        self.map[pos:pos + HBIN_HEADER_SIZE] = header
+        free_offset = bin_offset + HBIN_HEADER_SIZE
+        struct.pack_into('<i', self.map, BASE_BLOCK_SIZE + free_offset, bin_size - HBIN_HEADER_SIZE)
+        struct.pack_into('<I', self.map, 40, bins_size + bin_size)
+        self._free_cells.append([free_offset, bin_size - HBIN_HEADER_SIZE])
+
+    def _last_bin_free_cells(self):
+        # Yalnızca son hbin taranır; önceki oturumların eklediği boş alan yeniden kullanılır
+        bins_size, = struct.unpack_from('<I', self.map, 40)
+        offset = last = 0
+        while offset < bins_size:
+            if bytes(self.map[BASE_BLOCK_SIZE + offset:BASE_BLOCK_SIZE + offset + 4]) != b'hbin':
+                return []
+            last = offset
+            offset += struct.unpack_from('<I', self.map, BASE_BLOCK_SIZE + offset + 8)[0]
+        end = last + struct.unpack_from('<I', self.map, BASE_BLOCK_SIZE + last + 8)[0]
+        cells = []
+        offset = last + HBIN_HEADER_SIZE
+        while offset < end:
+            size, = struct.unpack_from('<i', self.map, BASE_BLOCK_SIZE + offset)
+            if size == 0:
+                break
+            if size > 0:
+                cells.append([offset, size])
+            offset += abs(size)
+        return cells
+
+    def _alloc(self, data_size):
+        self._begin_write()
+        size = _align8(data_size + 4)
+        if self._free_cells is None:
+            self._free_cells = self._last_bin_free_cells()
+        # En küçük yeterli boş hücre
+        best = None
+        for cell in self._free_cells:
+            if cell[1] >= size and (best is None or cell[1] < best[1]):
+                best = cell
+        if best is None:
+            self._grow(size)
+            best = self._free_cells[-1]
+        offset, free = best
+        remainder = free - size
+        if remainder < 8:
+            size, remainder = free, 0
+        struct.pack_into('<i', self.map, BASE_BLOCK_SIZE + offset, -size)
+        if remainder:
+            struct.pack_into('<i', self.map, BASE_BLOCK_SIZE + offset + size, remainder)
+            best[0], best[1] = offset + size, remainder
+        else:
+            self._free_cells.remove(best)
+        return offset
+
+    def _free(self, offset):
+        if offset == NO_CELL:
+            return
+        size, = struct.unpack_from('<i', self.map, BASE_BLOCK_SIZE + offset)
+        if size < 0:
+            struct.pack_into('<i', self.map, BASE_BLOCK_SIZE + offset, -size)
+            if self._free_cells is not None:
+                self._free_cells.append([offset, -size])
+
+    def _free_data(self, size, offset):
+        # Değer verisi: satır içi değilse hücre; büyük veride db, parça listesi ve parçalar
+        if size & DATA_INLINE:
+            return
+        pos = self._data_pos(offset)
+        if size > BIG_DATA_LIMIT and self.minor_version >= 4 and bytes(self.map[pos:pos + 2]) == b'db':
+            count, segments = struct.unpack_from('<HI', self.map, pos + 2)
+            for segment in struct.unpack_from(f'<{count}I', self.map, self._data_pos(segments)):
+                self._free(segment)
+            self._free(segments)
+        self._free(offset)
+
+    def _write_cell(self, data, reserve=0):
+        # reserve: büyüyen listeler için fazladan yer; sonraki eklemeler yerinde yazılır
+        offset = self._alloc(len(data) + reserve)
+        pos = self._data_pos(offset)
+        self.map[pos:pos + len(data)] = data
+        return offset
+
+    def _touch(self, key):
+        struct.pack_into('<Q', self.map, self._data_pos(key.offset) + 4, filetime_now())
+
+    def _bump_max(self, key, pos, value, mask=0xFFFFFFFF):
+        current = key._field('<I', pos)
+        if (current & mask) < value:
+            struct.pack_into('<I', self.map, self._data_pos(key.offset) + pos, (current & ~mask) | value)
+
+    def create_key(self, path):
+        key = self.root
+        for part in filter(None, path.split('\\')):
+            child = key.subkey(part)
+            if child is None:
+                child = self._add_subkey(key, part)
+            key = child
+        return key
+
+    def _add_subkey(self, parent, name):
+        self._begin_write()
+        raw_name, compressed = _encode_name(name)
+        security = parent._field('<I', 44)
+        nk = struct.pack(
+            '<2sHQIIIIIIIIIIIIIIIHH',
+            b'nk', KEY_COMP_NAME if compressed else 0, filetime_now(), 0, parent.offset,
+            0, 0, NO_CELL, NO_CELL, 0, NO_CELL, security, NO_CELL,
+            0, 0, 0, 0, 0, len(raw_name), 0,
+        ) + raw_name
+        child = HiveKey(self, self._write_cell(nk))
+
+        if security != NO_CELL:
+            # Güvenlik tanımlayıcısı üst anahtarla paylaşılır
+            ref_pos = self._data_pos(security) + 12
+            refs, = struct.unpack_from('<I', self.map, ref_pos)
+            struct.pack_into('<I', self.map, ref_pos, refs + 1)
+
+        self._insert_subkey(parent, child, name)
+        return child
+
+    def _make_leaf(self, entries):
+        if self.minor_version >= 5:
+            body = b''.join(struct.pack('<II', off, _name_hash(name)) for off, name in entries)
+            return struct.pack('<2sH', b'lh', len(entries)) + body
+        body = b''.join(struct.pack('<I4s', off, name.encode('latin-1', 'replace')[:4].ljust(4, b'\0'))
+                        for off, name in entries)
+        return struct.pack('<2sH', b'lf', len(entries)) + body
+
+    def _insert_subkey(self, parent, child, name):
+        entry = (child.offset, name)
+        count = parent.subkey_count
+        list_offset = parent._field('<I', 28)
+        parent_pos = self._data_pos(parent.offset)
+
+        if count == 0:
+            new_list = self._write_cell(self._make_leaf([entry]))
+        else:
+            pos = self._data_pos(list_offset)
+            if bytes(self.map[pos:pos + 2]) == b'ri':
+                new_list = self._insert_into_index_root(list_offset, entry)
+            else:
+                leaf = self._make_leaf(self._sorted_insert(list_offset, entry))
+                if len(leaf) <= self._cell_size(list_offset):
+                    # Liste hücresinde yer varsa yerinde yeniden yaz
+                    self.map[pos:pos + len(leaf)] = leaf
+                    new_list = list_offset
+                else:
+                    new_list = self._write_cell(leaf, reserve=len(leaf) // 2)
+            if new_list != list_offset:
+                self._free(list_offset)
+
+        struct.pack_into('<I', self.map, parent_pos + 20, count + 1)
+        struct.pack_into('<I', self.map, parent_pos + 28, new_list)
+        # Windows 10 üst bitleri bayrak olarak kullanır
+        self._bump_max(parent, 52, len(name) * 2, mask=0xFFFF)
+        self._touch(parent)
+
+    def _sorted_insert(self, list_offset, entry):
+        entries = [(off, HiveKey(self, off).name) for off in self._list_offsets(list_offset)]
+        wanted = entry[1].upper()
+        index = len(entries)
+        for i, (_, existing) in enumerate(entries):
+            if existing.upper() > wanted:
+                index = i
+                break
+        entries.insert(index, entry)
+        return entries
+
+    def _insert_into_index_root(self, root_offset, entry):
+        pos = self._data_pos(root_offset)
+        count, = struct.unpack_from('<H', self.map, pos + 2)
+        leaves = list(struct.unpack_from(f'<{count}I', self.map, pos + 4))
+        wanted = entry[1].upper()
+        # Yeni ad, ilk adı kendisinden büyük olan yaprağın öncesine düşer
+        target = len(leaves) - 1
+        for i, leaf in enumerate(leaves[1:], start=1):
+            first = HiveKey(self, self._list_offsets(leaf)[0]).name.upper()
+            if wanted < first:
+                target = i - 1
+                break
+        old_leaf = leaves[target]
+        leaf = self._make_leaf(self._sorted_insert(old_leaf, entry))
+        if len(leaf) <= self._cell_size(old_leaf):
+            leaf_pos = self._data_pos(old_leaf)
+            self.map[leaf_pos:leaf_pos + len(leaf)] = leaf
+        else:
+            leaves[target] = self._write_cell(leaf, reserve=len(leaf) // 2)
+            self._free(old_leaf)
+            struct.pack_into('<I', self.map, pos + 4 + target * 4, leaves[target])
+        return root_offset
+
+    def set_value(self, key, name, value_type, value):
+        self._begin_write()
+        data = encode_value(value_type, value)
+        existing = None
+        wanted = name.upper()
+        for off in self._value_offsets(key):
+            vk_name = self._read_value(off)[0]
+            if vk_name.upper() == wanted:
+                existing = off
+                break
+
+        if existing is None:
+            self._add_value(key, name, value_type, data)
+        else:
+            self._replace_value_data(existing, value_type, data)
+        self._bump_max(key, 64, len(data))
+        self._touch(key)
+
+    def delete_value(self, key, name):
+        # Değer listeden çıkarılır; vk hücresi ve verisi boşaltılır
+        wanted = name.upper()
+        offsets = self._value_offsets(key)
+        for index, off in enumerate(offsets):
+            if self._read_value(off)[0].upper() == wanted:
+                break
+        else:
+            return False
+        self._begin_write()
+        pos = self._data_pos(off)
+        size, data_offset = struct.unpack_from('<II', self.map, pos + 4)
+        self._free_data(size, data_offset)
+        self._free(off)
+        del offsets[index]
+        key_pos = self._data_pos(key.offset)
+        list_offset = key._field('<I', 40)
+        if offsets:
+            struct.pack_into(f'<{len(offsets)}I', self.map, self._data_pos(list_offset), *offsets)
+        else:
+            self._free(list_offset)
+            struct.pack_into('<I', self.map, key_pos + 40, NO_CELL)
+        struct.pack_into('<I', self.map, key_pos + 36, len(offsets))
+        self._touch(key)
+        return True
+
+    def _store_data(self, data):
+        if len(data) <= 4:
+            return len(data) | DATA_INLINE, struct.unpack('<I', data.ljust(4, b'\0'))[0]
+        if len(data) > BIG_DATA_LIMIT:
+            raise HiveError("values larger than 16 KiB are not supported")
+        return len(data), self._write_cell(data)
+
+    def _replace_value_data(self, vk_offset, value_type, data):
+        pos = self._data_pos(vk_offset)
+        old_size, old_offset = struct.unpack_from('<II', self.map, pos + 4)
+        if not old_size & DATA_INLINE and old_size <= BIG_DATA_LIMIT and 4 < len(data) <= self._cell_size(old_offset):
+            # Eski hücreye sığıyorsa yerinde güncelle
+            data_pos = self._data_pos(old_offset)
+            self.map[data_pos:data_pos + len(data)] = data
+            size, offset = len(data), old_offset
+        else:
+            size, offset = self._store_data(data)
+            self._free_data(old_size, old_offset)
+        struct.pack_into('<III', self.map, pos + 4, size, offset, value_type)
+
+    def _add_value(self, key, name, value_type, data):
+        raw_name, compressed = _encode_name(name)
+        size, offset = self._store_data(data)
+        vk = struct.pack('<2sHIIIHH', b'vk', len(raw_name), size, offset, value_type,
+                         VALUE_COMP_NAME if compressed else 0, 0) + raw_name
+        vk_offset = self._write_cell(vk)
+
+        count = key.value_count
+        list_offset = key._field('<I', 40)
+        key_pos = self._data_pos(key.offset)
+        if count and (count + 1) * 4 <= self._cell_size(list_offset):
+            struct.pack_into('<I', self.map, self._data_pos(list_offset) + count * 4, vk_offset)
+        else:
+            offsets = self._value_offsets(key) + [vk_offset]
+            new_list = self._write_cell(struct.pack(f'<{len(offsets)}I', *offsets), reserve=len(offsets) * 2)
+            if count:
+                self._free(list_offset)
+            struct.pack_into('<I', self.map, key_pos + 40, new_list)
+        struct.pack_into('<I', self.map, key_pos + 36, count + 1)
+        self._bump_max(key, 60, len(name) * 2)
+
+
+def create_hive(path, root_name='ROOT', minor_version=5):
+    # Testler ve boş hedefler için en küçük geçerli hive
+    root_name_raw = root_name.encode('latin-1')
+    nk = struct.pack(
+        '<2sHQIIIIIIIIIIIIIIIHH',
+        b'nk', KEY_HIVE_ENTRY | KEY_NO_DELETE | KEY_COMP_NAME, filetime_now(), 0, NO_CELL,
+        0, 0, NO_CELL, NO_CELL, 0, NO_CELL, NO_CELL, NO_CELL,
+        0, 0, 0, 0, 0, len(root_name_raw), 0,
+    ) + root_name_raw
+    nk_cell = _align8(len(nk) + 4)
+    bin_data = bytearray(HBIN_ALIGN)
+    struct.pack_into('<4sII8sQI', bin_data, 0, b'hbin', 0, HBIN_ALIGN, b'\0' * 8, filetime_now(), 0)
+    struct.pack_into('<i', bin_data, HBIN_HEADER_SIZE, -nk_cell)
+    bin_data[HBIN_HEADER_SIZE + 4:HBIN_HEADER_SIZE + 4 + len(nk)] = nk
+    free = HBIN_ALIGN - HBIN_HEADER_SIZE - nk_cell
+    struct.pack_into('<i', bin_data, HBIN_HEADER_SIZE + nk_cell, free)
+
+    base = bytearray(BASE_BLOCK_SIZE)
+    struct.pack_into('<4sIIQIIIIIII', base, 0, b'regf', 1, 1, filetime_now(), 1, minor_version,
+                     0, 1, HBIN_HEADER_SIZE, HBIN_ALIGN, 1)
+    struct.pack_into('<I', base, 508, _checksum(base))
+
+    with open(path, 'wb') as f:
+        f.write(base)
+        f.write(bin_data)
+
+
+def set_values(hive_path, key_path, values):
+    # values: {ad: (tip, değer)}
+    with Hive(hive_path, writable=True) as hive:
+        key = hive.create_key(key_path)
+        for name, (value_type, value) in values.items():
+            hive.set_value(key, name, value_type, value)
+
+
+def read_values(hive_path, key_path):
+    with Hive(hive_path) as hive:
+        key = hive.key(key_path)
+        return key.values() if key is not None else {}
@@ -0,0 +1,183 @@
+import os
+import sys
+import json
+import mmap
+import struct
+
+# Çeviriler locales/<dil>.json kaynaklarından derlenmiş .womcat dosyalarına dönüştürülür.
+# Yalnızca etkin dil (ve eksik anahtarlar için temel dil) bellek eşlemeli açılır;
+# anahtarlar dosyadaki açık adresli karma tablosunda sabit sürede bulunur.
+
+LOCALES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'locales')
+BASE_LANGUAGE = 'en'
+
+MAGIC = b'WOMCAT1\0'
+HEADER = struct.Struct('<8sII')       # sihirli değer, yuva sayısı, kayıt sayısı
+SLOT = struct.Struct('<IIHII')        # karma, anahtar ofseti, anahtar uzunluğu, değer ofseti, değer uzunluğu
+EMPTY = 0xFFFFFFFF
+
+
+def _hash(data):
+    # FNV-1a (32 bit)
+    h = 0x811C9DC5
+    for byte in data:
+        h = ((h ^ byte) * 0x01000193) & 0xFFFFFFFF
+    return h
+
+
+def compile_entries(entries):
+    slot_count = 1
+    while slot_count < len(entries) * 2:
+        slot_count <<= 1
+    mask = slot_count - 1
+
+    slots = [None] * slot_count
+    blob = bytearray()
+    blob_start = HEADER.size + SLOT.size * slot_count
+    for key, value in entries.items():
+        key_raw = key.encode('utf-8')
+        value_raw = value.encode('utf-8')
+        h = _hash(key_raw)
+        index = h & mask
+        while slots[index] is not None:
+            index = (index + 1) & mask
+        key_offset = blob_start + len(blob)
+        blob += key_raw
+        value_offset = blob_start + len(blob)
+        blob += value_raw
+        slots[index] = (h, key_offset, len(key_raw), value_offset, len(value_raw))
+
+    out = bytearray(HEADER.pack(MAGIC, slot_count, len(entries)))
+    for slot in slots:
+        out += SLOT.pack(*slot) if slot else SLOT.pack(0, EMPTY, 0, 0, 0)
+    return bytes(out + blob)
+
+
+def compile_catalog(source_path, target_path=None):
+    with open(source_path, encoding='utf-8') as f:
+        entries = json.load(f)
+    data = compile_entries(entries)
+    if target_path:
+        tmp_path = target_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, target_path)
+    return data
+
+
+class Catalog:
+    def __init__(self, language, data):
+        self.language = language
+        self.data = data
+        magic, self.slot_count, self.count = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{language}: not a compiled catalog")
+        self.mask = self.slot_count - 1
+
+    @classmethod
+    def open(cls, language, path):
+        with open(path, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(language, data)
+
+    def get(self, key):
+        key_raw = key.encode('utf-8')
+        h = _hash(key_raw)
+        index = h & self.mask
+        data = self.data
+        while True:
+            slot_hash, key_offset, key_length, value_offset, value_length = \
+                SLOT.unpack_from(data, HEADER.size + index * SLOT.size)
+            if key_offset == EMPTY:
+                return None
+            if slot_hash == h and data[key_offset:key_offset + key_length] == key_raw:
+                return bytes(data[value_offset:value_offset + value_length]).decode('utf-8')
+            index = (index + 1) & self.mask
+
+
+def available_languages(locales_dir=LOCALES_DIR):
+    names = set()
+    for name in os.listdir(locales_dir):
+        base, ext = os.path.splitext(name)
+        if ext in ('.json', '.womcat'):
+            names.add(base)
+    return sorted(names)
+
+
+def load_catalog(language, locales_dir=LOCALES_DIR):
+    source = os.path.join(locales_dir, language + '.json')
+    compiled = os.path.join(locales_dir, language + '.womcat')
+    source_exists = os.path.exists(source)
+    stale = source_exists and (not os.path.exists(compiled)
+                               or os.path.getmtime(compiled) < os.path.getmtime(source))
+    if stale:
+        try:
+            compile_catalog(source, compiled)
+        except OSError:
+            # Yazılamayan kurulum dizini: bellekte derle
+            return Catalog(language, compile_catalog(source))
+    if os.path.exists(compiled):
+        return Catalog.open(language, compiled)
+    return None
+
+
+class Translator:
+    def __init__(self, language, base_language=BASE_LANGUAGE, locales_dir=LOCALES_DIR):
+        self.language = language
+        self.base_language = base_language
+        self.locales_dir = locales_dir
+        self.catalog = load_catalog(language, locales_dir)
+        self._base = None
+        self._cache = {}
+
+    @property
+    def base(self):
+        # Temel dil yalnızca eksik bir anahtar istendiğinde açılır
+        if self._base is None and self.base_language != self.language:
+            self._base = load_catalog(self.base_language, self.locales_dir) or False
+        return self._base or None
+
+    def tr(self, key):
+        text = self._cache.get(key)
+        if text is None:
+            text = self.catalog.get(key) if self.catalog else None
+            if text is None and self.base is not None:
+                text = self.base.get(key)
+            if text is None:
+                text = key
+            self._cache[key] = text
+        return text
+
+
+class TranslationRegistry:
+    # Her widget oluşturulurken çeviri anahtarına bağlanır; dil değişiminde
+    # yalnızca bu kayıt gezilir. Kurulmamış sekmelerin widget'ları henüz kayıtlı değildir.
+    def __init__(self):
+        self.bindings = []
+
+    def bind(self, key, setter):
+        self.bindings.append((key, setter))
+
+    def retranslate(self, tr):
+        for key, setter in self.bindings:
+            setter(tr(key))
+
+    def __len__(self):
+        return len(self.bindings)
+
+
+def main(argv=None):
+    # python wom_i18n.py: tüm kaynak katalogları derler
+    argv = sys.argv[1:] if argv is None else argv
+    locales_dir = argv[0] if argv else LOCALES_DIR
+    for name in sorted(os.listdir(locales_dir)):
+        if name.endswith('.json'):
+            source = os.path.join(locales_dir, name)
+            target = source[:-len('.json')] + '.womcat'
+            compile_catalog(source, target)
+            print(f"{name} -> {os.path.basename(target)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,338 @@
+import os
+import json
+import time
+import socket
+import sqlite3
+
+import numpy as np
+
+from wom_core import pool_reference
+
+# Ürün anahtarı havuzu. Anahtar listeleri içe aktarılırken biçim ve base-24
+# sağlama toplamı NumPy ile toplu doğrulanır, tekrarlar atılır ve anahtarlar
+# SQLite'ta tutulur. Makineye atama tek bir yazma işleminde yapılır; eş zamanlı
+# toplu uygulamalarda (ayrı süreçler dahil) aynı anahtar iki kez verilmez.
+# Windows 8 ve sonrası anahtar biçimi (tam olarak bir "N" içerir) desteklenir.
+
+ALPHABET = "BCDFGHJKMPQRTVWXY2346789"
+KEY_LENGTH = 29
+DASH_POSITIONS = (5, 11, 17, 23)
+N_DIGIT = 24
+IMPORT_CHUNK = 250000
+MAX_REJECTED = 20
+
+_DIGITS = np.full(256, 255, dtype=np.uint8)
+for _value, _char in enumerate(ALPHABET):
+    _DIGITS[ord(_char)] = _value
+_DIGITS[ord('N')] = N_DIGIT
+
+
+def _crc_table():
+    # CRC-32/MPEG-2 (0x04C11DB7, en anlamlı bit önce), adım başına 16 bit
+    table = np.zeros(256, dtype=np.uint32)
+    for byte in range(256):
+        crc = byte << 24
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x04C11DB7) & 0xFFFFFFFF if crc & 0x80000000 else (crc << 1) & 0xFFFFFFFF
+        table[byte] = crc
+    words = np.arange(65536, dtype=np.uint32) << 16
+    for _ in range(2):
+        words = (words << 8) ^ table[words >> 24]
+    return words
+
+
+_CRC_TABLE = _crc_table()
+
+# 24^(24-j)'nin 32 bitlik parçaları. Basamak x parça çarpımlarının 25 basamak
+# üzerinden toplamı 2^42'yi aşmaz; float64 matris çarpımı bu yüzden kesindir.
+_POWERS = np.array([[(24 ** (24 - j) >> (32 * k)) & 0xFFFFFFFF for k in range(4)] for j in range(25)],
+                   dtype=np.float64)
+
+
+class KeyPoolError(Exception):
+    pass
+
+
+def normalize_key(key):
+    key = key.strip().upper()
+    if len(key) != KEY_LENGTH or key[5] != '-':
+        # Boşluklu ya da tiresiz yazılmış anahtarlar
+        key = ''.join(key.split())
+        if len(key) == 25 and '-' not in key:
+            key = '-'.join(key[i:i + 5] for i in range(0, 25, 5))
+    return key
+
+
+def decode_keys(keys):
+    # Normalleştirilmiş anahtarlar -> (geçerli mi, grup kimliği; geçersizse -1)
+    count = len(keys)
+    valid = np.zeros(count, dtype=bool)
+    groups = np.full(count, -1, dtype=np.int64)
+    rows = np.flatnonzero(np.fromiter(map(len, keys), dtype=np.int64, count=count) == KEY_LENGTH)
+    if not rows.size:
+        return valid, groups
+    # Her anahtarın sonuna tire eklenince satırlar 5 x (5 karakter + tire) olur
+    sample = keys if rows.size == count else [keys[i] for i in rows]
+    text = ('-'.join(sample) + '-').encode('ascii', 'replace')
+    chars = np.frombuffer(text, dtype=np.uint8).reshape(-1, 5, 6)
+
+    # Biçim: tireler yerinde, tüm karakterler alfabede, tam olarak bir N
+    digits = _DIGITS[chars[:, :, :5]].reshape(-1, 25)
+    is_n = digits == N_DIGIT
+    form = ((chars[:, :, 5] == ord('-')).all(axis=1)
+            & (digits != 255).all(axis=1) & (is_n.sum(axis=1) == 1))
+    rows, digits, is_n = rows[form], digits[form], is_n[form]
+    if not rows.size:
+        return valid, groups
+
+    # N'nin konumu ilk basamaktır; N çıkarılınca kalan 24 basamak sırayla gelir.
+    # 128 bitlik değer dört 32 bitlik parçada (küçükten büyüğe) tutulur.
+    position = is_n.argmax(axis=1)
+    values = np.empty((rows.size, 25), dtype=np.float64)
+    values[:, 0] = position
+    values[:, 1:] = np.where(np.arange(24) < position[:, None], digits[:, :24], digits[:, 1:])
+    sums = (values @ _POWERS).astype(np.uint64)
+    limbs = []
+    carry = 0
+    for k in range(4):
+        total = sums[:, k] + carry
+        limbs.append((total & 0xFFFFFFFF).astype(np.uint32))
+        carry = total >> 32
+
+    # Sağlama: 103-112. bitler; kendisi sıfırlanmış 16 baytın CRC'sinin tümleyeni
+    checksum = (limbs[3] >> 7) & 0x3FF
+    limbs[3] &= ~np.uint32(0x3FF << 7)
+    crc = np.full(rows.size, 0xFFFFFFFF, dtype=np.uint32)
+    for limb in limbs:
+        # Küçük uçlu baytlar sırayla: ters çevrilen parçanın üst ve alt 16 biti
+        swapped = limb.byteswap()
+        for word in (swapped >> 16, swapped & 0xFFFF):
+            crc = (crc << 16) ^ _CRC_TABLE[(crc >> 16) ^ word]
+    ok = (~crc & 0x3FF) == checksum
+    valid[rows[ok]] = True
+    groups[rows[ok]] = limbs[0][ok] & 0xFFFFF
+    return valid, groups
+
+
+def validate_keys(keys):
+    return decode_keys([normalize_key(key) for key in keys])[0]
+
+
+def is_valid_key(key):
+    return bool(validate_keys([key])[0])
+
+
+def local_machine():
+    return os.environ.get('COMPUTERNAME') or socket.gethostname()
+
+
+class ImportResult:
+    def __init__(self):
+        self.added = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.rejected = []
+
+
+class KeyPool:
+    def __init__(self, db_path, timeout=30.0):
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        # İşlemler elle açılır: atama BEGIN IMMEDIATE ile yazma kilidini baştan alır
+        self.conn = sqlite3.connect(db_path, timeout=timeout, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def close(self):
+        self.conn.close()
+
+    def _begin(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+
+    def _create_schema(self):
+        self._begin()
+        try:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS product_keys (
+                    product_key TEXT PRIMARY KEY,
+                    pool TEXT NOT NULL DEFAULT '',
+                    key_group INTEGER NOT NULL,
+                    machine TEXT,
+                    profile TEXT,
+                    assigned_at REAL
+                ) WITHOUT ROWID""")
+            # Tek dizin iki işe yarar: makineye havuz başına en fazla bir anahtar (NULL'lar
+            # birbirinden farklı sayılır) ve boş anahtarlar dizinin başındaki NULL aralığı
+            self.conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS product_keys_pool_machine "
+                              "ON product_keys(pool, machine)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS product_keys_machine "
+                              "ON product_keys(machine) WHERE machine IS NOT NULL")
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def import_keys(self, lines, pool=''):
+        # lines: anahtar satırları (dosya nesnesi de olur); parça parça doğrulanıp eklenir
+        result = ImportResult()
+        chunk = []
+        for line in lines:
+            key = normalize_key(line)
+            if key:
+                chunk.append(key)
+            if len(chunk) >= IMPORT_CHUNK:
+                self._import_chunk(chunk, pool, result)
+                chunk = []
+        if chunk:
+            self._import_chunk(chunk, pool, result)
+        return result
+
+    def _import_chunk(self, keys, pool, result):
+        valid, groups = decode_keys(keys)
+        invalid = np.flatnonzero(~valid)
+        result.invalid += invalid.size
+        result.rejected.extend(keys[i] for i in invalid[:MAX_REJECTED - len(result.rejected)])
+        # Geçerli anahtarlar tek JSON dizisi olarak tek ifadeyle eklenir: satır başına
+        # Python bağlama maliyeti olmaz, SQLite sıralayıp B-ağacına sırayla yazar.
+        # Parça içi ve veritabanındaki tekrarlar INSERT OR IGNORE ile atlanır.
+        rows = np.flatnonzero(valid)
+        data = json.dumps(list(zip((keys[i] for i in rows), groups[rows].tolist())))
+        self._begin()
+        try:
+            before = self.conn.total_changes
+            self.conn.execute(
+                "INSERT OR IGNORE INTO product_keys (product_key, pool, key_group) "
+                "SELECT json_extract(value, '$[0]'), ?, json_extract(value, '$[1]') "
+                "FROM json_each(?) ORDER BY 1", (pool, data))
+            added = self.conn.total_changes - before
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        result.added += added
+        result.duplicates += rows.size - added
+
+    def assign(self, pool, machine, profile=''):
+        return self.claim(pool, machine, profile)[0]
+
+    def claim(self, pool, machine, profile=''):
+        # (anahtar, boş anahtarlardan yeni mi alındı); makinenin bu havuzdan anahtarı
+        # varsa o döner (tekrar uygulamada aynı anahtar)
+        self._begin()
+        new = False
+        try:
+            row = self.conn.execute("SELECT product_key FROM product_keys WHERE pool = ? AND machine = ?",
+                                    (pool, machine)).fetchone()
+            if row is None:
+                new = True
+                row = self.conn.execute("SELECT product_key FROM product_keys "
+                                        "WHERE pool = ? AND machine IS NULL LIMIT 1", (pool,)).fetchone()
+                if row is None:
+                    raise KeyPoolError(f"no free product keys left in pool {pool!r}")
+                self.conn.execute("UPDATE product_keys SET machine = ?, profile = ?, assigned_at = ? "
+                                  "WHERE product_key = ?", (machine, profile, time.time(), row[0]))
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return row[0], new
+
+    def release(self, pool, machine, product_key):
+        # Makineye atanmış anahtar yeniden boşa çıkar; başka makinedeyse dokunulmaz
+        self._begin()
+        try:
+            released = self.conn.execute("UPDATE product_keys SET machine = NULL, profile = NULL, assigned_at = NULL "
+                                         "WHERE product_key = ? AND pool = ? AND machine = ?",
+                                         (product_key, pool, machine)).rowcount
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return released > 0
+
+    def assign_many(self, pool, machines, profile=''):
+        # Tek işlemde birden çok makine: {makine: anahtar}
+        machines = list(dict.fromkeys(machines))
+        assigned = {}
+        self._begin()
+        try:
+            for machine in machines:
+                row = self.conn.execute("SELECT product_key FROM product_keys WHERE pool = ? AND machine = ?",
+                                        (pool, machine)).fetchone()
+                if row is not None:
+                    assigned[machine] = row[0]
+            missing = [machine for machine in machines if machine not in assigned]
+            free = [row[0] for row in self.conn.execute("SELECT product_key FROM product_keys "
+                                                        "WHERE pool = ? AND machine IS NULL LIMIT ?",
+                                                        (pool, len(missing)))]
+            if len(free) < len(missing):
+                raise KeyPoolError(f"pool {pool!r} has {len(free)} free product key(s), {len(missing)} needed")
+            now = time.time()
+            self.conn.executemany("UPDATE product_keys SET machine = ?, profile = ?, assigned_at = ? "
+                                  "WHERE product_key = ?",
+                                  ((machine, profile, now, key) for machine, key in zip(missing, free)))
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        assigned.update(zip(missing, free))
+        return assigned
+
+    def lookup(self, machine, pool=None):
+        if pool is None:
+            row = self.conn.execute("SELECT product_key FROM product_keys WHERE machine = ? "
+                                    "ORDER BY assigned_at DESC LIMIT 1", (machine,)).fetchone()
+        else:
+            row = self.conn.execute("SELECT product_key FROM product_keys WHERE pool = ? AND machine = ?",
+                                    (pool, machine)).fetchone()
+        return row[0] if row else None
+
+    def stats(self):
+        # [(havuz, toplam, boş)]
+        return self.conn.execute("SELECT pool, COUNT(*), COUNT(*) - COUNT(machine) FROM product_keys "
+                                 "GROUP BY pool ORDER BY pool").fetchall()
+
+    def free_count(self, pool):
+        return self.conn.execute("SELECT COUNT(*) FROM product_keys WHERE pool = ? AND machine IS NULL",
+                                 (pool,)).fetchone()[0]
+
+
+def default_key_pool_path():
+    base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+    return os.path.join(base, 'WOM', 'keys.sqlite3')
+
+
+def assign_product_key(profile, machine=None, dry_run=False):
+    return claim_product_key(profile, machine, dry_run)[0]
+
+
+def claim_product_key(profile, machine=None, dry_run=False):
+    # Uygulama sırasında: havuz başvurusu makineye atanmış anahtara çevrilir.
+    # Deneme çalışmasında anahtar harcanmaz; yalnızca mevcut atama döner.
+    # Dönüş: (anahtar, bu çağrıda havuzdan yeni mi alındı)
+    value = profile.get('product_key') or None
+    pool = pool_reference(value)
+    if pool is None:
+        return value, False
+    machine = machine or local_machine()
+    keys = KeyPool(default_key_pool_path())
+    try:
+        if dry_run:
+            return keys.lookup(machine, pool), False
+        label = " ".join(part for part in (profile.get('manufacturer'), profile.get('model')) if part)
+        return keys.claim(pool, machine, label)
+    finally:
+        keys.close()
+
+
+def release_product_key(profile, product_key, machine=None):
+    # Uygulama yarıda kalırsa o uygulamada alınan anahtar havuza geri döner
+    pool = pool_reference(profile.get('product_key') or None)
+    if pool is None or product_key is None:
+        return False
+    keys = KeyPool(default_key_pool_path())
+    try:
+        return keys.release(pool, machine or local_machine(), product_key)
+    finally:
+        keys.close()
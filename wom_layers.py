@@ -0,0 +1,202 @@
+import os
+import json
+import threading
+from collections import OrderedDict
+
+from wom_core import DEFAULT_PROFILE, ProfileError, check_profile, profile_overrides
+
+# Katmanlı profiller: bir profil "extends" ile üst katmanını gösterir (kurumsal
+# taban -> bölge -> model -> makine). Katmanda yazılı bir alan, boş olsa bile
+# üstten geleni ezer; yazılı olmayan alan üst katmandan gelir. Göreli logo
+# yolları katmanın kendi klasörüne göre çözülür. Okunan katmanlar ve
+# birleştirilmiş sonuçlar bellekte tutulur: dosyası değişen katman yalnızca
+# kendisini ve ondan türeyenleri geçersiz kılar, binlerce makine profili ortak
+# ara katmanları bir kez okur ve birleştirir.
+
+EXTENDS_KEY = 'extends'
+MAX_DEPTH = 16
+# Bellekte tutulan katman ve sonuç sayısı; aşılınca en uzun süredir kullanılmayan düşer
+MAX_ENTRIES = 8192
+
+
+def _stamp(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def file_stamp(path):
+    # Dosya yoksa None
+    try:
+        return _stamp(path)
+    except OSError:
+        return None
+
+
+class Layer:
+    __slots__ = ('path', 'stamp', 'parent', 'overrides')
+
+    def __init__(self, path, stamp, parent, overrides):
+        self.path = path
+        self.stamp = stamp
+        self.parent = parent
+        self.overrides = overrides
+
+
+def read_layer(path, stamp=None):
+    name = os.path.basename(path)
+    if stamp is None:
+        stamp = _stamp(path)
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ProfileError(f"{name}: profile must be a JSON object")
+
+    parent = data.get(EXTENDS_KEY)
+    if parent is not None:
+        if not isinstance(parent, str) or not parent.strip():
+            raise ProfileError(f"{name}: {EXTENDS_KEY} must be a profile path")
+        parent = os.path.abspath(os.path.join(os.path.dirname(path), parent))
+    try:
+        overrides = profile_overrides(data, base_dir=os.path.dirname(path))
+    except ProfileError as e:
+        raise ProfileError(f"{name}: {e}")
+    return Layer(path, stamp, parent, overrides)
+
+
+class ProfileResolver:
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.layers = OrderedDict()
+        # yol -> (profil, {alan: değeri veren katman})
+        self.resolved = OrderedDict()
+        # üst katman -> {ondan türeyen katmanlar}
+        self.dependents = {}
+        self.reads = 0
+        self.merges = 0
+        self._lock = threading.Lock()
+
+    def resolve(self, path):
+        return self.resolve_many((path,))[0]
+
+    def resolve_many(self, paths):
+        # Her katmanın dosya damgası bir çağrıda en fazla bir kez denetlenir
+        with self._lock:
+            checked = set()
+            return [dict(self._resolve(os.path.abspath(path), checked, ())[0]) for path in paths]
+
+    def sources(self, path):
+        path = os.path.abspath(path)
+        with self._lock:
+            return dict(self._resolve(path, set(), ())[1])
+
+    def chain(self, path):
+        # Makineden tabana katman yolları
+        path = os.path.abspath(path)
+        with self._lock:
+            self._resolve(path, set(), ())
+            paths = []
+            while path is not None:
+                paths.append(path)
+                path = self.layers[path].parent
+            return paths
+
+    def layer_stamps(self, path):
+        # Çözümlemeden sonra zincirdeki katmanlar ve dosya damgaları [(yol, damga)];
+        # çözümleme hata verdiyse okunabildiği yere kadar, okunamayan katman dahil
+        path = os.path.abspath(path)
+        stamps, seen = [], set()
+        with self._lock:
+            while path is not None and path not in seen and len(seen) <= MAX_DEPTH:
+                seen.add(path)
+                layer = self.layers.get(path)
+                stamps.append((path, layer.stamp if layer is not None else file_stamp(path)))
+                path = layer.parent if layer is not None else None
+        return stamps
+
+    def invalidate(self, path):
+        # Katman ve ondan türeyen tüm katmanların sonuçları düşer
+        stack, seen = [path], set()
+        while stack:
+            path = stack.pop()
+            if path not in seen:
+                seen.add(path)
+                self.resolved.pop(path, None)
+                stack.extend(self.dependents.get(path, ()))
+
+    def clear(self):
+        with self._lock:
+            self.layers.clear()
+            self.resolved.clear()
+            self.dependents.clear()
+
+    def _layer(self, path, checked):
+        layer = self.layers.get(path)
+        if path in checked:
+            return layer
+        stamp = _stamp(path)
+        if layer is not None and layer.stamp == stamp:
+            checked.add(path)
+            return layer
+
+        new = read_layer(path, stamp)
+        self.reads += 1
+        checked.add(path)
+        if layer is not None and layer.parent is not None:
+            self.dependents.get(layer.parent, set()).discard(path)
+        if new.parent is not None:
+            self.dependents.setdefault(new.parent, set()).add(path)
+        self.layers[path] = new
+        self.invalidate(path)
+        while len(self.layers) > self.max_entries:
+            # Düşen katman yeniden okunduğunda kendisini ve türeyenleri geçersiz kılar;
+            # türeyenlerin bağı (dependents[düşen]) bu yüzden korunur
+            evicted, old = self.layers.popitem(last=False)
+            if old.parent is not None:
+                self.dependents.get(old.parent, set()).discard(evicted)
+        return new
+
+    def _resolve(self, path, checked, seen):
+        if path in seen:
+            raise ProfileError(f"{os.path.basename(path)}: circular {EXTENDS_KEY}")
+        if len(seen) >= MAX_DEPTH:
+            raise ProfileError(f"{os.path.basename(path)}: more than {MAX_DEPTH} profile layers")
+        layer = self._layer(path, checked)
+        self.layers.move_to_end(path)
+        # Üst katman önce çözülür; değiştiyse bu katmanın sonucu da düşmüş olur
+        parent = None
+        if layer.parent is not None:
+            parent = self._resolve(layer.parent, checked, seen + (path,))
+
+        entry = self.resolved.get(path)
+        if entry is not None:
+            self.resolved.move_to_end(path)
+        else:
+            if parent is None:
+                profile, sources = dict(DEFAULT_PROFILE), {}
+            else:
+                profile, sources = dict(parent[0]), dict(parent[1])
+            profile.update(layer.overrides)
+            sources.update(dict.fromkeys(layer.overrides, path))
+            try:
+                check_profile(profile)
+            except ProfileError as e:
+                raise ProfileError(f"{os.path.basename(path)}: {e}")
+            entry = self.resolved[path] = (profile, sources)
+            self.merges += 1
+            while len(self.resolved) > self.max_entries:
+                self.resolved.popitem(last=False)
+        return entry
+
+
+_resolver = None
+
+
+def profile_resolver():
+    global _resolver
+    if _resolver is None:
+        _resolver = ProfileResolver()
+    return _resolver
+
+
+def resolve_profile(path):
+    return profile_resolver().resolve(path)
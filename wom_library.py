@@ -0,0 +1,214 @@
+import os
+import json
+import sqlite3
+
+from wom_core import ProfileError
+from wom_layers import ProfileResolver, file_stamp
+
+# Profil kütüphanesi: klasörlerdeki JSON profiller ve paketler SQLite dizininde tutulur.
+# Yenileme artımlıdır; yalnızca kendisinin ya da üst katmanlarından birinin
+# mtime/boyutu değişen dosyalar yeniden okunur.
+
+PROFILE_EXTENSIONS = ('.json', '.wombundle')
+INDEXED_FIELDS = ('manufacturer', 'model', 'support_url', 'support_phone', 'windows_version')
+
+
+def _fts5_available(conn):
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+        conn.execute("DROP TABLE temp.fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+class LibraryEntry:
+    def __init__(self, path, manufacturer, model, support_url, support_phone, windows_version):
+        self.path = path
+        self.manufacturer = manufacturer
+        self.model = model
+        self.support_url = support_url
+        self.support_phone = support_phone
+        self.windows_version = windows_version
+
+    @property
+    def title(self):
+        return " ".join(part for part in (self.manufacturer, self.model) if part) or os.path.basename(self.path)
+
+    @property
+    def subtitle(self):
+        return " · ".join(part for part in (self.windows_version, self.support_phone, self.support_url) if part)
+
+
+class ProfileLibrary:
+    def __init__(self, db_path):
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.fts = _fts5_available(self.conn)
+        # Kütüphanenin kendi çözümleyicisi: ortak katmanlar bir yenilemede bir kez
+        # okunur, yenileme bitince sonuçlar bellekten atılır
+        self.resolver = ProfileResolver()
+        self._create_schema()
+
+    def close(self):
+        self.resolver.clear()
+        self.conn.close()
+
+    def _create_schema(self):
+        columns = ", ".join(f"{name} TEXT NOT NULL DEFAULT ''" for name in INDEXED_FIELDS)
+        with self.conn:
+            self.conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS profiles (
+                    id INTEGER PRIMARY KEY,
+                    path TEXT NOT NULL UNIQUE,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    error TEXT,
+                    search TEXT NOT NULL DEFAULT '',
+                    layers TEXT NOT NULL DEFAULT '',
+                    {columns}
+                )""")
+            if 'layers' not in {row[1] for row in self.conn.execute("PRAGMA table_info(profiles)")}:
+                # Eski dizin: üst katman damgaları yok, her dosya bir kez yeniden okunur
+                self.conn.execute("ALTER TABLE profiles ADD COLUMN layers TEXT NOT NULL DEFAULT ''")
+                self.conn.execute("UPDATE profiles SET mtime_ns = -1")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS profiles_name "
+                              "ON profiles(manufacturer COLLATE NOCASE, model COLLATE NOCASE)")
+            if self.fts:
+                self.conn.execute(f"""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS profiles_fts
+                    USING fts5({", ".join(INDEXED_FIELDS)}, prefix='1 2 3')""")
+
+    def _scan(self, directories):
+        for directory in directories:
+            for root, _, files in os.walk(directory):
+                for name in files:
+                    if name.lower().endswith(PROFILE_EXTENSIONS):
+                        path = os.path.join(root, name)
+                        try:
+                            st = os.stat(path)
+                        except OSError:
+                            continue
+                        yield os.path.abspath(path), st.st_mtime_ns, st.st_size
+
+    def _read_profile(self, path):
+        if path.lower().endswith('.wombundle'):
+            from wom_bundle import read_bundle
+            return read_bundle(path, load_logos=False).profile
+        return self.resolver.resolve(path)
+
+    def _layer_stamps(self, path):
+        # Üst katmanlar ve damgaları [[yol, mtime_ns, boyut], ...]; dosyanın kendisi hariç
+        if path.lower().endswith('.wombundle'):
+            return []
+        return [[layer, *(stamp or (None, None))] for layer, stamp in self.resolver.layer_stamps(path)[1:]]
+
+    def refresh(self, directories):
+        # Dönüş: (eklenen/güncellenen, silinen) dosya sayısı
+        known = {path: (mtime, size, layers) for path, mtime, size, layers
+                 in self.conn.execute("SELECT path, mtime_ns, size, layers FROM profiles")}
+        roots = [os.path.abspath(d) for d in directories]
+        seen = set()
+        stamps = {}
+        updated = 0
+
+        def layers_changed(layers):
+            # Ortak üst katmanlar yenileme başına bir kez stat edilir
+            for layer, mtime, size in json.loads(layers) if layers else ():
+                if layer not in stamps:
+                    stamps[layer] = file_stamp(layer)
+                if stamps[layer] != (None if mtime is None else (mtime, size)):
+                    return True
+            return False
+
+        try:
+            with self.conn:
+                for path, mtime, size in self._scan(roots):
+                    seen.add(path)
+                    entry = known.get(path)
+                    if entry is not None and entry[:2] == (mtime, size) and not layers_changed(entry[2]):
+                        continue
+                    self._index(path, mtime, size)
+                    updated += 1
+
+                removed = [path for path in known
+                           if path not in seen and any(path.startswith(root + os.sep) for root in roots)]
+                for path in removed:
+                    self._remove(path)
+        finally:
+            self.resolver.clear()
+        return updated, len(removed)
+
+    def _index(self, path, mtime, size):
+        error = None
+        fields = dict.fromkeys(INDEXED_FIELDS, '')
+        try:
+            profile = self._read_profile(path)
+            for name in INDEXED_FIELDS:
+                fields[name] = str(profile.get(name) or '')
+        except (OSError, ValueError, ProfileError) as e:
+            # Bozuk dosyalar da kaydedilir; kendisi ya da üst katmanı değişmedikçe yeniden okunmaz
+            error = str(e)
+
+        layers = self._layer_stamps(path)
+        search = " ".join(fields.values()).lower()
+        values = (mtime, size, error, search, json.dumps(layers) if layers else '', *fields.values())
+        names = ('mtime_ns', 'size', 'error', 'search', 'layers') + INDEXED_FIELDS
+        row = self.conn.execute("SELECT id FROM profiles WHERE path = ?", (path,)).fetchone()
+        if row:
+            profile_id = row[0]
+            assignments = ", ".join(f"{name} = ?" for name in names)
+            self.conn.execute(f"UPDATE profiles SET {assignments} WHERE id = ?", (*values, profile_id))
+        else:
+            profile_id = self.conn.execute(
+                f"INSERT INTO profiles (path, {', '.join(names)}) "
+                f"VALUES (?, {', '.join('?' * len(names))})",
+                (path, *values)).lastrowid
+        if self.fts:
+            # Tam metin satırı profil satırıyla aynı rowid'i paylaşır
+            self.conn.execute("DELETE FROM profiles_fts WHERE rowid = ?", (profile_id,))
+            if error is None:
+                self.conn.execute(
+                    f"INSERT INTO profiles_fts (rowid, {', '.join(INDEXED_FIELDS)}) "
+                    f"VALUES (?, {', '.join('?' * len(INDEXED_FIELDS))})",
+                    (profile_id, *fields.values()))
+
+    def _remove(self, path):
+        row = self.conn.execute("SELECT id FROM profiles WHERE path = ?", (path,)).fetchone()
+        if row:
+            self.conn.execute("DELETE FROM profiles WHERE id = ?", row)
+            if self.fts:
+                self.conn.execute("DELETE FROM profiles_fts WHERE rowid = ?", row)
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM profiles WHERE error IS NULL").fetchone()[0]
+
+    def search(self, text, limit=20):
+        columns = ", ".join(f"p.{name}" for name in INDEXED_FIELDS)
+        terms = text.split()
+        if not terms:
+            rows = self.conn.execute(
+                f"SELECT p.path, {columns} FROM profiles p WHERE p.error IS NULL "
+                f"ORDER BY p.manufacturer COLLATE NOCASE, p.model COLLATE NOCASE LIMIT ?", (limit,))
+        elif self.fts:
+            # Her kelime önek olarak aranır: "acme lap" -> "acme"* AND "lap"*
+            query = " ".join('"' + term.replace('"', '""') + '"*' for term in terms)
+            rows = self.conn.execute(
+                f"SELECT p.path, {columns} FROM profiles_fts f JOIN profiles p ON p.id = f.rowid "
+                f"WHERE profiles_fts MATCH ? LIMIT ?", (query, limit))
+        else:
+            where = " AND ".join("p.search LIKE ?" for _ in terms)
+            params = [f"%{term.lower()}%" for term in terms]
+            rows = self.conn.execute(
+                f"SELECT p.path, {columns} FROM profiles p WHERE p.error IS NULL AND {where} "
+                f"ORDER BY p.manufacturer COLLATE NOCASE, p.model COLLATE NOCASE LIMIT ?", (*params, limit))
+        return [LibraryEntry(*row) for row in rows]
+
+    def errors(self):
+        return self.conn.execute("SELECT path, error FROM profiles WHERE error IS NOT NULL").fetchall()
+
+
+def default_library_path():
+    base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+    return os.path.join(base, 'WOM', 'library.sqlite3')
@@ -0,0 +1,200 @@
+import os
+import sys
+import json
+import time
+import random
+import tempfile
+import threading
+import subprocess
+
+# Sağlama servisi (wom daemon) için yük testi. Geçici klasörde boş SOFTWARE
+# hive'lı imaj hedefleri ve bir logo oluşturur, servisi bellek içi registry ile
+# ayrı süreçte başlatır, ısındırır ve ardından eş zamanlı istemcilerle karışık
+# apply / dry_run / read_current istekleri gönderir. İstek başına gecikme
+# istemci tarafında milisaniye olarak ölçülür. Linux'ta da çalışır.
+#
+#   python wom_loadtest.py                          # 8 istemci, 16 imaj, istemci başına 200 istek
+#   python wom_loadtest.py --clients 32 --targets 64 --requests 500
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# İstek karışımı: (yöntem, ağırlık)
+REQUEST_MIX = (('read_current', 4), ('dry_run', 4), ('apply', 2))
+START_TIMEOUT = 30.0
+
+
+def make_logo(path, size=1024):
+    from PIL import Image, ImageDraw
+
+    image = Image.new('RGBA', (size, size * 9 // 16), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    draw.ellipse((size // 8, size // 16, size * 7 // 8, size // 2), fill=(30, 60, 200, 255))
+    image.save(path)
+    return path
+
+
+def make_targets(directory, count):
+    from wom_hive import create_hive
+
+    roots = []
+    for index in range(count):
+        root = os.path.join(directory, f"image{index:03}")
+        config_dir = os.path.join(root, 'Windows', 'System32', 'config')
+        os.makedirs(config_dir)
+        create_hive(os.path.join(config_dir, 'SOFTWARE'))
+        roots.append(root)
+    return roots
+
+
+def start_daemon(directory, workers=None):
+    state_path = os.path.join(directory, 'daemon.json')
+    system_root = os.path.join(directory, 'Windows')
+    command = [sys.executable, os.path.join(BASE_DIR, 'wom_daemon.py'), '--port', '0', '--state', state_path,
+               '--memory-registry', '--system-root', system_root]
+    if workers:
+        command += ['--jobs', str(workers)]
+    env = dict(os.environ, LOCALAPPDATA=directory)
+    process = subprocess.Popen(command, env=env, stdout=subprocess.PIPE, text=True)
+    deadline = time.monotonic() + START_TIMEOUT
+    while not os.path.exists(state_path):
+        if process.poll() is not None or time.monotonic() > deadline:
+            process.kill()
+            raise RuntimeError("the daemon did not start")
+        time.sleep(0.02)
+    return process, state_path
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def summarize(timings):
+    return {
+        'count': len(timings),
+        'p50_ms': round(percentile(timings, 0.5), 3),
+        'p95_ms': round(percentile(timings, 0.95), 3),
+        'p99_ms': round(percentile(timings, 0.99), 3),
+        'max_ms': round(max(timings), 3),
+    }
+
+
+def run(clients=8, targets=16, requests=200, workers=None, seed=1):
+    from wom_core import DEFAULT_PROFILE
+    from wom_daemon import DaemonClient, DaemonError
+
+    with tempfile.TemporaryDirectory(prefix='wom-load-') as directory:
+        roots = make_targets(directory, targets) + ['local']
+        profile = dict(DEFAULT_PROFILE, manufacturer='Contoso', model='Contoso Book 14',
+                       support_url='https://support.contoso.example', support_hours='09:00-18:00',
+                       logo=make_logo(os.path.join(directory, 'logo.png')))
+        process, state_path = start_daemon(directory, workers)
+        try:
+            # Isınma: her hedef bir kez okunur ve uygulanır, logo bir kez kodlanır
+            client = DaemonClient(state_path)
+            started = time.perf_counter()
+            for root in roots:
+                client.read_current(root)
+                client.apply(profile, root)
+            warmup_ms = (time.perf_counter() - started) * 1000
+
+            timings = {method: [] for method, _ in REQUEST_MIX}
+            errors = []
+            lock = threading.Lock()
+            methods = [method for method, weight in REQUEST_MIX for _ in range(weight)]
+
+            def worker(number):
+                rng = random.Random(seed + number)
+                connection = DaemonClient(state_path)
+                local = {method: [] for method, _ in REQUEST_MIX}
+                try:
+                    for index in range(requests):
+                        method = rng.choice(methods)
+                        root = rng.choice(roots)
+                        begin = time.perf_counter()
+                        try:
+                            if method == 'read_current':
+                                connection.read_current(root)
+                            else:
+                                # Uygulamalar gerçekten yazsın: destek telefonu her istekte farklı
+                                changed = dict(profile, support_phone=f"+90 212 {number:03} {index:04}")
+                                connection.call(method, profile=changed, target=root)
+                        except DaemonError as e:
+                            with lock:
+                                errors.append(f"{method} {root}: {e}")
+                            continue
+                        local[method].append((time.perf_counter() - begin) * 1000)
+                finally:
+                    connection.close()
+                with lock:
+                    for method, values in local.items():
+                        timings[method].extend(values)
+
+            threads = [threading.Thread(target=worker, args=(number,)) for number in range(clients)]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+
+            stats = client.call('stats')
+            client.call('shutdown')
+            client.close()
+            process.wait(timeout=10)
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+
+    total = sum(len(values) for values in timings.values())
+    return {
+        'clients': clients,
+        'targets': len(roots),
+        'warmup_ms': round(warmup_ms, 3),
+        'requests': total,
+        'errors': errors,
+        'seconds': round(elapsed, 3),
+        'requests_per_second': round(total / elapsed, 1) if elapsed else None,
+        'latency': {method: summarize(values) for method, values in timings.items() if values},
+        'daemon': stats,
+    }
+
+
+def format_report(results):
+    lines = [f"{results['requests']} requests from {results['clients']} clients to {results['targets']} targets "
+             f"in {results['seconds']:.2f}s ({results['requests_per_second']} req/s); "
+             f"warm-up {results['warmup_ms']:.0f} ms",
+             f"{'method':<14} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"]
+    for method, row in results['latency'].items():
+        lines.append(f"{method:<14} {row['count']:>7} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} "
+                     f"{row['p99_ms']:>9.2f} {row['max_ms']:>9.2f}")
+    daemon = results['daemon']
+    lines.append(f"daemon: logo cache {daemon['logo_hits']} hit(s) / {daemon['logo_misses']} miss(es), "
+                 f"snapshots {daemon['snapshot_hits']} hit(s) / {daemon['snapshot_misses']} miss(es)")
+    for error in results['errors'][:10]:
+        lines.append(f"error: {error}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='wom_loadtest', description='WOM daemon load test')
+    parser.add_argument('--clients', type=int, default=8, help='concurrent client connections')
+    parser.add_argument('--targets', type=int, default=16, help='image targets (plus the local registry)')
+    parser.add_argument('--requests', type=int, default=200, help='requests per client')
+    parser.add_argument('--jobs', type=int, help='daemon worker threads')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    args = parser.parse_args(argv)
+
+    results = run(args.clients, args.targets, args.requests, args.jobs)
+    print(format_report(results))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write('\n')
+    return 1 if results['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,457 @@
+import os
+import struct
+from collections import OrderedDict
+
+from PyQt5.QtGui import QImage, QPixmap, QImageReader, QImageIOHandler
+from PyQt5.QtCore import Qt, QSize, QObject, QRunnable, QThreadPool, pyqtSignal
+
+from wom_trace import span
+
+# Logo bir kez çözülür; önizleme, boyut değişiklikleri ve son çıktı
+# gerektiğinde oluşturulan yarı-boyut seviyelerinden (mip piramidi) üretilir.
+
+
+class LogoError(Exception):
+    pass
+
+
+class LogoAsset:
+    MAX_SCALED = 8
+
+    def __init__(self, path, image=None):
+        self.path = path
+        if image is None:
+            image = QImage(path)
+        if image.isNull():
+            raise LogoError(f"{path}: unsupported or corrupt image")
+        self.image = image
+        self.levels = [image]
+        self._scaled = OrderedDict()
+        self._trim_box = None
+
+    @property
+    def size(self):
+        return self.image.size()
+
+    def _level_for(self, target):
+        # Hedeften küçük olmayan en küçük seviye; eksik seviyeler tembel üretilir
+        index = 0
+        while True:
+            level = self.levels[index]
+            half_width, half_height = level.width() // 2, level.height() // 2
+            if half_width < target.width() or half_height < target.height() or min(half_width, half_height) < 1:
+                return level
+            if index + 1 == len(self.levels):
+                self.levels.append(level.scaled(half_width, half_height,
+                                                Qt.IgnoreAspectRatio, Qt.SmoothTransformation))
+            index += 1
+
+    def scaled(self, width, height):
+        key = (width, height)
+        image = self._scaled.get(key)
+        if image is not None:
+            self._scaled.move_to_end(key)
+            return image
+
+        target = self.image.size().scaled(width, height, Qt.KeepAspectRatio)
+        level = self._level_for(target)
+        image = level.scaled(target, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        self._scaled[key] = image
+        if len(self._scaled) > self.MAX_SCALED:
+            self._scaled.popitem(last=False)
+        return image
+
+    def rgba(self):
+        return image_array(self.image)
+
+    def trim_box(self):
+        # Kırpılacak saydam/düz kenarlar bir kez hesaplanır
+        if self._trim_box is None:
+            from wom_optimize import trim_box
+            self._trim_box = tuple(int(v) for v in trim_box(self.rgba()))
+        return self._trim_box
+
+    def pixmap(self, size):
+        if isinstance(size, QSize):
+            size = (size.width(), size.height())
+        return QPixmap.fromImage(self.scaled(*size))
+
+
+def image_array(image):
+    # QImage -> (h, w, 4) RGBA uint8 NumPy dizisi; satır dolgusu atlanır
+    import numpy as np
+
+    if image.format() != QImage.Format_RGBA8888:
+        image = image.convertToFormat(QImage.Format_RGBA8888)
+    bits = image.constBits()
+    bits.setsize(image.bytesPerLine() * image.height())
+    rows = np.frombuffer(bits, dtype=np.uint8).reshape(image.height(), image.bytesPerLine())
+    return rows[:, :image.width() * 4].reshape(image.height(), image.width(), 4).copy()
+
+
+class LogoCache:
+    def __init__(self, max_entries=8):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    @staticmethod
+    def key_for(path):
+        st = os.stat(path)
+        return os.path.abspath(path), st.st_mtime_ns, st.st_size
+
+    def get(self, path):
+        key = self.key_for(path)
+        asset = self.entries.get(key)
+        if asset is not None:
+            self.entries.move_to_end(key)
+            return asset
+        return self.put(key, LogoAsset(path))
+
+    def put(self, key, asset):
+        # Aynı dosyanın eski (değişmiş) sürümleri yer kaplamasın
+        for stale in [k for k in self.entries if k[0] == key[0] and k != key]:
+            del self.entries[stale]
+        self.entries[key] = asset
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return asset
+
+    def clear(self):
+        self.entries.clear()
+
+
+logo_cache = LogoCache()
+
+
+def probe_image(path):
+    # Yalnızca başlık okunur: boyut ve format, piksel verisi çözülmeden
+    reader = QImageReader(path)
+    size = reader.size()
+    if not size.isValid():
+        raise LogoError(f"{path}: {reader.errorString()}")
+    return size, bytes(reader.format()).decode('ascii', 'replace')
+
+
+class ImageHeader:
+    def __init__(self, path, format, width, height, bit_depth):
+        self.path = path
+        self.format = format
+        self.width = width
+        self.height = height
+        self.bit_depth = bit_depth
+
+    def __str__(self):
+        return f"{self.format} {self.width} x {self.height}, {self.bit_depth}-bit"
+
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_TRAILER = b'\x00\x00\x00\x00IEND\xaeB`\x82'
+PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+JPEG_SOF = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# Uzunluksuz JPEG işaretleri: TEM ve RST0-7
+JPEG_STANDALONE = {0x01} | set(range(0xD0, 0xD8))
+JPEG_SOS = 0xDA
+# Bitiş işareti (IEND/EOI) dosyanın son bu kadar baytında aranır; sonrasındaki
+# dolgu ve ek veriler (diğer araçların da kabul ettiği) sorun sayılmaz
+TRAILER_WINDOW = 64 * 1024
+
+
+def _sniff_png(f, head, size, trailer):
+    if len(head) < 33 or head[12:16] != b'IHDR':
+        raise LogoError("PNG header is damaged")
+    width, height, bit_depth, color_type = struct.unpack('>IIBB', head[16:26])
+    if color_type not in PNG_CHANNELS:
+        raise LogoError("PNG header is damaged")
+    if trailer:
+        f.seek(max(33, size - TRAILER_WINDOW))
+        if PNG_TRAILER not in f.read():
+            raise LogoError("PNG file is truncated")
+    return 'PNG', width, height, bit_depth * PNG_CHANNELS[color_type]
+
+
+def _sniff_jpeg(f, head, size, trailer):
+    # SOI'den sonra segmentler SOF bulunana kadar uzunluk alanlarıyla atlanır; yalnızca
+    # segment başları okunur, büyük ICC/EXIF segmentleri okunmadan geçilir
+    offset = 2
+    while True:
+        f.seek(offset)
+        prefix = f.read(4)
+        if len(prefix) < 2 or prefix[0] != 0xFF:
+            raise LogoError("JPEG header is truncated" if len(prefix) < 2 else "JPEG header is damaged")
+        marker = prefix[1]
+        if marker == 0xFF:
+            # Dolgu baytı
+            offset += 1
+            continue
+        if marker in JPEG_STANDALONE:
+            offset += 2
+            continue
+        if len(prefix) < 4:
+            raise LogoError("JPEG header is truncated")
+        length, = struct.unpack('>H', prefix[2:4])
+        if marker == JPEG_SOS or length < 2:
+            raise LogoError("JPEG header is damaged")
+        if offset + 2 + length > size:
+            raise LogoError("JPEG header is truncated")
+        if marker in JPEG_SOF:
+            frame = f.read(6)
+            if len(frame) < 6:
+                raise LogoError("JPEG header is truncated")
+            precision, height, width, components = struct.unpack('>BHHB', frame)
+            break
+        offset += 2 + length
+    if trailer:
+        f.seek(max(offset + 2 + length, size - TRAILER_WINDOW))
+        if b'\xff\xd9' not in f.read():
+            raise LogoError("JPEG file is truncated")
+    return 'JPEG', width, height, precision * components
+
+
+def _sniff_bmp(f, head, size, trailer):
+    if len(head) < 30:
+        raise LogoError("BMP header is truncated")
+    pixel_offset, header_size = struct.unpack('<II', head[10:18])
+    if header_size == 12:
+        width, height, _, bit_depth = struct.unpack('<HHHH', head[18:26])
+        compression = 0
+    else:
+        if len(head) < 34:
+            raise LogoError("BMP header is truncated")
+        width, height, _, bit_depth, compression = struct.unpack('<iiHHI', head[18:34])
+    height = abs(height)
+    if compression == 0:
+        # Sıkıştırmasız: satırlar 4 bayta hizalı, dosya boyutu önceden bilinir
+        expected = pixel_offset + ((bit_depth * width + 31) // 32) * 4 * height
+        if size < expected:
+            raise LogoError("BMP file is truncated")
+    return 'BMP', width, height, bit_depth
+
+
+SNIFFERS = {'PNG': _sniff_png, 'JPEG': _sniff_jpeg, 'BMP': _sniff_bmp}
+
+
+def _image_format(head):
+    if head.startswith(PNG_SIGNATURE):
+        return 'PNG'
+    if head.startswith(b'\xff\xd8\xff'):
+        return 'JPEG'
+    if head.startswith(b'BM'):
+        return 'BMP'
+    return None
+
+
+def image_format(path):
+    # Yalnızca imza baytları okunur (sürükleme sırasında); resim değilse ya da okunamazsa None
+    try:
+        with open(path, 'rb') as f:
+            return _image_format(f.read(len(PNG_SIGNATURE)))
+    except OSError:
+        return None
+
+
+def sniff_image(path, trailer=True):
+    # Yalnızca imza, başlık ve trailer verilirse dosya sonu (IEND/EOI, en fazla
+    # TRAILER_WINDOW bayt) okunur; uzantıya bakılmaz. Dosya sonu denetimi
+    # arayüzde değil, çözmeden önce iş parçacığında yapılır.
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        head = f.read(64)
+        fmt = _image_format(head)
+        if fmt is None:
+            raise LogoError("not a PNG, JPEG or BMP image")
+        result = SNIFFERS[fmt](f, head, size, trailer)
+    fmt, width, height, bit_depth = result
+    if width <= 0 or height <= 0:
+        raise LogoError("invalid image size")
+    return ImageHeader(path, fmt, width, height, bit_depth)
+
+
+def sniff_images(paths, trailer=True):
+    # (geçerli başlıklar, [(yol, hata)])
+    headers, rejected = [], []
+    for path in paths:
+        try:
+            headers.append(sniff_image(path, trailer))
+        except (OSError, struct.error, LogoError) as e:
+            rejected.append((path, str(e)))
+    return headers, rejected
+
+
+class _ThumbnailSignals(QObject):
+    ready = pyqtSignal(int, str, QImage)
+    failed = pyqtSignal(int, str, str)
+
+
+class ThumbnailTask(QRunnable):
+    def __init__(self, loader, generation, path, size):
+        super().__init__()
+        self.loader = loader
+        self.generation = generation
+        self.path = path
+        self.size = size
+        self.signals = loader._signals
+
+    def run(self):
+        if self.generation != self.loader.generation:
+            return
+        try:
+            # Yarım kalmış dosya çözülmeden elenir
+            sniff_image(self.path)
+            # Ölçekli çözmeyi destekleyen formatlar tam boyutta çözülmez
+            reader = QImageReader(self.path)
+            source = reader.size()
+            if source.isValid() and reader.supportsOption(QImageIOHandler.ScaledSize):
+                reader.setScaledSize(source.scaled(self.size, Qt.KeepAspectRatio))
+            with span('logo.thumbnail'):
+                image = reader.read()
+            if image.isNull():
+                raise LogoError(reader.errorString())
+            if image.width() > self.size.width() or image.height() > self.size.height():
+                image = image.scaled(self.size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            self.signals.ready.emit(self.generation, self.path, image)
+        except Exception as e:
+            self.signals.failed.emit(self.generation, self.path, str(e))
+
+
+class ThumbnailLoader(QObject):
+    # Aday logoların küçük resimleri ayrı bir havuzda üretilir; ana logo yüklemesini bekletmez
+    ready = pyqtSignal(str, QImage)
+    failed = pyqtSignal(str, str)
+
+    def __init__(self, parent=None, size=QSize(96, 54), pool=None):
+        super().__init__(parent)
+        self.size = QSize(size)
+        if pool is None:
+            pool = QThreadPool(self)
+            pool.setMaxThreadCount(max(1, QThreadPool.globalInstance().maxThreadCount() - 1))
+        self.pool = pool
+        self.generation = 0
+        self._signals = _ThumbnailSignals(self)
+        self._signals.ready.connect(self._on_ready)
+        self._signals.failed.connect(self._on_failed)
+
+    def queue(self, paths):
+        for path in paths:
+            self.pool.start(ThumbnailTask(self, self.generation, path, self.size))
+
+    def cancel(self):
+        self.generation += 1
+        self.pool.clear()
+
+    def _on_ready(self, generation, path, image):
+        if generation == self.generation:
+            self.ready.emit(path, image)
+
+    def _on_failed(self, generation, path, message):
+        if generation == self.generation:
+            self.failed.emit(path, message)
+
+
+class _LoadSignals(QObject):
+    preview = pyqtSignal(int, str, QImage)
+    loaded = pyqtSignal(int, str, object, object)
+    failed = pyqtSignal(int, str, str)
+
+
+class LogoLoadTask(QRunnable):
+    def __init__(self, loader, generation, path, key, preview_size):
+        super().__init__()
+        self.loader = loader
+        self.generation = generation
+        self.path = path
+        self.key = key
+        self.preview_size = preview_size
+        self.signals = loader._signals
+
+    def stale(self):
+        return self.generation != self.loader.generation
+
+    def run(self):
+        try:
+            with span('logo.probe'):
+                sniff_image(self.path)
+                size, _ = probe_image(self.path)
+            target = size.scaled(self.preview_size, Qt.KeepAspectRatio)
+
+            # JPEG gibi formatlar ölçekli çözmeyi destekler: önce düşük çözünürlüklü önizleme
+            reader = QImageReader(self.path)
+            if reader.supportsOption(QImageIOHandler.ScaledSize) and size.width() > target.width() * 4:
+                reader.setScaledSize(target)
+                with span('logo.preview_decode'):
+                    preview = reader.read()
+                if self.stale():
+                    return
+                if not preview.isNull():
+                    self.signals.preview.emit(self.generation, self.path, preview)
+
+            with span('logo.decode', width=size.width(), height=size.height()):
+                image = QImageReader(self.path).read()
+            if self.stale():
+                return
+            asset = LogoAsset(self.path, image)
+            # Önizleme seviyesi ve kırpma kutusu iş parçacığında hazırlanır
+            with span('logo.prepare'):
+                asset.scaled(self.preview_size.width(), self.preview_size.height())
+                asset.trim_box()
+            self.signals.loaded.emit(self.generation, self.path, self.key, asset)
+        except Exception as e:
+            if not self.stale():
+                self.signals.failed.emit(self.generation, self.path, str(e))
+
+
+class LogoLoader(QObject):
+    preview_ready = pyqtSignal(str, QImage)
+    loaded = pyqtSignal(str, object)
+    failed = pyqtSignal(str, str)
+
+    def __init__(self, parent=None, cache=None, pool=None):
+        super().__init__(parent)
+        self.cache = logo_cache if cache is None else cache
+        self.pool = QThreadPool.globalInstance() if pool is None else pool
+        self.generation = 0
+        self.pending = None
+        self._signals = _LoadSignals(self)
+        self._signals.preview.connect(self._on_preview)
+        self._signals.loaded.connect(self._on_loaded)
+        self._signals.failed.connect(self._on_failed)
+
+    def load(self, path, preview_size):
+        # Yeni seçim, eski çözme işlerini geçersiz kılar
+        self.cancel()
+        key = LogoCache.key_for(path)
+        asset = self.cache.entries.get(key)
+        if asset is not None:
+            self.cache.put(key, asset)
+            self.loaded.emit(path, asset)
+            return
+        self.pending = LogoLoadTask(self, self.generation, path, key, QSize(preview_size))
+        self.pool.start(self.pending)
+
+    def cancel(self):
+        self.generation += 1
+        if self.pending is not None:
+            # Henüz başlamamış iş kuyruktan çıkarılır; çalışan işin sonucu yok sayılır
+            try:
+                self.pool.tryTake(self.pending)
+            except RuntimeError:
+                pass
+            self.pending = None
+
+    def _current(self, generation):
+        return generation == self.generation
+
+    def _on_preview(self, generation, path, image):
+        if self._current(generation):
+            self.preview_ready.emit(path, image)
+
+    def _on_loaded(self, generation, path, key, asset):
+        if self._current(generation):
+            self.pending = None
+            self.cache.put(key, asset)
+            self.loaded.emit(path, asset)
+
+    def _on_failed(self, generation, path, message):
+        if self._current(generation):
+            self.pending = None
+            self.failed.emit(path, message)
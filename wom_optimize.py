@@ -0,0 +1,175 @@
+import io
+
+import numpy as np
+from PIL import Image
+
+from wom_core import ApplyError, fit_size
+from wom_trace import span
+
+# OEM logosunun kodlanması: saydam ya da düz renkli kenarlar kırpılır, logo
+# logo_size'a sığdırılır, BMP (ve uygunsa PNG) paletli yazılır ve dosya bayt
+# bütçesini aşarsa küçültülür. Tüm piksel geçişleri NumPy ile yapılır.
+
+ALPHA_THRESHOLD = 8       # bu değerin altındaki alfa boş sayılır
+BORDER_TOLERANCE = 12     # düz kenar renginden en fazla bu kadar sapma kırpılır
+LOGO_BYTE_BUDGET = 512 * 1024
+TRIM_CHUNK = 64
+SHRINK_STEP = 0.85
+MIN_LOGO_SIZE = 16
+
+
+def to_rgba(image):
+    # PIL görüntüsü ya da (h, w, 3|4) uint8 dizi -> bitişik (h, w, 4) uint8 dizi
+    if isinstance(image, Image.Image):
+        if image.mode != 'RGBA':
+            image = image.convert('RGBA')
+        return np.asarray(image)
+    array = np.asarray(image, dtype=np.uint8)
+    if array.shape[2] == 3:
+        rgba = np.empty(array.shape[:2] + (4,), dtype=np.uint8)
+        rgba[..., :3] = array
+        rgba[..., 3] = 255
+        return rgba
+    return np.ascontiguousarray(array)
+
+
+def _border_color(rgba):
+    # Dört köşe aynı (opak) renkteyse kenar düz renklidir
+    corners = rgba[[0, 0, -1, -1], [0, -1, 0, -1]].astype(np.int16)
+    if corners[:, 3].min() < 255 - ALPHA_THRESHOLD:
+        return None
+    if np.abs(corners - corners[0]).max() > BORDER_TOLERANCE:
+        return None
+    return rgba[0, 0].astype(np.int16)
+
+
+def _content(block, background):
+    if background is None:
+        return block[..., 3] >= ALPHA_THRESHOLD
+    packed = np.ascontiguousarray(block).view(np.uint32)[..., 0]
+    exact = packed != background.astype(np.uint8).view(np.uint32)[0]
+    if not exact.any():
+        # Kenar çoğunlukla birebir aynı renktir: tek karşılaştırmada geçilir
+        return exact
+    # Dört kanaldan biri kenar renginden saparsa piksel içeriktir
+    diff = np.abs(block.astype(np.int16) - background)
+    return (diff > BORDER_TOLERANCE).view(np.uint32)[..., 0] != 0
+
+
+def _first(rgba, background, axis, reverse):
+    # Kenardan içeri parça parça taranır; maliyet kırpılan alanla orantılıdır
+    length = rgba.shape[axis]
+    for start in range(0, length, TRIM_CHUNK):
+        stop = min(start + TRIM_CHUNK, length)
+        index = slice(length - stop, length - start) if reverse else slice(start, stop)
+        block = rgba[index] if axis == 0 else rgba[:, index]
+        hits = np.flatnonzero(_content(block, background).any(axis=1 - axis))
+        if hits.size:
+            return length - stop + hits[-1] + 1 if reverse else start + hits[0]
+    return None
+
+
+def trim_box(rgba):
+    # (sol, üst, sağ, alt); görüntü tamamen boşsa tamamı döner
+    height, width = rgba.shape[:2]
+    background = _border_color(rgba)
+    top = _first(rgba, background, 0, False)
+    if top is None:
+        return 0, 0, width, height
+    bottom = _first(rgba, background, 0, True)
+    rows = rgba[top:bottom]
+    left = _first(rows, background, 1, False)
+    right = _first(rows, background, 1, True)
+    return left, top, right, bottom
+
+
+def _resize(rgba, box, target_size):
+    left, top, right, bottom = box
+    image = Image.fromarray(rgba[top:bottom, left:right], 'RGBA')
+    size = fit_size(image.width, image.height, target_size)
+    # Büyük kaynaklar önce kutu filtresiyle hedefin iki katına indirilir
+    factor = min(image.width // (2 * size[0]), image.height // (2 * size[1]))
+    if factor > 1:
+        image = image.reduce(factor)
+    if size != image.size:
+        image = image.resize(size, Image.LANCZOS)
+    return np.asarray(image)
+
+
+def _flatten(rgba):
+    # Eski sistemler saydam BMP'yi desteklemez: beyaz zemine karıştırılır
+    alpha = rgba[..., 3:].astype(np.uint32)
+    rgb = (rgba[..., :3] * alpha + 255 * (255 - alpha) + 127) // 255
+    return rgb.astype(np.uint8)
+
+
+def _exact_palette(pixels, channels):
+    # 256 ya da daha az renk varsa kayıpsız palet: (indeksler, palet) ya da None
+    packed = np.zeros(pixels.shape[:2], dtype=np.uint32)
+    for channel in range(channels):
+        packed |= pixels[..., channel].astype(np.uint32) << (8 * channel)
+    colors, indices = np.unique(packed.ravel(), return_inverse=True)
+    if colors.size > 256:
+        return None
+    palette = np.stack([(colors >> (8 * c)) & 0xFF for c in range(channels)], axis=1).astype(np.uint8)
+    return indices.reshape(pixels.shape[:2]).astype(np.uint8), palette
+
+
+def _palette_image(indices, palette):
+    image = Image.fromarray(indices, 'P')
+    image.putpalette(palette[:, :3].ravel().tolist())
+    if palette.shape[1] == 4 and palette[:, 3].min() < 255:
+        image.info['transparency'] = bytes(palette[:, 3].tolist())
+    return image
+
+
+def _save(image, logo_format):
+    buffer = io.BytesIO()
+    if logo_format == 'PNG':
+        image.save(buffer, 'PNG', optimize=True, transparency=image.info.get('transparency'))
+    else:
+        image.save(buffer, logo_format)
+    return buffer.getvalue()
+
+
+def _encode(rgba, logo_format, colors=None):
+    if logo_format == 'BMP':
+        pixels = _flatten(rgba)
+        exact = None if colors else _exact_palette(pixels, 3)
+        if exact is not None:
+            return _save(_palette_image(*exact), 'BMP')
+        image = Image.fromarray(pixels, 'RGB').quantize(colors or 256, Image.FASTOCTREE)
+        return _save(image, 'BMP')
+
+    opaque = rgba[..., 3].min() == 255
+    pixels = rgba[..., :3] if opaque else rgba
+    if colors:
+        image = Image.fromarray(np.ascontiguousarray(pixels), 'RGB' if opaque else 'RGBA')
+        return _save(image.quantize(colors, Image.FASTOCTREE), 'PNG')
+    exact = _exact_palette(pixels, pixels.shape[2])
+    if exact is not None:
+        return _save(_palette_image(*exact), 'PNG')
+    return _save(Image.fromarray(np.ascontiguousarray(pixels), 'RGB' if opaque else 'RGBA'), 'PNG')
+
+
+def optimize_logo(image, target_size, logo_format, budget=LOGO_BYTE_BUDGET, trim=True):
+    rgba = to_rgba(image)
+    with span('logo.trim'):
+        box = trim_box(rgba) if trim else (0, 0, rgba.shape[1], rgba.shape[0])
+
+    size = target_size
+    while True:
+        with span('logo.scale', size=size):
+            scaled = _resize(rgba, box, size)
+        with span('logo.encode', format=logo_format):
+            data = _encode(scaled, logo_format)
+        if budget is None or len(data) <= budget:
+            return data
+        if logo_format == 'PNG':
+            # Önce renk sayısı, sonra boyut düşürülür
+            data = _encode(scaled, logo_format, colors=256)
+            if len(data) <= budget:
+                return data
+        if size <= MIN_LOGO_SIZE:
+            raise ApplyError(f"logo does not fit in {budget} bytes even at {size} px")
+        size = max(MIN_LOGO_SIZE, int(size * SHRINK_STEP))
@@ -0,0 +1,193 @@
+import os
+import ntpath
+import threading
+
+from wom_core import (ApplyError, ApplyResult, IMAGE_SYSTEM_ROOT, OEM_KEY_PATH, cached_logo, default_backend,
+                      image_paths, is_admin, oem_logo_location, oem_values, pooled_product_key, windows_flags)
+from wom_trace import span
+
+# Uygulama sırayla çalışan adımlardan oluşan bir iştir; arayüz onu iş parçacığında
+# çalıştırır. Her adımın başında ilerleme bildirilir, iptal adımlar arasında
+# denetlenir. Hatalar iletişim kutusu açmaz, rapora toplanır: bir adım hata
+# verirse sonraki adımlar çalışmaz ve sonuç tek seferde gösterilir.
+# Dosya registry'den önce yazılır; registry hiçbir zaman olmayan bir logoyu göstermez.
+# Havuzdan bu işte alınan ürün anahtarı, registry yazılmadan iş biterse (hata ya da
+# iptal) havuza geri döner. image_root verilirse hedef bağlanmış bir imajdır.
+
+STAGES = ('check', 'logo', 'product_key', 'logo_file', 'registry')
+
+
+class ApplyReport:
+    def __init__(self):
+        self.result = None
+        # [(adım, ileti, kod)]; kod, arayüzün çeviri anahtarıdır ya da None
+        self.errors = []
+        self.completed = []
+        self.cancelled = False
+
+    @property
+    def ok(self):
+        return self.result is not None
+
+    def message(self):
+        return "; ".join(message for _, message, _ in self.errors)
+
+
+class ApplyJob:
+    def __init__(self, profile, system_root=None, use_bmp_only=None, dry_run=False, backend=None,
+                 logo_data=None, encode_logo=None, machine=None, image_root=None):
+        # encode_logo(biçim) -> bayt; verilmezse logo dosyadan kodlanır
+        self.profile = profile
+        self.system_root = system_root
+        self.use_bmp_only = use_bmp_only
+        self.dry_run = dry_run
+        self.backend = backend
+        self.logo_data = logo_data
+        self.encode_logo = encode_logo
+        self.machine = machine
+        self.image_root = image_root
+        # logo_file diske yazılan dosya, logo_path registry'deki yol (imajda farklıdır)
+        self.logo_file = None
+        self.logo_path = None
+        self.logo_changed = False
+        self.product_key = None
+        self.key_claimed = False
+        self.values = None
+        self.write = None
+        self._opened_backend = None
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def run(self, progress=None):
+        # progress(adım, sıra, adım sayısı) her adım başlamadan çağrılır
+        report = ApplyReport()
+        try:
+            self._run(report, progress)
+        finally:
+            if not report.ok:
+                self._release_key(report)
+            if self._opened_backend is not None:
+                self._opened_backend.close()
+                self._opened_backend = None
+        return report
+
+    def _run(self, report, progress):
+        for number, stage in enumerate(STAGES):
+            if self.cancelled:
+                report.cancelled = True
+                return
+            if progress is not None:
+                progress(stage, number, len(STAGES))
+            try:
+                with span(f'apply.{stage}'):
+                    getattr(self, '_' + stage)(report)
+            except Exception as e:
+                report.errors.append((stage, str(e), None))
+            if report.errors:
+                return
+            report.completed.append(stage)
+        report.result = ApplyResult(self.values, self.logo_path, self.write.changed, self.dry_run,
+                                    self.logo_changed, self.product_key, self.logo_file)
+
+    def _release_key(self, report):
+        if not self.key_claimed:
+            return
+        from wom_keys import release_product_key
+
+        try:
+            release_product_key(self.profile, self.product_key, self.machine)
+        except Exception as e:
+            report.errors.append(('product_key', str(e), None))
+            return
+        self.key_claimed = False
+        self.product_key = None
+        if 'product_key' in report.completed:
+            report.completed.remove('product_key')
+
+    def _check(self, report):
+        # Tüm ön koşullar birlikte denetlenir; eksikler tek raporda
+        if self.image_root is not None:
+            self._check_image(report)
+            return
+        if self.use_bmp_only is None:
+            self.use_bmp_only = windows_flags()[1]
+        self.system_root = self.system_root or os.environ.get("SystemRoot")
+        if not self.system_root and self.dry_run:
+            # Windows dışında deneme çalıştırması: varsayılan Windows klasörüne göre planla
+            self.system_root = IMAGE_SYSTEM_ROOT
+        if not self.system_root:
+            report.errors.append(('check', "SystemRoot directory not found", 'system_dir_not_found'))
+        if self.backend is None:
+            try:
+                self.backend = default_backend(self.dry_run)
+            except ApplyError as e:
+                report.errors.append(('check', str(e), None))
+                return
+            if not self.dry_run and not is_admin():
+                report.errors.append(('check', "administrator rights are required", 'admin_required_message'))
+
+    def _check_image(self, report):
+        from wom_registry import HiveBackend
+
+        try:
+            self.system_root, hive_path = image_paths(self.image_root)
+        except ApplyError as e:
+            report.errors.append(('check', str(e), None))
+            return
+        # İmajın Windows sürümü bilinmez; BMP yalnızca istenirse
+        if self.use_bmp_only is None:
+            self.use_bmp_only = False
+        # İmaj için makine adı verilmezse imajın yolu kullanılır
+        if self.machine is None:
+            self.machine = os.path.abspath(self.image_root)
+        if self.backend is None:
+            self.backend = self._opened_backend = HiveBackend(hive_path)
+
+    def _logo(self, report):
+        if not self.profile.get('logo'):
+            self.logo_data = None
+            return
+        oem_path, logo_name, logo_format = oem_logo_location(self.system_root, self.use_bmp_only)
+        self.logo_file = os.path.join(oem_path, logo_name)
+        if ntpath.splitdrive(self.system_root)[0]:
+            # Windows dışında varsayılan Windows klasörüne planlanan yol
+            self.logo_file = self.logo_file.replace('/', '\\')
+        if self.image_root is None:
+            self.logo_path = self.logo_file
+        else:
+            # Registry'ye imajın kendi açılış yolu yazılır
+            self.logo_path = ntpath.join(IMAGE_SYSTEM_ROOT, "System32", "oobe", "info", logo_name)
+        if isinstance(self.logo_data, dict):
+            self.logo_data = self.logo_data.get(logo_format)
+        if self.logo_data is None:
+            if self.encode_logo is not None:
+                self.logo_data = self.encode_logo(logo_format)
+            else:
+                self.logo_data = cached_logo(self.profile['logo'], self.profile['logo_size'], logo_format)
+
+    def _product_key(self, report):
+        # Havuz boşsa hiçbir şey yazılmadan durulur
+        self.product_key, self.key_claimed = pooled_product_key(self.profile, self.machine, self.dry_run)
+
+    def _logo_file(self, report):
+        from wom_store import same_content, write_if_changed
+
+        if self.logo_data is None:
+            return
+        # Yerleşik dosya aynı baytlara sahipse yeniden yazılmaz
+        if self.dry_run:
+            self.logo_changed = not same_content(self.logo_file, self.logo_data)
+        else:
+            self.logo_changed = write_if_changed(self.logo_file, self.logo_data)
+
+    def _registry(self, report):
+        from wom_registry import apply_values
+
+        self.values = oem_values(self.profile, self.logo_path)
+        self.write = apply_values(self.backend, OEM_KEY_PATH, self.values, dry_run=self.dry_run)
@@ -0,0 +1,414 @@
+import os
+import threading
+from types import MappingProxyType
+
+from wom_trace import span
+from wom_hive import REG_SZ, REG_MULTI_SZ
+
+# Registry erişimi bir arka uç üzerinden yapılır: canlı sistem (winreg),
+# çevrimdışı hive dosyası ya da test/ölçüm için bellek içi sözlük.
+# Değerler her yerde {ad: (tip, değer)} biçimindedir.
+
+
+class RegistryBackend:
+    def read_values(self, key_path):
+        # Anahtarın tüm değerleri tek bir numaralandırmada okunur
+        raise NotImplementedError
+
+    def write_values(self, key_path, values):
+        # Tüm değerler tek bir açık anahtar üzerinden yazılır
+        raise NotImplementedError
+
+    def delete_values(self, key_path, names):
+        # Olmayan değerler yok sayılır
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class WinRegBackend(RegistryBackend):
+    def __init__(self, root=None):
+        import winreg
+        self.winreg = winreg
+        self.root = winreg.HKEY_LOCAL_MACHINE if root is None else root
+
+    def read_values(self, key_path):
+        winreg = self.winreg
+        try:
+            key = winreg.OpenKey(self.root, key_path, 0, winreg.KEY_READ)
+        except FileNotFoundError:
+            return {}
+        values = {}
+        try:
+            index = 0
+            while True:
+                try:
+                    name, value, value_type = winreg.EnumValue(key, index)
+                except OSError:
+                    break
+                values[name] = (value_type, value)
+                index += 1
+        finally:
+            winreg.CloseKey(key)
+        return values
+
+    def write_values(self, key_path, values):
+        winreg = self.winreg
+        key = winreg.CreateKeyEx(self.root, key_path, 0, winreg.KEY_WRITE)
+        try:
+            for name, (value_type, value) in values.items():
+                winreg.SetValueEx(key, name, 0, value_type, value)
+        finally:
+            winreg.CloseKey(key)
+
+    def delete_values(self, key_path, names):
+        winreg = self.winreg
+        try:
+            key = winreg.OpenKey(self.root, key_path, 0, winreg.KEY_SET_VALUE)
+        except FileNotFoundError:
+            return
+        try:
+            for name in names:
+                try:
+                    winreg.DeleteValue(key, name)
+                except FileNotFoundError:
+                    pass
+        finally:
+            winreg.CloseKey(key)
+
+
+class HiveBackend(RegistryBackend):
+    # root: hive'ın bağlandığı anahtar (SOFTWARE hive'ı için "SOFTWARE")
+    def __init__(self, hive_path, root='SOFTWARE'):
+        self.hive_path = hive_path
+        self.root = root
+        self.hive = None
+
+    def _relative(self, key_path):
+        prefix = self.root + '\\'
+        if key_path.upper().startswith(prefix.upper()):
+            return key_path[len(prefix):]
+        return key_path
+
+    def _open(self, writable=False):
+        import wom_hive
+        if self.hive is not None and writable and not self.hive.writable:
+            self.hive.close()
+            self.hive = None
+        if self.hive is None:
+            self.hive = wom_hive.Hive(self.hive_path, writable=writable)
+        return self.hive
+
+    def read_values(self, key_path):
+        key = self._open().key(self._relative(key_path))
+        return key.values() if key is not None else {}
+
+    def write_values(self, key_path, values):
+        hive = self._open(writable=True)
+        key = hive.create_key(self._relative(key_path))
+        for name, (value_type, value) in values.items():
+            hive.set_value(key, name, value_type, value)
+
+    def delete_values(self, key_path, names):
+        hive = self._open(writable=True)
+        key = hive.key(self._relative(key_path))
+        if key is not None:
+            for name in names:
+                hive.delete_value(key, name)
+
+    def close(self):
+        if self.hive is not None:
+            self.hive.close()
+            self.hive = None
+
+
+class MemoryBackend(RegistryBackend):
+    def __init__(self, keys=None):
+        self.keys = {}
+        for key_path, values in (keys or {}).items():
+            self.keys[key_path.upper()] = dict(values)
+        self.reads = 0
+        self.writes = 0
+        self.write_batches = 0
+
+    def read_values(self, key_path):
+        self.reads += 1
+        return dict(self.keys.get(key_path.upper(), {}))
+
+    def write_values(self, key_path, values):
+        self.write_batches += 1
+        self.writes += len(values)
+        self.keys.setdefault(key_path.upper(), {}).update(values)
+
+    def delete_values(self, key_path, names):
+        values = self.keys.get(key_path.upper(), {})
+        wanted = {name.upper() for name in names}
+        for name in [name for name in values if name.upper() in wanted]:
+            del values[name]
+
+
+def _same(current, desired):
+    if current is None:
+        return False
+    current_type, current_value = current
+    desired_type, desired_value = desired
+    if current_type != desired_type:
+        return False
+    if desired_type == REG_MULTI_SZ:
+        return list(current_value) == list(desired_value)
+    return current_value == desired_value
+
+
+def diff_values(current, desired):
+    # Registry değer adları büyük/küçük harf duyarsızdır
+    by_name = {name.upper(): value for name, value in current.items()}
+    return {name: value for name, value in desired.items()
+            if not _same(by_name.get(name.upper()), value)}
+
+
+class WriteResult:
+    def __init__(self, key_path, changed, unchanged):
+        self.key_path = key_path
+        self.changed = changed
+        self.unchanged = unchanged
+
+    @property
+    def noop(self):
+        return not self.changed
+
+
+class RegistryTransaction:
+    def __init__(self, backend, key_path):
+        self.backend = backend
+        self.key_path = key_path
+        self.desired = {}
+
+    def set(self, name, value, value_type=REG_SZ):
+        self.desired[name] = (value_type, value)
+
+    def update(self, values, value_type=REG_SZ):
+        for name, value in values.items():
+            self.set(name, value, value_type)
+
+    def plan(self):
+        current = self.backend.read_values(self.key_path)
+        return current, diff_values(current, self.desired)
+
+    def commit(self, dry_run=False):
+        with span('registry.read', key=self.key_path):
+            current, changes = self.plan()
+        unchanged = [name for name in self.desired if name not in changes]
+        if changes and not dry_run:
+            try:
+                with span('registry.write', values=len(changes)):
+                    self.backend.write_values(self.key_path, changes)
+            except Exception:
+                # Yarım kalan yazımı geri al: önceden var olan değerler eski haline döner,
+                # işlemin oluşturduğu değerler silinir
+                by_name = {name.upper(): (name, value) for name, value in current.items()}
+                previous = dict(by_name[name.upper()] for name in changes if name.upper() in by_name)
+                created = [name for name in changes if name.upper() not in by_name]
+                try:
+                    if previous:
+                        self.backend.write_values(self.key_path, previous)
+                    if created:
+                        self.backend.delete_values(self.key_path, created)
+                except Exception:
+                    pass
+                raise
+        return WriteResult(self.key_path, changes, unchanged)
+
+
+def apply_values(backend, key_path, values, value_type=REG_SZ, dry_run=False):
+    transaction = RegistryTransaction(backend, key_path)
+    transaction.update(values, value_type)
+    return transaction.commit(dry_run=dry_run)
+
+
+class RegistrySnapshot:
+    # Anahtarların tüm değerleri tek numaralandırmada okunmuş, değişmez görüntü.
+    # Anahtar ve değer adları büyük/küçük harf duyarsız aranır.
+    __slots__ = ('_keys',)
+
+    def __init__(self, keys):
+        self._keys = MappingProxyType({
+            key_path.upper(): MappingProxyType({name.upper(): (name, value_type, value)
+                                                for name, (value_type, value) in values.items()})
+            for key_path, values in keys.items()})
+
+    def get(self, key_path, name, default=None):
+        entry = self._keys.get(key_path.upper(), {}).get(name.upper())
+        return default if entry is None else entry[2]
+
+    def values(self, key_path):
+        return {name: (value_type, value)
+                for name, value_type, value in self._keys.get(key_path.upper(), {}).values()}
+
+    def changes(self, other):
+        # Bu görüntüden other'a değişen (anahtar, değer adı) çiftleri, büyük harfle
+        changed = set()
+        for key_path in set(self._keys) | set(other._keys):
+            mine = self._keys.get(key_path, {})
+            theirs = other._keys.get(key_path, {})
+            for name in set(mine) | set(theirs):
+                a, b = mine.get(name), theirs.get(name)
+                if a is None or b is None or a[1:] != b[1:]:
+                    changed.add((key_path, name))
+        return frozenset(changed)
+
+    def updated(self, key_path, values=None, deleted=()):
+        # Yazılan ve silinen değerler işlenmiş yeni görüntü
+        keys = {path: self.values(path) for path in self._keys}
+        current = keys.setdefault(key_path.upper(), {})
+        replaced = {name.upper() for name in list(values or ()) + list(deleted)}
+        for name in [name for name in current if name.upper() in replaced]:
+            del current[name]
+        current.update(values or {})
+        return RegistrySnapshot(keys)
+
+    def __contains__(self, key_path):
+        return key_path.upper() in self._keys
+
+    def __eq__(self, other):
+        return isinstance(other, RegistrySnapshot) and not self.changes(other)
+
+    __hash__ = None
+
+
+def read_snapshot(backend, key_paths):
+    with span('registry.snapshot', keys=len(key_paths)):
+        return RegistrySnapshot({key_path: backend.read_values(key_path) for key_path in key_paths})
+
+
+class SnapshotBackend(RegistryBackend):
+    # Görüntüdeki anahtarlar registry'ye gitmeden görüntüden okunur; yazımlar alttaki
+    # arka uca gider ve snapshot yazılanlarla güncellenir
+    def __init__(self, backend, snapshot):
+        self.backend = backend
+        self.snapshot = snapshot
+
+    def read_values(self, key_path):
+        if key_path in self.snapshot:
+            return self.snapshot.values(key_path)
+        return self.backend.read_values(key_path)
+
+    def write_values(self, key_path, values):
+        self.backend.write_values(key_path, values)
+        self.snapshot = self.snapshot.updated(key_path, values)
+
+    def delete_values(self, key_path, names):
+        self.backend.delete_values(key_path, names)
+        self.snapshot = self.snapshot.updated(key_path, deleted=names)
+
+
+class RegistryWatcher:
+    # Anahtarlar değiştiğinde callback(yeni_görüntü, değişenler) arka plan
+    # iş parçacığından çağrılır. Windows'ta RegNotifyChangeKeyValue beklenir;
+    # diğer arka uçlarda (hive, bellek) belirli aralıklarla yeniden okunur.
+    REG_NOTIFY_CHANGE_NAME = 0x1
+    REG_NOTIFY_CHANGE_LAST_SET = 0x4
+
+    def __init__(self, backend, key_paths, callback, snapshot=None, interval=2.0):
+        self.backend = backend
+        self.key_paths = tuple(key_paths)
+        self.callback = callback
+        self.snapshot = snapshot
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._wake = None
+
+    def start(self):
+        if self.snapshot is None:
+            self.snapshot = read_snapshot(self.backend, self.key_paths)
+        self._thread = threading.Thread(target=self._run, name='RegistryWatcher', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        wake = self._wake
+        if wake is not None:
+            wake()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def check(self):
+        # Yeni görüntü okunur; yalnızca fark varsa bildirilir
+        snapshot = read_snapshot(self.backend, self.key_paths)
+        changed = self.snapshot.changes(snapshot)
+        self.snapshot = snapshot
+        if changed:
+            self.callback(snapshot, changed)
+        return changed
+
+    def _run(self):
+        try:
+            if isinstance(self.backend, WinRegBackend) and os.name == 'nt' and self._watch_native():
+                return
+        except OSError:
+            pass
+        while not self._stop.wait(self.interval):
+            self._safe_check()
+
+    def _safe_check(self):
+        try:
+            self.check()
+        except Exception as e:
+            print(f"Registry izlenirken hata: {str(e)}")
+
+    def _watch_native(self):
+        import ctypes
+        from ctypes import wintypes
+
+        winreg = self.backend.winreg
+        advapi32 = ctypes.WinDLL('advapi32')
+        kernel32 = ctypes.WinDLL('kernel32')
+        kernel32.CreateEventW.restype = wintypes.HANDLE
+        filter_ = self.REG_NOTIFY_CHANGE_NAME | self.REG_NOTIFY_CHANGE_LAST_SET
+
+        keys = []
+        try:
+            for key_path in self.key_paths:
+                # Olmayan bir anahtar bildirimle izlenemez: yoklamaya dönülür
+                try:
+                    keys.append(winreg.OpenKey(self.backend.root, key_path, 0, winreg.KEY_NOTIFY))
+                except OSError:
+                    return False
+            events = [kernel32.CreateEventW(None, False, False, None) for _ in keys]
+            stop_event = kernel32.CreateEventW(None, True, False, None)
+            handles = (wintypes.HANDLE * (len(events) + 1))(*events, stop_event)
+            self._wake = lambda: kernel32.SetEvent(wintypes.HANDLE(stop_event))
+            if self._stop.is_set():
+                self._wake()
+
+            def arm(index):
+                advapi32.RegNotifyChangeKeyValue(wintypes.HANDLE(keys[index].handle), False, filter_,
+                                                 wintypes.HANDLE(events[index]), True)
+            try:
+                for index in range(len(keys)):
+                    arm(index)
+                while True:
+                    index = kernel32.WaitForMultipleObjects(len(handles), handles, False, 0xFFFFFFFF)
+                    if not 0 <= index < len(events) or self._stop.is_set():
+                        break
+                    # Bildirim tek seferliktir: yalnızca tetiklenen anahtar yeniden kurulur
+                    arm(index)
+                    self._safe_check()
+            finally:
+                self._wake = None
+                for handle in events + [stop_event]:
+                    kernel32.CloseHandle(wintypes.HANDLE(handle))
+            # Bekleme başarısız olduysa yoklamayla devam edilir
+            return self._stop.is_set()
+        finally:
+            for key in keys:
+                winreg.CloseKey(key)
@@ -0,0 +1,40 @@
+import os
+import sys
+import time
+
+import wom_trace
+
+# Açılış süresi ölçümü: süreç başından itibaren işaretlenen aşamalar.
+# WOM_STARTUP_REPORT=1 ile rapor stderr'e yazılır.
+
+_origin = time.perf_counter()
+_marks = []
+
+
+def mark(name):
+    _marks.append((name, time.perf_counter() - _origin))
+    wom_trace.instant('startup.' + name)
+
+
+def marks():
+    return list(_marks)
+
+
+def report():
+    lines = []
+    previous = 0.0
+    for name, elapsed in _marks:
+        lines.append(f"{name:<20} {elapsed * 1000:8.1f} ms  (+{(elapsed - previous) * 1000:.1f} ms)")
+        previous = elapsed
+    return "\n".join(lines)
+
+
+def enabled():
+    return os.environ.get('WOM_STARTUP_REPORT', '') not in ('', '0')
+
+
+def finish(name='interactive'):
+    mark(name)
+    if enabled():
+        print("WOM startup timing:", file=sys.stderr)
+        print(report(), file=sys.stderr)
@@ -0,0 +1,194 @@
+import os
+import hashlib
+import threading
+
+# İçerik adresli logo deposu: kodlanmış logolar kaynak dosyanın özeti, hedef
+# boyut ve format ile anahtarlanır. Aynı logoyu paylaşan profiller ve tekrar
+# eden uygulamalar yeniden kodlama yapmaz. Hedef işletim sistemi çıktıyı
+# yalnızca format üzerinden etkiler (eski sistemler için BMP).
+
+# Kodlayıcı çıktısı değiştiğinde artırılır; eski kayıtlar kullanılmaz
+ENCODER_VERSION = 1
+HASH_CHUNK = 1024 * 1024
+# Depo bu boyutu aşınca en uzun süredir kullanılmayan kayıtlar silinir
+MAX_STORE_BYTES = 64 * 1024 * 1024
+# Boyut denetimi ilk yazımda ve her PRUNE_INTERVAL yazımda bir yapılır
+PRUNE_INTERVAL = 32
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def data_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def same_content(path, data):
+    # Önce boyut, eşitse özet karşılaştırılır
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        return file_digest(path) == data_digest(data)
+    except OSError:
+        return False
+
+
+def write_atomic(path, data):
+    # Aynı klasörde geçici dosya ve yer değiştirme: yarıda kalan yazım eski dosyayı bozmaz
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_if_changed(path, data):
+    # Dosya aynı içerikteyse dokunulmaz; dönüş: yazıldı mı
+    if same_content(path, data):
+        return False
+    write_atomic(path, data)
+    return True
+
+
+class LogoStore:
+    def __init__(self, directory, max_bytes=MAX_STORE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._writes = 0
+        self._sources = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def source_digest(self, path):
+        # Kaynak özeti (yol, mtime, boyut) değişmedikçe yeniden hesaplanmaz
+        st = os.stat(path)
+        key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+        digest = self._sources.get(key)
+        if digest is None:
+            digest = file_digest(path)
+            with self._lock:
+                self._sources[key] = digest
+        return digest
+
+    def key(self, source, target_size, logo_format):
+        text = f"{self.source_digest(source)}:{target_size}:{logo_format}:{ENCODER_VERSION}"
+        return hashlib.sha256(text.encode('ascii')).hexdigest()
+
+    def path_for(self, key, logo_format):
+        return os.path.join(self.directory, key[:2], f"{key}.{logo_format.lower()}")
+
+    def get(self, source, target_size, logo_format, encode=None):
+        # encode: kayıt yoksa çağrılır ve bayt döndürür (varsayılan: encode_logo)
+        path = self.path_for(self.key(source, target_size, logo_format), logo_format)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = None
+        # Sayaçlar işçi iş parçacıklarından artırılır
+        with self._lock:
+            if data is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if data is not None:
+            self._touch(path)
+            return data
+
+        if encode is None:
+            from wom_core import encode_logo
+            data = encode_logo(source, target_size, logo_format)
+        else:
+            data = encode()
+        self.put(path, data)
+        return data
+
+    def put(self, path, data):
+        # Eş zamanlı işçiler aynı kaydı yazabilir: geçici dosya ve atomik yer değiştirme
+        try:
+            write_atomic(path, data)
+        except OSError:
+            # Depo yazılamıyorsa kodlanmış veri yine de kullanılır
+            return
+        with self._lock:
+            prune = self._writes % PRUNE_INTERVAL == 0
+            self._writes += 1
+        if prune:
+            self.prune()
+
+    def _touch(self, path):
+        # Değişiklik zamanı son kullanım olarak tutulur
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def entries(self):
+        # [(son kullanım, boyut, yol)]
+        entries = []
+        try:
+            shards = os.scandir(self.directory)
+        except OSError:
+            return entries
+        with shards:
+            for shard in shards:
+                if not shard.is_dir():
+                    continue
+                with os.scandir(shard.path) as files:
+                    for entry in files:
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        entries.append((st.st_mtime_ns, st.st_size, entry.path))
+        return entries
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def prune(self, max_bytes=None):
+        # En eski kullanılanlar, toplam boyut sınırın altına inene kadar silinir; dönüş: silinen sayısı
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+
+def default_store_path():
+    base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+    return os.path.join(base, 'WOM', 'logos')
+
+
+_default_store = None
+
+
+def logo_store():
+    global _default_store
+    if _default_store is None:
+        _default_store = LogoStore(default_store_path())
+    return _default_store
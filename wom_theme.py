@@ -0,0 +1,115 @@
+from PyQt5.QtGui import QPalette, QColor
+from PyQt5.QtCore import Qt
+
+# Koyu tema: renkler palete, palette ifade edilemeyen kenarlık ve boşluklar
+# uygulama düzeyinde tek bir stil sayfasına konur. Stil sayfası widget'lar
+# oluşturulmadan bir kez ayrıştırılır; durum değişiklikleri (sürükleme vurgusu)
+# yeni stil sayfası yerine dinamik özellik ile yapılır.
+
+ACCENT = QColor(42, 130, 218)
+
+PALETTE_COLORS = {
+    QPalette.Window: QColor(0x2b, 0x2b, 0x2b),
+    QPalette.WindowText: Qt.white,
+    QPalette.Base: QColor(0x33, 0x33, 0x33),
+    QPalette.AlternateBase: QColor(53, 53, 53),
+    QPalette.ToolTipBase: QColor(0x2b, 0x2b, 0x2b),
+    QPalette.ToolTipText: Qt.white,
+    QPalette.Text: Qt.white,
+    QPalette.Button: QColor(0x40, 0x40, 0x40),
+    QPalette.ButtonText: Qt.white,
+    QPalette.BrightText: Qt.red,
+    QPalette.Link: ACCENT,
+    QPalette.Highlight: ACCENT,
+    QPalette.HighlightedText: Qt.black,
+}
+
+# Genel "QWidget" seçicisi bilinçli olarak yok: her widget için kural eşleştirmesi gerektirir
+STYLESHEET = """
+QGroupBox {
+    border: 1px solid #3b3b3b;
+    margin-top: 1em;
+    padding-top: 0.5em;
+}
+QPushButton {
+    background-color: #404040;
+    border: 1px solid #505050;
+    padding: 5px 15px;
+}
+QPushButton:hover {
+    background-color: #505050;
+}
+QLineEdit, QComboBox, QSpinBox {
+    background-color: #333333;
+    border: 1px solid #505050;
+    padding: 3px;
+}
+QLineEdit[invalid="true"] {
+    border: 1px solid #D9534F;
+}
+QTabWidget::pane {
+    border: 1px solid #505050;
+}
+QTabBar::tab {
+    background-color: #333333;
+    padding: 8px 20px;
+}
+QTabBar::tab:selected {
+    background-color: #404040;
+}
+QLabel#logoPreview {
+    border: 1px solid #505050;
+    background-color: #1b1b1b;
+    color: #666666;
+    font-style: italic;
+}
+QLabel#logoPreview[dragHover="true"] {
+    border: 2px dashed #0078D4;
+    color: #0078D4;
+}
+QLabel#aboutLabel {
+    background-color: #1e1e1e;
+    padding: 20px;
+    border-radius: 10px;
+}
+"""
+
+_palette = None
+
+
+def palette():
+    global _palette
+    if _palette is None:
+        _palette = QPalette()
+        for role, color in PALETTE_COLORS.items():
+            _palette.setColor(role, QColor(color))
+    return _palette
+
+
+def apply(app):
+    # Aynı uygulamaya ikinci kez uygulanmaz; stil sayfası yeniden ayrıştırılmaz
+    if app.property('womTheme'):
+        return
+    app.setStyle("Fusion")
+    app.setPalette(palette())
+    app.setStyleSheet(STYLESHEET)
+    app.setProperty('womTheme', True)
+
+
+def set_drag_hover(widget, hover):
+    _set_state(widget, 'dragHover', hover)
+
+
+def set_invalid(widget, invalid):
+    _set_state(widget, 'invalid', invalid)
+
+
+def _set_state(widget, name, value):
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    # Yalnızca bu widget yeniden cilalanır
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()
@@ -0,0 +1,178 @@
+import os
+import sys
+import time
+import atexit
+import threading
+
+# Aşama izleme: uygulama ve yükleme adımlarının süreleri Chrome trace-event
+# JSON'u olarak yazılır (chrome://tracing ya da ui.perfetto.dev ile açılır).
+# WOM_TRACE=1 (varsayılan konum) ya da WOM_TRACE=<dosya.json> ile açılır;
+# kapalıyken span() paylaşılan boş bir nesne döndürür.
+
+_events = None
+_threads = {}
+_path = None
+_origin = time.perf_counter()
+_pid = os.getpid()
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    __slots__ = ('name', 'args', 'start')
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        _record('X', self.name, self.start, end - self.start, self.args)
+        return False
+
+    def set(self, **args):
+        self.args.update(args)
+
+
+def _record(phase, name, start, duration, args):
+    events = _events
+    if events is None:
+        return
+    tid = threading.get_ident()
+    if tid not in _threads:
+        _threads[tid] = threading.current_thread().name
+    event = {'name': name, 'ph': phase, 'pid': _pid, 'tid': tid,
+             'ts': round((start - _origin) * 1e6, 1)}
+    if phase == 'X':
+        event['dur'] = round(duration * 1e6, 1)
+    else:
+        event['s'] = 't'
+    if args:
+        event['args'] = args
+    events.append(event)
+
+
+def enabled():
+    return _events is not None
+
+
+def span(name, **args):
+    if _events is None:
+        return _NULL_SPAN
+    return Span(name, args)
+
+
+def instant(name, **args):
+    if _events is not None:
+        _record('i', name, time.perf_counter(), 0, args)
+
+
+def traced(name):
+    # Metot/fonksiyonun tamamını tek bir aşama olarak kaydeder
+    def decorate(function):
+        def wrapper(*args, **kwargs):
+            if _events is None:
+                return function(*args, **kwargs)
+            with Span(name, {}):
+                return function(*args, **kwargs)
+        wrapper.__name__ = function.__name__
+        wrapper.__doc__ = function.__doc__
+        return wrapper
+    return decorate
+
+
+def default_trace_path():
+    base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    return os.path.join(base, 'WOM', 'traces', f"wom-{stamp}-{_pid}.json")
+
+
+def enable(path=None):
+    global _events, _path
+    if _events is None:
+        _events = []
+        atexit.register(finish)
+    _path = path or _path or default_trace_path()
+    return _path
+
+
+def events():
+    return list(_events or ())
+
+
+def trace_document():
+    metadata = [{'name': 'process_name', 'ph': 'M', 'pid': _pid, 'args': {'name': 'WOM'}}]
+    metadata += [{'name': 'thread_name', 'ph': 'M', 'pid': _pid, 'tid': tid, 'args': {'name': name}}
+                 for tid, name in list(_threads.items())]
+    return {'traceEvents': metadata + events(), 'displayTimeUnit': 'ms'}
+
+
+def summary():
+    # Aşama başına çağrı sayısı, toplam ve en uzun süre
+    totals = {}
+    for event in events():
+        if event['ph'] != 'X':
+            continue
+        count, total, longest = totals.get(event['name'], (0, 0.0, 0.0))
+        totals[event['name']] = (count + 1, total + event['dur'], max(longest, event['dur']))
+    lines = [f"{'stage':<32} {'calls':>6} {'total ms':>10} {'max ms':>10}"]
+    for name, (count, total, longest) in sorted(totals.items(), key=lambda item: -item[1][1]):
+        lines.append(f"{name:<32} {count:>6} {total / 1000:>10.2f} {longest / 1000:>10.2f}")
+    return "\n".join(lines)
+
+
+def write(path=None):
+    import json
+
+    path = path or _path or default_trace_path()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(trace_document(), f, separators=(',', ':'))
+    with open(os.path.splitext(path)[0] + '.txt', 'w', encoding='utf-8') as f:
+        f.write(summary() + "\n")
+    return path
+
+
+def finish():
+    if not _events:
+        return None
+    try:
+        path = write()
+    except OSError as e:
+        if sys.stderr is not None:
+            print(f"WOM trace could not be written: {e}", file=sys.stderr)
+        return None
+    if sys.stderr is not None:
+        print(f"WOM trace written to {path}", file=sys.stderr)
+        print(summary(), file=sys.stderr)
+    return path
+
+
+def _enable_from_environment():
+    value = os.environ.get('WOM_TRACE', '')
+    if value in ('', '0'):
+        return
+    enable(None if value == '1' else value)
+
+
+_enable_from_environment()
@@ -0,0 +1,341 @@
+import os
+import re
+import csv
+import time
+import zipfile
+
+from wom_core import oem_logo_location, pool_reference
+
+# Makine başına cevap dosyası (autounattend.xml) üretimi. Şablon bir kez
+# derlenir: profil değerleri derlemede yerleştirilir, makineye göre değişen
+# alanlar (CSV sütunları) sabit metin parçaları arasında boşluk olarak kalır.
+# Satırlar CSV'den akış hâlinde okunur ve her dosya birleştirilip hemen yazılır;
+# satır başına şablon ayrıştırılmaz, DOM kurulmaz, bellek kullanımı sabittir.
+
+# {{ad}}: XML'e kaçışlanarak yazılır; {{!ad}}: hazır XML parçası
+# (product_key_element gibi parçalar makine alanından satır başına üretilir)
+PLACEHOLDER = re.compile(r'\{\{(!?)(\w+)\}\}')
+
+ARCHITECTURES = ('amd64', 'x86', 'arm64')
+# wom_wim mimari adlarının cevap dosyası karşılıkları
+WIM_ARCHITECTURES = {'x64': 'amd64', 'x86': 'x86', 'arm64': 'arm64'}
+PROGRESS_INTERVAL = 5000
+
+# Makine alanları; CSV başlıkları küçük harfe çevrilip bu adlara eşlenir
+MACHINE_ALIASES = {
+    'serial_number': 'serial',
+    'serialnumber': 'serial',
+    'name': 'computer_name',
+    'hostname': 'computer_name',
+    'computername': 'computer_name',
+    'key': 'product_key',
+    'productkey': 'product_key',
+    'registered_owner': 'owner',
+}
+MACHINE_FIELDS = ('serial', 'computer_name', 'owner', 'organization', 'product_key')
+
+COMPONENT = ('processorArchitecture="{{arch}}" publicKeyToken="31bf3856ad364e35" '
+             'language="neutral" versionScope="nonSxS"')
+
+DEFAULT_TEMPLATE = """<?xml version="1.0" encoding="utf-8"?>
+<unattend xmlns="urn:schemas-microsoft-com:unattend">
+    <settings pass="windowsPE">
+        <component name="Microsoft-Windows-Setup" {component}>
+            <UserData>
+{{{{!product_key_element}}}}                <AcceptEula>{{{{accept_eula}}}}</AcceptEula>
+                <FullName>{{{{owner}}}}</FullName>
+                <Organization>{{{{organization}}}}</Organization>
+            </UserData>
+{{{{!image_install}}}}        </component>
+    </settings>
+    <settings pass="specialize">
+        <component name="Microsoft-Windows-Shell-Setup" {component}>
+            <ComputerName>{{{{computer_name}}}}</ComputerName>
+            <RegisteredOwner>{{{{owner}}}}</RegisteredOwner>
+            <RegisteredOrganization>{{{{organization}}}}</RegisteredOrganization>
+            <OEMInformation>
+                <Manufacturer>{{{{manufacturer}}}}</Manufacturer>
+                <Model>{{{{model}}}}</Model>
+                <SupportHours>{{{{support_hours}}}}</SupportHours>
+                <SupportPhone>{{{{support_phone}}}}</SupportPhone>
+                <SupportURL>{{{{support_url}}}}</SupportURL>
+{{{{!oem_logo}}}}            </OEMInformation>
+        </component>
+        <component name="Microsoft-Windows-Security-SPP-UX" {component}>
+            <SkipAutoActivation>{{{{skip_auto_activation}}}}</SkipAutoActivation>
+        </component>
+    </settings>
+    <settings pass="oobeSystem">
+        <component name="Microsoft-Windows-Shell-Setup" {component}>
+            <OOBE>
+                <HideEULAPage>{{{{accept_eula}}}}</HideEULAPage>
+                <ProtectYourPC>{{{{protect_your_pc}}}}</ProtectYourPC>
+            </OOBE>
+            <RegisteredOwner>{{{{owner}}}}</RegisteredOwner>
+            <RegisteredOrganization>{{{{organization}}}}</RegisteredOrganization>
+        </component>
+    </settings>
+</unattend>
+""".format(component=COMPONENT)
+
+IMAGE_INSTALL = """            <ImageInstall>
+                <OSImage>
+                    <InstallFrom>
+                        <MetaData>
+                            <Key>/IMAGE/INDEX</Key>
+                            <Value>{index}</Value>
+                        </MetaData>
+                    </InstallFrom>
+                </OSImage>
+            </ImageInstall>
+"""
+
+# Boş <Key> kurulumda geçersiz anahtar sayılır; anahtar yoksa öğe hiç yazılmaz
+PRODUCT_KEY_ELEMENT = """                <ProductKey>
+                    <Key>{key}</Key>
+                    <WillShowUI>OnError</WillShowUI>
+                </ProductKey>
+"""
+
+_ESCAPES = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+_INVALID_NAME = re.compile(r'[^A-Za-z0-9-]')
+_INVALID_FILE = re.compile(r'[^\w.-]')
+
+
+class UnattendError(Exception):
+    pass
+
+
+def escape(value):
+    return str(value).translate(_ESCAPES)
+
+
+def product_key_element(key):
+    return PRODUCT_KEY_ELEMENT.format(key=escape(key)) if key else ''
+
+
+# Makineye göre değişen hazır parçalar: {{!ad}} -> (kaynak makine alanı, üretici)
+FRAGMENTS = {'product_key_element': ('product_key', product_key_element)}
+
+
+def computer_name(serial):
+    # NetBIOS adı: en fazla 15 karakter, harf/rakam/tire; boşsa Windows rastgele ad verir
+    return _INVALID_NAME.sub('', serial)[:15] or '*'
+
+
+def profile_values(profile, arch='amd64', use_bmp_only=False):
+    # Şablon yer tutucularının profil karşılıkları
+    if arch not in ARCHITECTURES:
+        raise UnattendError(f"unknown architecture {arch!r}; expected one of {', '.join(ARCHITECTURES)}")
+    values = {name: str(profile.get(name) or '') for name in
+              ('manufacturer', 'model', 'support_hours', 'support_url', 'support_phone',
+               'owner', 'organization', 'product_key')}
+    if pool_reference(values['product_key']) is not None:
+        # Havuz başvurusu XML'e yazılmaz; anahtar makine başına atanır
+        values['product_key'] = ''
+    values.update({
+        'arch': arch,
+        'computer_name': '*',
+        'serial': '',
+        'accept_eula': 'true' if profile.get('skip_eula') else 'false',
+        'skip_auto_activation': 'false' if profile.get('auto_activate') else 'true',
+        'protect_your_pc': '1' if profile.get('auto_updates') else '3',
+        'image_install': IMAGE_INSTALL.format(index=profile['image_index']) if profile.get('image_index') else '',
+        'oem_logo': '',
+        'product_key_element': product_key_element(values['product_key']),
+    })
+    if profile.get('logo'):
+        # Logo dosyası imaja wom apply --image ile yazılır; burada yalnızca yolu
+        oem_path, logo_name, _ = oem_logo_location('%SystemRoot%', use_bmp_only)
+        logo_path = os.path.join(oem_path, logo_name).replace('/', '\\')
+        values['oem_logo'] = f"                <Logo>{escape(logo_path)}</Logo>\n"
+    return values
+
+
+class CompiledTemplate:
+    def __init__(self, template, values, machine_fields=()):
+        # Sabit parçalar ile makine alanları sırayla: [metin, alan, metin, alan, ..., metin];
+        # her alan (kaynak makine alanı, biçimleyici) çiftidir
+        pieces = []
+        fields = []
+        literal = []
+        unknown = set()
+        position = 0
+        for match in PLACEHOLDER.finditer(template):
+            literal.append(template[position:match.start()])
+            position = match.end()
+            raw, name = match.groups()
+            if name in machine_fields and not raw:
+                pieces.append(''.join(literal))
+                literal = []
+                fields.append((name, escape))
+            elif raw and name in FRAGMENTS and FRAGMENTS[name][0] in machine_fields:
+                pieces.append(''.join(literal))
+                literal = []
+                fields.append(FRAGMENTS[name])
+            elif name in values:
+                literal.append(values[name] if raw else escape(values[name]))
+            else:
+                unknown.add(name)
+        literal.append(template[position:])
+        pieces.append(''.join(literal))
+        if unknown:
+            raise UnattendError(f"unknown template field(s): {', '.join(sorted(unknown))}")
+        self.pieces = pieces
+        self.fields = tuple(fields)
+        # Boş hücrelerde profil değeri kullanılır
+        self.defaults = tuple(render(values.get(name, '')) for name, render in self.fields)
+
+    def render(self, machine):
+        if not self.fields:
+            return self.pieces[0].encode('utf-8')
+        parts = [self.pieces[0]]
+        for (field, render), default, piece in zip(self.fields, self.defaults, self.pieces[1:]):
+            value = machine.get(field)
+            parts.append(render(value) if value else default)
+            parts.append(piece)
+        return ''.join(parts).encode('utf-8')
+
+
+def read_template(path=None):
+    if path is None:
+        return DEFAULT_TEMPLATE
+    with open(path, encoding='utf-8-sig') as f:
+        return f.read()
+
+
+def machine_columns(header):
+    columns = []
+    for column in header:
+        name = column.strip().lower().replace(' ', '_')
+        columns.append(MACHINE_ALIASES.get(name, name))
+    return columns
+
+
+def read_machines(path):
+    # (alanlar, satır üreteci); satırlar dosyadan tek tek okunur
+    f = open(path, newline='', encoding='utf-8-sig')
+    reader = csv.reader(f)
+    try:
+        columns = machine_columns(next(reader))
+    except StopIteration:
+        f.close()
+        raise UnattendError(f"{os.path.basename(path)}: empty machine list")
+    fields = [column for column in columns if column in MACHINE_FIELDS]
+    if not fields:
+        f.close()
+        raise UnattendError(f"{os.path.basename(path)}: no known columns; expected {', '.join(MACHINE_FIELDS)}")
+    if 'serial' in fields and 'computer_name' not in fields:
+        fields.append('computer_name')
+
+    def rows():
+        with f:
+            for row in reader:
+                if not any(row):
+                    continue
+                machine = dict(zip(columns, (value.strip() for value in row)))
+                if 'computer_name' not in machine and 'serial' in machine:
+                    machine['computer_name'] = computer_name(machine['serial'])
+                yield reader.line_num, machine
+
+    return fields, rows()
+
+
+def _machine_id(machine, line):
+    return machine.get('serial') or machine.get('computer_name') or f"machine-{line}"
+
+
+def _pooled_keys(machines, profile, pool):
+    # Ürün anahtarı boş satırlar havuzdan PROGRESS_INTERVAL satırlık işlemlerle doldurulur;
+    # aynı makine yeniden üretildiğinde aynı anahtarı alır
+    from wom_keys import KeyPool, default_key_pool_path
+
+    label = " ".join(part for part in (profile.get('manufacturer'), profile.get('model')) if part)
+    keys = KeyPool(default_key_pool_path())
+    try:
+        batch = []
+        for line, machine in machines:
+            batch.append((line, machine))
+            if len(batch) >= PROGRESS_INTERVAL:
+                yield from _assign_batch(keys, pool, label, batch)
+                batch = []
+        yield from _assign_batch(keys, pool, label, batch)
+    finally:
+        machines.close()
+        keys.close()
+
+
+def _assign_batch(keys, pool, label, batch):
+    wanted = [_machine_id(machine, line) for line, machine in batch if not machine.get('product_key')]
+    assigned = keys.assign_many(pool, wanted, label) if wanted else {}
+    for line, machine in batch:
+        if not machine.get('product_key'):
+            machine['product_key'] = assigned[_machine_id(machine, line)]
+    return batch
+
+
+def _file_name(machine, line):
+    return _INVALID_FILE.sub('_', _machine_id(machine, line)) + '.xml'
+
+
+class _DirectoryWriter:
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+
+    def write(self, name, data):
+        with open(os.path.join(self.directory, name), 'wb') as f:
+            f.write(data)
+
+    def close(self):
+        pass
+
+
+class _ArchiveWriter:
+    def __init__(self, path):
+        self.archive = zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1)
+
+    def write(self, name, data):
+        self.archive.writestr(name, data)
+
+    def close(self):
+        self.archive.close()
+
+
+def write_answer_files(profile, machines_path, output, template_path=None, arch='amd64',
+                       use_bmp_only=False, progress=None):
+    # output .zip ile bitiyorsa tek arşiv, değilse klasör; dönüş: (dosya sayısı, süre)
+    started = time.perf_counter()
+    fields, machines = read_machines(machines_path)
+    pool = pool_reference(profile.get('product_key'))
+    if pool is not None:
+        if 'product_key' not in fields:
+            fields.append('product_key')
+        machines = _pooled_keys(machines, profile, pool)
+    template = CompiledTemplate(read_template(template_path), profile_values(profile, arch, use_bmp_only), fields)
+    writer = _ArchiveWriter(output) if output.lower().endswith('.zip') else _DirectoryWriter(output)
+    names = set()
+    count = 0
+    try:
+        for line, machine in machines:
+            name = _file_name(machine, line)
+            if name in names:
+                raise UnattendError(f"line {line}: duplicate machine {name[:-4]!r}")
+            names.add(name)
+            writer.write(name, template.render(machine))
+            count += 1
+            if progress is not None and count % PROGRESS_INTERVAL == 0:
+                progress(count)
+    finally:
+        machines.close()
+        writer.close()
+    return count, time.perf_counter() - started
+
+
+def write_answer_file(profile, output, template_path=None, arch='amd64', use_bmp_only=False):
+    # Makine listesi olmadan tek cevap dosyası; havuzdan anahtar atanacak makine yoktur
+    if pool_reference(profile.get('product_key')) is not None:
+        raise UnattendError("a product-key pool needs a machine list")
+    template = CompiledTemplate(read_template(template_path), profile_values(profile, arch, use_bmp_only))
+    with open(output, 'wb') as f:
+        f.write(template.render({}))
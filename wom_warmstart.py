@@ -0,0 +1,120 @@
+import os
+import json
+
+from PyQt5.QtCore import QByteArray
+from PyQt5.QtGui import QImage, QPixmap
+
+from wom_core import OEM_KEY_PATH, VERSION_KEY_PATH
+from wom_registry import RegistrySnapshot
+
+# Sıcak başlangıç: son doğrulanan registry değerleri ve hazır ölçeklenmiş logo
+# önizlemesi QSettings'te ('warm_start' grubu) saklanır. Pencere açılırken form
+# bunlardan doldurulur ve önizleme ham piksellerden kurulur (görüntü çözülmez);
+# registry ve logo dosyası arka planda okunup yalnızca farklar yenilenir.
+
+WARM_GROUP = 'warm_start'
+WARM_VERSION = 1
+THUMBNAIL_FORMAT = QImage.Format_ARGB32_Premultiplied
+
+# Saklanan değerler; None: anahtarın tüm metin/sayı değerleri
+WARM_VALUES = {
+    VERSION_KEY_PATH: ('PRODUCTNAME', 'CURRENTBUILDNUMBER'),
+    OEM_KEY_PATH: None,
+}
+
+
+def file_stamp(path):
+    # Logo dosyasının "mtime_ns:boyut" damgası; dosya yoksa None
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+
+def snapshot_values(snapshot):
+    values = {}
+    for key_path, names in WARM_VALUES.items():
+        values[key_path] = {name: [value_type, value]
+                            for name, (value_type, value) in snapshot.values(key_path).items()
+                            if isinstance(value, (str, int)) and (names is None or name.upper() in names)}
+    return values
+
+
+def thumbnail_data(pixmap):
+    # Önizleme pikselleri: (genişlik, yükseklik, satır baytı, bayt)
+    image = pixmap.toImage().convertToFormat(THUMBNAIL_FORMAT)
+    bits = image.constBits()
+    bits.setsize(image.bytesPerLine() * image.height())
+    return image.width(), image.height(), image.bytesPerLine(), bytes(bits)
+
+
+class WarmState:
+    def __init__(self, values, logo_path=None, logo_stamp=None, thumbnail=None, tooltip=''):
+        self.values = values
+        self.logo_path = logo_path or None
+        self.logo_stamp = logo_stamp or None
+        self.thumbnail = thumbnail
+        self.tooltip = tooltip or ''
+        self.snapshot = RegistrySnapshot(values)
+
+    @classmethod
+    def capture(cls, snapshot, pixmap=None, tooltip=''):
+        logo_path = snapshot.get(OEM_KEY_PATH, 'Logo')
+        thumbnail = None if pixmap is None or pixmap.isNull() else thumbnail_data(pixmap)
+        return cls(snapshot_values(snapshot), logo_path, file_stamp(logo_path), thumbnail, tooltip)
+
+    def thumbnail_pixmap(self):
+        width, height, stride, data = self.thumbnail
+        return QPixmap.fromImage(QImage(data, width, height, stride, THUMBNAIL_FORMAT))
+
+    def logo_current(self, logo_path, stamp):
+        # Saklanan önizleme hâlâ registry'deki logo dosyasını mı gösteriyor
+        return (self.thumbnail is not None and stamp is not None
+                and logo_path == self.logo_path and stamp == self.logo_stamp)
+
+
+def save(settings, state):
+    settings.beginGroup(WARM_GROUP)
+    try:
+        settings.setValue('version', WARM_VERSION)
+        settings.setValue('values', json.dumps(state.values, ensure_ascii=False))
+        settings.setValue('logo_path', state.logo_path or '')
+        settings.setValue('logo_stamp', state.logo_stamp or '')
+        settings.setValue('tooltip', state.tooltip)
+        if state.thumbnail is None:
+            settings.remove('thumbnail_size')
+            settings.remove('thumbnail')
+        else:
+            width, height, stride, data = state.thumbnail
+            settings.setValue('thumbnail_size', f"{width}x{height}x{stride}")
+            settings.setValue('thumbnail', QByteArray(data))
+    finally:
+        settings.endGroup()
+
+
+def load(settings):
+    # Kayıt yoksa, sürümü eskiyse ya da bozuksa None
+    settings.beginGroup(WARM_GROUP)
+    try:
+        if settings.value('version', 0, type=int) != WARM_VERSION:
+            return None
+        values = json.loads(settings.value('values', '{}', type=str))
+        thumbnail = None
+        size = settings.value('thumbnail_size', '', type=str)
+        if size:
+            width, height, stride = (int(part) for part in size.split('x'))
+            data = bytes(settings.value('thumbnail', QByteArray(), type=QByteArray))
+            if len(data) == stride * height and width * 4 <= stride:
+                thumbnail = (width, height, stride, data)
+        return WarmState(values,
+                         settings.value('logo_path', '', type=str),
+                         settings.value('logo_stamp', '', type=str),
+                         thumbnail,
+                         settings.value('tooltip', '', type=str))
+    except (ValueError, TypeError, AttributeError):
+        return None
+    finally:
+        settings.endGroup()
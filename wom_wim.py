@@ -0,0 +1,120 @@
+import os
+import mmap
+import struct
+import xml.etree.ElementTree as ET
+
+from wom_core import windows_version_name
+
+# install.wim / install.esd görüntü listesi. Dosya bellek eşlemeli açılır ve
+# yalnızca 208 baytlık başlık ile başlığın gösterdiği XML meta veri kaynağı
+# okunur; görüntü içeriğine dokunulmaz, çok GB'lık dosyalar da anında listelenir.
+# Windows'a özgü bir şey kullanılmaz.
+
+WIM_MAGIC = b'MSWIM\0\0\0'
+HEADER_SIZE = 208
+HEADER_FORMAT = '<8sIIII16sHHI24s24s24sI24s'
+RESHDR_COMPRESSED = 0x04
+
+# WINDOWS/ARCH değerleri (PROCESSOR_ARCHITECTURE_*)
+ARCHITECTURES = {0: 'x86', 5: 'arm', 6: 'ia64', 9: 'x64', 12: 'arm64'}
+
+
+class WimError(Exception):
+    pass
+
+
+def _resource(data):
+    # RESHDR_DISK_SHORT: 7 bayt boyut + 1 bayt bayrak, ofset, özgün boyut
+    size_flags, offset, original_size = struct.unpack('<QQQ', data)
+    return size_flags & 0x00FFFFFFFFFFFFFF, size_flags >> 56, offset, original_size
+
+
+def _text(element, path, default=''):
+    found = element.find(path)
+    if found is None or found.text is None:
+        return default
+    return found.text.strip()
+
+
+def _int(element, path):
+    try:
+        return int(_text(element, path), 0)
+    except ValueError:
+        return None
+
+
+class WimImage:
+    def __init__(self, element):
+        self.index = int(element.get('INDEX', '0'))
+        self.name = _text(element, 'NAME')
+        self.display_name = _text(element, 'DISPLAYNAME')
+        self.description = _text(element, 'DESCRIPTION')
+        windows = element.find('WINDOWS')
+        if windows is None:
+            windows = ET.Element('WINDOWS')
+        self.edition = _text(windows, 'EDITIONID') or _text(element, 'FLAGS')
+        self.installation_type = _text(windows, 'INSTALLATIONTYPE')
+        arch = _int(windows, 'ARCH')
+        self.arch = ARCHITECTURES.get(arch, '' if arch is None else str(arch))
+        self.major = _int(windows, 'VERSION/MAJOR')
+        self.minor = _int(windows, 'VERSION/MINOR')
+        self.build = _int(windows, 'VERSION/BUILD')
+        self.sp_build = _int(windows, 'VERSION/SPBUILD')
+        self.languages = tuple(language.text.strip() for language in windows.findall('LANGUAGES/LANGUAGE')
+                               if language.text and language.text.strip())
+        self.default_language = _text(windows, 'LANGUAGES/DEFAULT') or (self.languages[0] if self.languages else '')
+        self.total_bytes = _int(element, 'TOTALBYTES') or 0
+
+    @property
+    def version(self):
+        parts = (self.major, self.minor, self.build, self.sp_build)
+        return '.'.join(str(part) for part in parts if part is not None)
+
+    @property
+    def windows_version(self):
+        # Sürüm seçicideki ad ("Windows 11" ...); bilinmiyorsa None
+        return windows_version_name(self.display_name or self.name, self.build)
+
+    def label(self):
+        details = ', '.join(part for part in (self.edition, str(self.build or ''), self.default_language, self.arch)
+                            if part)
+        return f"{self.index}: {self.display_name or self.name} ({details})"
+
+
+def read_xml(path):
+    with open(path, 'rb') as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise WimError(f"{os.path.basename(path)}: empty file")
+        try:
+            if len(data) < HEADER_SIZE or data[:8] != WIM_MAGIC:
+                raise WimError(f"{os.path.basename(path)}: not a WIM/ESD file")
+            fields = struct.unpack_from(HEADER_FORMAT, data)
+            if fields[1] != HEADER_SIZE:
+                raise WimError(f"{os.path.basename(path)}: unsupported WIM header size {fields[1]}")
+            size, flags, offset, _ = _resource(fields[10])
+            if not size or offset + size > len(data):
+                raise WimError(f"{os.path.basename(path)}: XML metadata is missing or truncated")
+            if flags & RESHDR_COMPRESSED:
+                raise WimError(f"{os.path.basename(path)}: compressed XML metadata is not supported")
+            xml = data[offset:offset + size]
+        finally:
+            data.close()
+    # XML meta verisi BOM'lu UTF-16LE'dir
+    if xml.startswith(b'\xff\xfe'):
+        xml = xml[2:]
+    return xml.decode('utf-16-le', errors='replace').rstrip('\0')
+
+
+def parse_images(xml):
+    try:
+        root = ET.fromstring(xml)
+    except ET.ParseError as e:
+        raise WimError(f"invalid WIM XML metadata: {e}")
+    return sorted((WimImage(element) for element in root.findall('IMAGE')), key=lambda image: image.index)
+
+
+def read_images(path):
+    return parse_images(read_xml(path))
+